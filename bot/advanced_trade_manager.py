@@ -8,7 +8,8 @@ Implements advanced exit strategies:
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import numpy as np
 try:
     import MetaTrader5 as mt5
     MT5_AVAILABLE = True
@@ -25,6 +26,16 @@ from bot.config import STRATEGY_CONFIG
 from bot.strategy import SignalType
 
 
+def _sorted_isin(sorted_arr: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Membership test of values in a sorted array via binary search."""
+    if sorted_arr.size == 0:
+        return np.zeros(len(values), dtype=bool)
+
+    idx = np.searchsorted(sorted_arr, values)
+    idx[idx == sorted_arr.size] = 0
+    return sorted_arr[idx] == values
+
+
 class AdvancedTradeManager:
     """
     Advanced trade management with trailing stops and partial exits.
@@ -35,6 +46,18 @@ class AdvancedTradeManager:
     - Trailing stop: Lock in profits as trade moves favorably
     """
 
+    # One manager per account; slots keep instances small and attribute
+    # reads in manage_trade off the instance dict
+    __slots__ = (
+        'account_name', 'logger',
+        'enable_breakeven', 'breakeven_trigger_r',
+        'enable_partial_exits', 'partial_exit_r', 'partial_exit_percent',
+        'enable_trailing_stop', 'trailing_start_r', 'trailing_distance_r',
+        'breakeven_set', 'partial_exited', '_be_arr', '_pe_arr',
+        '_pip_cache', '_sym_info_cache', '_positions_by_ticket', '_ticks_by_symbol',
+        '_sltp_template', '_deal_template'
+    )
+
     def __init__(self, account_name: str):
         self.account_name = account_name
         self.logger = setup_logger(f"ADV_TM:{account_name}")
@@ -55,6 +78,43 @@ class AdvancedTradeManager:
         self.breakeven_set: set = set()
         self.partial_exited: set = set()
 
+        # Sorted array mirrors of the sets for vectorized membership tests
+        self._be_arr: np.ndarray = np.empty(0, dtype=np.int64)
+        self._pe_arr: np.ndarray = np.empty(0, dtype=np.int64)
+
+        # Per-symbol caches of MT5 symbol metadata (avoids one IPC per tick)
+        self._pip_cache: Dict[str, float] = {}
+        self._sym_info_cache: Dict[str, Tuple[float, int, float]] = {}
+
+        # Per-cycle snapshot of open positions and ticks (see refresh_positions)
+        self._positions_by_ticket: Dict[int, Any] = {}
+        self._ticks_by_symbol: Dict[str, Any] = {}
+
+        # Reusable order_send requests, built on first use (instance-local)
+        self._sltp_template: Optional[Dict[str, Any]] = None
+        self._deal_template: Optional[Dict[str, Any]] = None
+
+    def refresh_positions(self) -> int:
+        """
+        Snapshot all open positions and their symbol ticks in one pass.
+
+        Call once per management cycle before iterating tickets with
+        manage_trade() so partial exits use the snapshot instead of
+        issuing a positions_get/symbol_info_tick request per ticket.
+
+        Returns:
+            Number of open positions in the snapshot.
+        """
+        positions = mt5.positions_get()
+        self._positions_by_ticket = {pos.ticket: pos for pos in positions} if positions else {}
+
+        self._ticks_by_symbol = {}
+        for pos in self._positions_by_ticket.values():
+            if pos.symbol not in self._ticks_by_symbol:
+                self._ticks_by_symbol[pos.symbol] = mt5.symbol_info_tick(pos.symbol)
+
+        return len(self._positions_by_ticket)
+
     def manage_trade(
         self,
         ticket: int,
@@ -88,27 +148,38 @@ class AdvancedTradeManager:
             'trailing_adjusted': False
         }
 
+        # Bind hot attributes to locals; called per tick for every open ticket
+        breakeven_set = self.breakeven_set
+        partial_exited = self.partial_exited
+
+        # Fast path: nothing left to manage for this ticket
+        enable_trailing_stop = self.enable_trailing_stop
+        if not enable_trailing_stop:
+            breakeven_pending = self.enable_breakeven and ticket not in breakeven_set
+            partial_pending = self.enable_partial_exits and ticket not in partial_exited
+            if not (breakeven_pending or partial_pending):
+                return actions
+
         # Calculate R (risk amount) in pips
         pip_size = self._get_pip_size(symbol)
         if pip_size == 0:
             return actions
 
         sl_distance_price = abs(entry_price - sl)
+        if sl_distance_price <= 0:
+            return actions
         r_value = sl_distance_price  # 1R = original SL distance
 
-        # Calculate current profit in R
-        if direction == SignalType.BUY:
-            profit_price = current_price - entry_price
-        else:  # SELL
-            profit_price = entry_price - current_price
-
-        profit_r = profit_price / r_value if r_value > 0 else 0
+        # Calculate current profit in R (+1 for BUY, -1 for SELL)
+        sign = 1.0 if direction is SignalType.BUY else -1.0
+        profit_r = sign * (current_price - entry_price) / r_value
 
         # 1. Breakeven Management
-        if self.enable_breakeven and ticket not in self.breakeven_set:
+        if self.enable_breakeven and ticket not in breakeven_set:
             if profit_r >= self.breakeven_trigger_r:
                 if self._move_sl_to_breakeven(ticket, symbol, entry_price, tp):
-                    self.breakeven_set.add(ticket)
+                    breakeven_set.add(ticket)
+                    self._be_arr = np.union1d(self._be_arr, [ticket])
                     actions['breakeven_set'] = True
                     self.logger.info(
                         f"Breakeven set | {symbol} | Ticket: {ticket} | "
@@ -116,10 +187,11 @@ class AdvancedTradeManager:
                     )
 
         # 2. Partial Exits
-        if self.enable_partial_exits and ticket not in self.partial_exited:
+        if self.enable_partial_exits and ticket not in partial_exited:
             if profit_r >= self.partial_exit_r:
                 if self._partial_close(ticket, symbol, self.partial_exit_percent):
-                    self.partial_exited.add(ticket)
+                    partial_exited.add(ticket)
+                    self._pe_arr = np.union1d(self._pe_arr, [ticket])
                     actions['partial_exit'] = True
                     self.logger.info(
                         f"Partial exit | {symbol} | Ticket: {ticket} | "
@@ -127,7 +199,7 @@ class AdvancedTradeManager:
                     )
 
         # 3. Trailing Stop
-        if self.enable_trailing_stop and ticket in self.breakeven_set:
+        if enable_trailing_stop and ticket in breakeven_set:
             if profit_r >= self.trailing_start_r:
                 new_sl = self._calculate_trailing_sl(
                     direction,
@@ -146,6 +218,79 @@ class AdvancedTradeManager:
 
         return actions
 
+    def manage_trades_vectorized(
+        self,
+        tickets: np.ndarray,
+        directions: np.ndarray,
+        entry: np.ndarray,
+        current: np.ndarray,
+        sl: np.ndarray,
+        tp: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Apply advanced management to many positions at once (backtest mode).
+
+        Mirrors manage_trade() with array math and no MT5 requests; the
+        caller applies the returned SL changes and partial closes to its
+        simulated positions. Live trading keeps using manage_trade().
+
+        Args:
+            tickets: Trade tickets (int).
+            directions: SignalType values (SignalType.BUY.value / SELL.value).
+            entry: Entry prices.
+            current: Current market prices.
+            sl: Current stop losses.
+            tp: Take profits (unchanged, returned SLs pair with these).
+
+        Returns:
+            Dictionary of per-position arrays: 'breakeven_set', 'partial_exit'
+            and 'trailing_adjusted' masks, plus 'new_sl' prices.
+        """
+        tickets = np.asarray(tickets)
+        entry = np.asarray(entry, dtype=float)
+        current = np.asarray(current, dtype=float)
+        sl = np.asarray(sl, dtype=float)
+
+        sign = np.where(np.asarray(directions) == SignalType.BUY.value, 1.0, -1.0)
+        r_value = np.abs(entry - sl)
+        valid = r_value > 0
+        profit_r = sign * (current - entry) / np.maximum(r_value, 1e-12)
+
+        # 1. Breakeven Management
+        at_breakeven = _sorted_isin(self._be_arr, tickets)
+        be_mask = valid & ~at_breakeven & (profit_r >= self.breakeven_trigger_r)
+        if not self.enable_breakeven:
+            be_mask[:] = False
+
+        # 2. Partial Exits
+        pe_mask = valid & ~_sorted_isin(self._pe_arr, tickets) & (profit_r >= self.partial_exit_r)
+        if not self.enable_partial_exits:
+            pe_mask[:] = False
+
+        # 3. Trailing Stop (trails from the pre-breakeven SL, as in manage_trade)
+        trail_sl = current - sign * r_value * self.trailing_distance_r
+        improves = np.where(sign > 0, trail_sl > sl, trail_sl < sl) & (trail_sl != 0)
+        trail_mask = valid & (at_breakeven | be_mask) & (profit_r >= self.trailing_start_r) & improves
+        if not self.enable_trailing_stop:
+            trail_mask[:] = False
+
+        new_sl = np.where(be_mask, entry, sl)
+        new_sl = np.where(trail_mask, trail_sl, new_sl)
+
+        if be_mask.any():
+            self.breakeven_set.update(tickets[be_mask].tolist())
+            self._be_arr = np.union1d(self._be_arr, tickets[be_mask])
+        if pe_mask.any():
+            self.partial_exited.update(tickets[pe_mask].tolist())
+            self._pe_arr = np.union1d(self._pe_arr, tickets[pe_mask])
+
+        return {
+            'breakeven_set': be_mask,
+            'partial_exit': pe_mask,
+            'trailing_adjusted': trail_mask,
+            'new_sl': new_sl
+        }
+
     def _move_sl_to_breakeven(
         self,
         ticket: int,
@@ -154,15 +299,7 @@ class AdvancedTradeManager:
         tp: float
     ) -> bool:
         """Move stop loss to breakeven (entry price)."""
-        request = {
-            'action': mt5.TRADE_ACTION_SLTP,
-            'symbol': symbol,
-            'position': ticket,
-            'sl': entry_price,
-            'tp': tp
-        }
-
-        result = mt5.order_send(request)
+        result = mt5.order_send(self._sltp_request(ticket, symbol, entry_price, tp))
         return result and result.retcode == mt5.TRADE_RETCODE_DONE
 
     def _partial_close(
@@ -182,42 +319,92 @@ class AdvancedTradeManager:
         Returns:
             True if successful.
         """
-        positions = mt5.positions_get(ticket=ticket)
-        if not positions:
+        pos = self._get_position(ticket)
+        if pos is None:
             return False
 
-        pos = positions[0]
         close_volume = round(pos.volume * close_percent, 2)
 
         # Minimum volume check
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info and close_volume < symbol_info.volume_min:
+        sym_info = self._get_symbol_info(symbol)
+        if sym_info and close_volume < sym_info[2]:
             self.logger.warning(f"Partial close volume too small: {close_volume}")
             return False
 
+        tick = self._get_tick(symbol)
+        if tick is None:
+            return False
+
         # Determine close order type
         if pos.type == mt5.POSITION_TYPE_BUY:
             close_type = mt5.ORDER_TYPE_SELL
-            price = mt5.symbol_info_tick(symbol).bid
+            price = tick.bid
         else:
             close_type = mt5.ORDER_TYPE_BUY
-            price = mt5.symbol_info_tick(symbol).ask
-
-        request = {
-            'action': mt5.TRADE_ACTION_DEAL,
-            'symbol': symbol,
-            'volume': close_volume,
-            'type': close_type,
-            'position': ticket,
-            'price': price,
-            'deviation': 20,
-            'comment': f'PartialExit:{self.account_name}',
-            'type_time': mt5.ORDER_TIME_GTC,
-            'type_filling': mt5.ORDER_FILLING_IOC
-        }
+            price = tick.ask
+
+        request = self._deal_template
+        if request is None:
+            request = self._deal_template = {
+                'action': mt5.TRADE_ACTION_DEAL,
+                'symbol': None,
+                'volume': 0.0,
+                'type': None,
+                'position': 0,
+                'price': 0.0,
+                'deviation': 20,
+                'comment': f'PartialExit:{self.account_name}',
+                'type_time': mt5.ORDER_TIME_GTC,
+                'type_filling': mt5.ORDER_FILLING_IOC
+            }
+
+        request['symbol'] = symbol
+        request['volume'] = close_volume
+        request['type'] = close_type
+        request['position'] = ticket
+        request['price'] = price
 
         result = mt5.order_send(request)
-        return result and result.retcode == mt5.TRADE_RETCODE_DONE
+        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+            # Snapshot volume is now stale
+            self._positions_by_ticket.pop(ticket, None)
+            return True
+        return False
+
+    def _sltp_request(self, ticket: int, symbol: str, sl: float, tp: float) -> Dict[str, Any]:
+        """Fill this manager's reusable SL/TP modification request."""
+        request = self._sltp_template
+        if request is None:
+            request = self._sltp_template = {
+                'action': mt5.TRADE_ACTION_SLTP,
+                'symbol': None,
+                'position': 0,
+                'sl': 0.0,
+                'tp': 0.0
+            }
+
+        request['symbol'] = symbol
+        request['position'] = ticket
+        request['sl'] = sl
+        request['tp'] = tp
+        return request
+
+    def _get_position(self, ticket: int) -> Optional[Any]:
+        """Get a position from the cycle snapshot, falling back to MT5."""
+        pos = self._positions_by_ticket.get(ticket)
+        if pos is not None:
+            return pos
+
+        positions = mt5.positions_get(ticket=ticket)
+        return positions[0] if positions else None
+
+    def _get_tick(self, symbol: str) -> Optional[Any]:
+        """Get a tick from the cycle snapshot, falling back to MT5."""
+        tick = self._ticks_by_symbol.get(symbol)
+        if tick is not None:
+            return tick
+
+        return mt5.symbol_info_tick(symbol)
 
     def _calculate_trailing_sl(
         self,
@@ -242,7 +429,7 @@ class AdvancedTradeManager:
         """
         trailing_distance = r_value * self.trailing_distance_r
 
-        if direction == SignalType.BUY:
+        if direction is SignalType.BUY:
             # For longs, trail below current price
             new_sl = current_price - trailing_distance
             # Only move SL up, never down
@@ -265,32 +452,68 @@ class AdvancedTradeManager:
         tp: float
     ) -> bool:
         """Modify stop loss for a position."""
-        request = {
-            'action': mt5.TRADE_ACTION_SLTP,
-            'symbol': symbol,
-            'position': ticket,
-            'sl': new_sl,
-            'tp': tp
-        }
-
-        result = mt5.order_send(request)
+        result = mt5.order_send(self._sltp_request(ticket, symbol, new_sl, tp))
         return result and result.retcode == mt5.TRADE_RETCODE_DONE
 
-    def _get_pip_size(self, symbol: str) -> float:
-        """Get pip size for a symbol."""
+    def _get_symbol_info(self, symbol: str) -> Optional[Tuple[float, int, float]]:
+        """
+        Get cached (point, digits, volume_min) for a symbol.
+
+        Only successful lookups are cached so a missing symbol is retried
+        on the next call.
+        """
+        cached = self._sym_info_cache.get(symbol)
+        if cached is not None:
+            return cached
+
         symbol_info = mt5.symbol_info(symbol)
         if symbol_info is None:
+            return None
+
+        cached = (symbol_info.point, symbol_info.digits, symbol_info.volume_min)
+        self._sym_info_cache[symbol] = cached
+        return cached
+
+    def _get_pip_size(self, symbol: str) -> float:
+        """Get pip size for a symbol."""
+        pip_size = self._pip_cache.get(symbol)
+        if pip_size is not None:
+            return pip_size
+
+        sym_info = self._get_symbol_info(symbol)
+        if sym_info is None:
             return 0
 
-        if symbol_info.digits == 3 or symbol_info.digits == 5:
-            return symbol_info.point * 10
+        point, digits, _ = sym_info
+        if digits == 3 or digits == 5:
+            pip_size = point * 10
+        else:
+            pip_size = point
+
+        self._pip_cache[symbol] = pip_size
+        return pip_size
+
+    def invalidate_symbol(self, symbol: Optional[str] = None):
+        """
+        Drop cached symbol metadata (e.g. after a terminal reconnect).
+
+        Args:
+            symbol: Symbol to invalidate. Clears all symbols if None.
+        """
+        if symbol is None:
+            self._pip_cache.clear()
+            self._sym_info_cache.clear()
         else:
-            return symbol_info.point
+            self._pip_cache.pop(symbol, None)
+            self._sym_info_cache.pop(symbol, None)
 
     def reset_tracking(self, ticket: int):
         """Reset tracking for a closed trade."""
         self.breakeven_set.discard(ticket)
         self.partial_exited.discard(ticket)
+        self._be_arr = self._be_arr[self._be_arr != ticket]
+        self._pe_arr = self._pe_arr[self._pe_arr != ticket]
+        self._positions_by_ticket.pop(ticket, None)
 
     def get_status(self) -> Dict[str, Any]:
         """Get current status of advanced management."""
@@ -5,20 +5,105 @@ Aggregates and compares results across multiple strategies and phases.
 """
 
 import argparse
-import json
+import contextlib
+import functools
+import io
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 from datetime import datetime
+import numpy as np
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    ijson = None
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils import setup_logger
+from utils import setup_logger, read_json, write_json
+from utils.results_db import ResultsDB, DEFAULT_DB_PATH
 from bot.intelligent_ranker import IntelligentRanker, QualityGates, create_ranker
 
 logger = setup_logger("AGGREGATOR")
 
+# Run loading is I/O bound, so oversubscribe the CPU count
+LOAD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# best_params metrics held in the columnar results table (one row per metric)
+TABLE_FIELDS = ('profit', 'win_rate', 'profit_factor', 'max_drawdown_pct', 'total_trades')
+TABLE_INDEX = {field: i for i, field in enumerate(TABLE_FIELDS)}
+
+# Report layout, compiled once instead of re-parsing f-strings per row
+RULE = "=" * 100
+SUBRULE = "-" * 100
+COMPOSITE_HEADER = f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Score':<12} {'Profit':<10} {'Win Rate':<10} {'Max DD':<10}"
+PROFIT_HEADER = f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Profit':<12} {'Win Rate':<10} {'Trades':<8}"
+WIN_RATE_HEADER = f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Win Rate':<12} {'Profit':<10} {'Trades':<8}"
+DRAWDOWN_HEADER = f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Max DD':<12} {'Profit':<10} {'Win Rate':<10}"
+RISK_ADJUSTED_HEADER = f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Score':<12} {'Profit':<10} {'Max DD':<10}"
+COMPOSITE_ROW_FMT = "{:<6} {:<20} {:<7} {:<11.1f} ${:<9.2f} {:<9.1f}% {:<9.2f}%\n".format
+PROFIT_ROW_FMT = "{:<6} {:<20} {:<7} ${:<11.2f} {:<9.1f}% {:<8}\n".format
+WIN_RATE_ROW_FMT = "{:<6} {:<20} {:<7} {:<11.1f}% ${:<9.2f} {:<8}\n".format
+DRAWDOWN_ROW_FMT = "{:<6} {:<20} {:<7} {:<11.2f}% ${:<9.2f} {:<9.1f}%\n".format
+RISK_ADJUSTED_ROW_FMT = "{:<6} {:<20} {:<7} {:<11.2f} ${:<9.2f} {:<9.2f}%\n".format
+
+
+# Per-path locks so concurrent loaders of one shared file wait for the first
+# parse instead of both missing the cache
+_path_locks = defaultdict(threading.Lock)
+_path_locks_guard = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4096)
+def _read_json_cached(resolved_path: str, mtime_ns: int) -> Any:
+    """Parse a JSON file once per (path, mtime); see _read_run_json."""
+    return read_json(resolved_path)
+
+
+def _read_run_json(path: Path) -> Any:
+    """
+    Read a run's JSON file through a process-wide LRU cache.
+
+    Keyed by resolved path so symlinked/shared files are parsed once, and by
+    mtime so rewritten files are re-read. The returned object is shared
+    between callers and must not be mutated.
+    """
+    resolved = str(path.resolve())
+    with _path_locks_guard:
+        lock = _path_locks[resolved]
+    with lock:
+        return _read_json_cached(resolved, os.stat(resolved).st_mtime_ns)
+
+
+@contextlib.contextmanager
+def _open_batch_runs(path: Path) -> Iterator[Tuple[str, Iterator[Tuple[str, Dict[str, Any]]]]]:
+    """
+    Open a batch_metadata.json as (batch_id, iterator of (run_key, run_data)).
+
+    With ijson the 'results' mapping is streamed one run at a time from a
+    single file handle instead of parsing the whole file up front; otherwise
+    it is read in full. The iterator is only valid inside the with block.
+    """
+    if not IJSON_AVAILABLE:
+        metadata = read_json(path)
+        yield metadata['batch_id'], iter(metadata['results'].items())
+        return
+
+    with open(path, 'rb') as f:
+        # batch_id is written before results, so this pass stops early and
+        # the same handle is rewound for the streaming pass
+        batch_id = next(ijson.items(f, 'batch_id'), 'unknown')
+        f.seek(0)
+        yield batch_id, ijson.kvitems(f, 'results', use_float=True)
+
 
 class ResultsAggregator:
     """Aggregates and compares results from multiple grid search runs."""
@@ -28,7 +113,8 @@ class ResultsAggregator:
         batch_dir: Optional[str] = None,
         run_dirs: Optional[List[str]] = None,
         ranking_profile: str = 'balanced',
-        quality_gates: Optional[QualityGates] = None
+        quality_gates: Optional[QualityGates] = None,
+        results_db: Optional[str] = str(DEFAULT_DB_PATH)
     ):
         """
         Initialize aggregator.
@@ -38,10 +124,16 @@ class ResultsAggregator:
             run_dirs: List of individual run directories to compare.
             ranking_profile: Ranking profile ('balanced', 'aggressive', 'conservative', 'challenge')
             quality_gates: Custom quality gates (uses defaults if None)
+            results_db: Results DB to read recorded batches from before
+                falling back to the run JSON files (None = always use JSON)
         """
         self.results = []
+        self._table: Optional[np.ndarray] = None
+        self._rankings: Dict[Any, List[Dict[str, Any]]] = {}
+        self._rows: Optional[List[Dict[str, Any]]] = None
         self.batch_dir = Path(batch_dir) if batch_dir else None
         self.run_dirs = [Path(d) for d in run_dirs] if run_dirs else []
+        self.results_db = Path(results_db) if results_db else None
 
         # Create intelligent ranker
         if quality_gates:
@@ -49,9 +141,20 @@ class ResultsAggregator:
         else:
             self.ranker = create_ranker(ranking_profile)
 
-    def load_results(self):
-        """Load results from batch or individual runs."""
-        if self.batch_dir:
+    def load_results(self, results: Optional[List[Dict[str, Any]]] = None):
+        """
+        Load results from batch or individual runs.
+
+        Args:
+            results: Already loaded results (e.g. BatchGridSearchRunner's
+                run_results) to use instead of reading the batch.
+        """
+        self._table = None
+        self._rankings = {}
+        self._rows = None
+        if results is not None:
+            self.results.extend(results)
+        elif self.batch_dir:
             self._load_batch_results()
         elif self.run_dirs:
             self._load_individual_results()
@@ -65,58 +168,108 @@ class ResultsAggregator:
         if not metadata_file.exists():
             raise FileNotFoundError(f"Batch metadata not found: {metadata_file}")
 
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        db_results = self._load_batch_from_db()
+        if db_results:
+            self.results.extend(db_results)
+            return
+
+        with _open_batch_runs(metadata_file) as (batch_id, batch_runs):
+            logger.info(f"Loading batch results: {batch_id}")
 
-        logger.info(f"Loading batch results: {metadata['batch_id']}")
+            def successful_runs():
+                for run_key, run_data in batch_runs:
+                    if run_data['status'] != 'success':
+                        logger.warning(f"Skipping failed run: {run_key}")
+                        continue
 
-        for run_key, run_data in metadata['results'].items():
-            if run_data['status'] != 'success':
-                logger.warning(f"Skipping failed run: {run_key}")
-                continue
+                    # The batch entry already carries strategy/phase/run_dir
+                    yield Path(run_data['run_dir']), run_data['strategy'], run_data['phase'], run_data
 
-            run_dir = Path(run_data['run_dir'])
-            self._load_run_result(run_dir, run_data['strategy'], run_data['phase'])
+            # Runs are handed to the loader pool as they are parsed
+            self._load_runs(successful_runs())
+
+    def _load_batch_from_db(self) -> List[Dict[str, Any]]:
+        """Results recorded for this batch in the results DB, or [] if none."""
+        if self.results_db is None or not self.results_db.exists():
+            return []
+
+        batch_id = self.batch_dir.name.replace("batch_", "", 1)
+        try:
+            with ResultsDB(self.results_db, read_only=True) as db:
+                results = db.load_batch(batch_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Results DB unavailable, reading run files instead: {e}")
+            return []
+
+        if results:
+            logger.info(f"Loading batch results: {batch_id} (from {self.results_db})")
+        return results
 
     def _load_individual_results(self):
         """Load results from individual run directories."""
+        runs = []
         for run_dir in self.run_dirs:
             # Try to determine strategy and phase from metadata
             metadata_file = run_dir / "metadata.json"
+            metadata = None
             if metadata_file.exists():
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    strategy = metadata.get('strategy', 'unknown')
-                    phase = metadata.get('phase', 1)
+                metadata = _read_run_json(metadata_file)
+                strategy = metadata.get('strategy', 'unknown')
+                phase = metadata.get('phase', 1)
             else:
                 # Try to parse from directory name
                 strategy = run_dir.parent.name
                 phase = 1
 
-            self._load_run_result(run_dir, strategy, phase)
+            runs.append((run_dir, strategy, phase, metadata))
+
+        self._load_runs(runs)
 
-    def _load_run_result(self, run_dir: Path, strategy: str, phase: int):
-        """Load a single run result."""
+    def _load_runs(self, runs: Iterable[tuple]):
+        """
+        Load (run_dir, strategy, phase, metadata) runs concurrently, preserving order.
+
+        `runs` may be a generator: map() submits each run as soon as it is
+        produced, so loading overlaps with producing the rest.
+        """
+        with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+            loaded = executor.map(lambda run: self._load_run_result(*run), runs)
+            self.results.extend(result for result in loaded if result is not None)
+
+    def _load_run_result(
+        self,
+        run_dir: Path,
+        strategy: str,
+        phase: int,
+        metadata_override: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a single run result, or None if it has no best_params.json.
+
+        Args:
+            run_dir: Grid search run directory.
+            strategy: Strategy name.
+            phase: Trading phase.
+            metadata_override: Run metadata the caller already has; skips
+                reading metadata.json when given.
+        """
         best_params_file = run_dir / "best_params.json"
         recommended_params_file = run_dir / "recommended_params.json"
         metadata_file = run_dir / "metadata.json"
 
         if not best_params_file.exists():
             logger.warning(f"best_params.json not found in {run_dir}")
-            return
+            return None
 
-        with open(best_params_file, 'r') as f:
-            best_params = json.load(f)
+        best_params = _read_run_json(best_params_file)
 
         recommended_params = None
         if recommended_params_file.exists():
-            with open(recommended_params_file, 'r') as f:
-                recommended_params = json.load(f)
+            recommended_params = _read_run_json(recommended_params_file)
 
-        metadata = None
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+        metadata = metadata_override
+        if metadata is None and metadata_file.exists():
+            metadata = _read_run_json(metadata_file)
 
         result = {
             'run_dir': str(run_dir),
@@ -127,14 +280,18 @@ class ResultsAggregator:
             'metadata': metadata
         }
 
-        self.results.append(result)
+        return result
 
-    def generate_comparison(self) -> Dict[str, Any]:
+    def generate_comparison(self, top_n: Optional[int] = 10) -> Dict[str, Any]:
         """
         Generate unified comparison across all loaded results.
 
         Uses IntelligentRanker for composite scoring and quality gates.
 
+        Args:
+            top_n: Entries kept per ranking (None keeps every result). The
+                printed report only shows the top 5.
+
         Returns:
             Dictionary with comparison data.
         """
@@ -144,49 +301,38 @@ class ResultsAggregator:
 
         logger.info(f"Comparing {len(self.results)} grid search runs")
 
-        # Prepare data for intelligent ranker
-        all_result_data = []
-        # Known metric fields to exclude from parameters
-        metric_fields = {'profit', 'win_rate', 'profit_factor', 'max_drawdown_pct',
-                        'total_trades', 'consistency_score', 'composite_score'}
+        # Shared rows feed the intelligent ranker and every metric ranking
+        all_result_data = self._build_rows()
 
-        for result in self.results:
-            best = result['best_params']
-
-            # Extract parameters (exclude metric fields)
-            parameters = {k: v for k, v in best.items() if k not in metric_fields}
-
-            result_data = {
-                'strategy': result['strategy'],
-                'phase': result['phase'],
-                'run_dir': result['run_dir'],
-                'net_profit': best.get('profit', 0),
-                'win_rate': best.get('win_rate', 0),
-                'profit_factor': best.get('profit_factor', 0),
-                'max_drawdown_pct': best.get('max_drawdown_pct', 0),
-                'total_trades': best.get('total_trades', 0),
-                'consistency_score': best.get('consistency_score'),  # If available from multi-period
-                'parameters': parameters
-            }
-            all_result_data.append(result_data)
-
-        # Apply intelligent ranking
+        # Apply intelligent ranking; gates are checked on the metric columns
+        # so only passing rows reach the ranker. Missing metrics count as 0,
+        # as in the rows themselves.
         logger.info("Applying quality gates and composite scoring...")
-        ranked_results = self.ranker.rank_results(all_result_data, apply_gates=True)
+        passed = self.ranker.quality_gate_mask(
+            self._metric_column('win_rate', 0),
+            self._metric_column('profit_factor', 0),
+            self._metric_column('max_drawdown_pct', 0),
+            self._metric_column('total_trades', 0)
+        )
+        n_passed = int(passed.sum())
+        ranked_results = self.ranker.rank_results(
+            [all_result_data[i] for i in np.flatnonzero(passed)], apply_gates=False, top_n=top_n
+        )
+        top = slice(top_n)
 
         # Generate comparison report
         comparison = {
             'total_runs': len(self.results),
-            'passed_quality_gates': len(ranked_results),
-            'failed_quality_gates': len(self.results) - len(ranked_results),
-            'pass_rate': (len(ranked_results) / len(self.results) * 100) if self.results else 0,
+            'passed_quality_gates': n_passed,
+            'failed_quality_gates': len(self.results) - n_passed,
+            'pass_rate': (n_passed / len(self.results) * 100) if self.results else 0,
             'rankings': {
                 'by_composite_score': ranked_results,  # Already sorted by composite score
-                'by_profit': self._rank_by_metric('profit'),
-                'by_win_rate': self._rank_by_metric('win_rate'),
-                'by_profit_factor': self._rank_by_metric('profit_factor'),
-                'by_lowest_drawdown': self._rank_by_metric('max_drawdown_pct', reverse=True),
-                'by_risk_adjusted': self._rank_by_risk_adjusted()
+                'by_profit': self._rank_by_metric('profit')[top],
+                'by_win_rate': self._rank_by_metric('win_rate')[top],
+                'by_profit_factor': self._rank_by_metric('profit_factor')[top],
+                'by_lowest_drawdown': self._rank_by_metric('max_drawdown_pct', reverse=True)[top],
+                'by_risk_adjusted': self._rank_by_risk_adjusted()[top]
             },
             'best_overall': ranked_results[0] if ranked_results else {},
             'quality_gates': {
@@ -200,63 +346,131 @@ class ResultsAggregator:
 
         return comparison
 
-    def _rank_by_metric(self, metric: str, reverse: bool = False) -> List[Dict[str, Any]]:
-        """Rank results by a specific metric."""
-        ranked = []
+    def _build_rows(self) -> List[Dict[str, Any]]:
+        """
+        Build one flat row per loaded result (memoized until the next load).
 
-        for result in self.results:
+        Rows carry every field the rankings and report read, including the
+        derived risk-adjusted return, so each ranking is just an ordering of
+        the same row objects.
+        """
+        if self._rows is not None:
+            return self._rows
+
+        # Known metric fields to exclude from parameters
+        metric_fields = {'profit', 'win_rate', 'profit_factor', 'max_drawdown_pct',
+                        'total_trades', 'consistency_score', 'composite_score'}
+
+        risk_adjusted = self._risk_adjusted_column()
+
+        rows = []
+        for result, risk_adjusted_value in zip(self.results, risk_adjusted.tolist()):
             best = result['best_params']
-            value = best.get(metric, 0 if not reverse else float('inf'))
 
-            ranked.append({
+            # Extract parameters (exclude metric fields)
+            parameters = {k: v for k, v in best.items() if k not in metric_fields}
+
+            rows.append({
                 'strategy': result['strategy'],
                 'phase': result['phase'],
                 'run_dir': result['run_dir'],
-                'value': value,
+                'net_profit': best.get('profit', 0),
                 'profit': best.get('profit', 0),
                 'win_rate': best.get('win_rate', 0),
-                'total_trades': best.get('total_trades', 0),
+                'profit_factor': best.get('profit_factor', 0),
                 'max_drawdown_pct': best.get('max_drawdown_pct', 0),
-                'parameters': best.get('parameters', {})
+                'total_trades': best.get('total_trades', 0),
+                'consistency_score': best.get('consistency_score'),  # If available from multi-period
+                'risk_adjusted': risk_adjusted_value,
+                'parameters': parameters
             })
 
-        # Sort by value (descending for most metrics, ascending for drawdown)
-        ranked.sort(key=lambda x: x['value'], reverse=not reverse)
+        self._rows = rows
+        return rows
 
-        return ranked
+    def _build_table(self) -> np.ndarray:
+        """
+        Pack every TABLE_FIELDS metric into one float table in a single pass.
 
-    def _rank_by_risk_adjusted(self) -> List[Dict[str, Any]]:
-        """Rank by risk-adjusted returns (profit / max_drawdown)."""
-        ranked = []
+        Shape is (len(TABLE_FIELDS), n_results) so each metric is a contiguous
+        row; missing values are NaN. Memoized until the next load.
+        """
+        if self._table is None:
+            nan = np.nan
+            table = np.array(
+                [[result['best_params'].get(field, nan) for field in TABLE_FIELDS]
+                 for result in self.results],
+                dtype=float
+            ).reshape(len(self.results), len(TABLE_FIELDS))
+            self._table = np.ascontiguousarray(table.T)
+
+        return self._table
+
+    def _metric_column(self, metric: str, default: float) -> np.ndarray:
+        """
+        Get a metric across all results as a contiguous float array.
 
-        for result in self.results:
-            best = result['best_params']
-            profit = best.get('profit', 0)
-            max_dd = best.get('max_drawdown_pct', 0.01)  # Avoid division by zero
+        Reads a row of the shared results table; missing values are filled
+        with `default`.
+        """
+        column = self._build_table()[TABLE_INDEX[metric]]
+        return np.where(np.isnan(column), default, column)
 
-            # Calculate risk-adjusted return (higher is better)
-            risk_adjusted = profit / max_dd if max_dd > 0 else 0
+    def _risk_adjusted_column(self) -> np.ndarray:
+        """Risk-adjusted return (profit / max_drawdown) for every result."""
+        profit = self._metric_column('profit', 0)
+        max_dd = self._metric_column('max_drawdown_pct', 0.01)  # Avoid division by zero
 
-            ranked.append({
-                'strategy': result['strategy'],
-                'phase': result['phase'],
-                'run_dir': result['run_dir'],
-                'value': risk_adjusted,
-                'profit': profit,
-                'win_rate': best.get('win_rate', 0),
-                'max_drawdown_pct': max_dd,
-                'total_trades': best.get('total_trades', 0),
-                'parameters': best.get('parameters', {})
-            })
+        # Calculate risk-adjusted return (higher is better)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(max_dd > 0, profit / max_dd, 0.0)
 
-        ranked.sort(key=lambda x: x['value'], reverse=True)
+    def _rank_by_metric(self, metric: str, reverse: bool = False) -> List[Dict[str, Any]]:
+        """Rank results by a specific metric (memoized until the next load)."""
+        cached = self._rankings.get((metric, reverse))
+        if cached is not None:
+            return cached
 
+        values = self._metric_column(metric, 0 if not reverse else float('inf'))
+
+        # Stable argsort keeps load order for ties, matching list.sort()
+        # (descending for most metrics, ascending for drawdown)
+        order = np.argsort(values if reverse else -values, kind='stable')
+
+        rows = self._build_rows()
+        ranked = [rows[i] for i in order]
+
+        self._rankings[(metric, reverse)] = ranked
         return ranked
 
-    def _determine_best_overall(self) -> Dict[str, Any]:
-        """Determine best overall strategy/phase combination."""
+    def _rank_by_risk_adjusted(self) -> List[Dict[str, Any]]:
+        """Rank by risk-adjusted returns (profit / max_drawdown), memoized until the next load."""
+        cached = self._rankings.get('risk_adjusted')
+        if cached is not None:
+            return cached
+
+        order = np.argsort(-self._risk_adjusted_column(), kind='stable')
+
+        rows = self._build_rows()
+        ranked = [rows[i] for i in order]
+
+        self._rankings['risk_adjusted'] = ranked
+        return ranked
+
+    def _determine_best_overall(
+        self,
+        risk_adjusted_ranking: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Determine best overall strategy/phase combination.
+
+        Args:
+            risk_adjusted_ranking: Output of _rank_by_risk_adjusted() if already
+                at hand; the memoized ranking is used otherwise.
+        """
         # Use risk-adjusted return as the primary metric
-        risk_adjusted_ranking = self._rank_by_risk_adjusted()
+        if risk_adjusted_ranking is None:
+            risk_adjusted_ranking = self._rank_by_risk_adjusted()
 
         if not risk_adjusted_ranking:
             return {}
@@ -269,137 +483,171 @@ class ResultsAggregator:
             'profit': best['profit'],
             'win_rate': best['win_rate'],
             'max_drawdown_pct': best['max_drawdown_pct'],
-            'risk_adjusted_score': best['value'],
+            'risk_adjusted_score': best['risk_adjusted'],
             'total_trades': best['total_trades'],
             'parameters': best['parameters'],
             'run_dir': best['run_dir']
         }
 
     def print_comparison(self, comparison: Dict[str, Any]):
-        """Print comparison report to console."""
-        logger.info("")
-        logger.info("=" * 100)
-        logger.info("MULTI-STRATEGY COMPARISON REPORT (Intelligent Ranking)")
-        logger.info("=" * 100)
-        logger.info(f"Total Runs Compared: {comparison['total_runs']}")
-        logger.info(f"Passed Quality Gates: {comparison['passed_quality_gates']} ({comparison['pass_rate']:.1f}%)")
-        logger.info(f"Failed Quality Gates: {comparison['failed_quality_gates']}")
-        logger.info("")
-        logger.info("Quality Gate Requirements:")
+        """Print comparison report to console as a single log record."""
+        # Skip formatting entirely when INFO is filtered out
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(self._format_report(comparison))
+
+        if not comparison['best_overall']:
+            logger.warning("[FAILED] NO PARAMETERS PASSED QUALITY GATES!")
+
+    def _format_report(self, comparison: Dict[str, Any]) -> str:
+        """Render the comparison report text."""
+        buf = io.StringIO()
+        write = buf.write
+
+        write("\n")
+        write(RULE + "\n")
+        write("MULTI-STRATEGY COMPARISON REPORT (Intelligent Ranking)\n")
+        write(RULE + "\n")
+        write(f"Total Runs Compared: {comparison['total_runs']}\n")
+        write(f"Passed Quality Gates: {comparison['passed_quality_gates']} ({comparison['pass_rate']:.1f}%)\n")
+        write(f"Failed Quality Gates: {comparison['failed_quality_gates']}\n")
+        write("\n")
+        write("Quality Gate Requirements:\n")
         gates = comparison['quality_gates']
-        logger.info(f"  - Win Rate >= {gates['min_win_rate']}%")
-        logger.info(f"  - Profit Factor >= {gates['min_profit_factor']}")
-        logger.info(f"  - Max Drawdown <= {gates['max_drawdown_pct']}%")
-        logger.info(f"  - Minimum Trades >= {gates['min_trades']}")
-        logger.info("=" * 100)
+        write(f"  - Win Rate >= {gates['min_win_rate']}%\n")
+        write(f"  - Profit Factor >= {gates['min_profit_factor']}\n")
+        write(f"  - Max Drawdown <= {gates['max_drawdown_pct']}%\n")
+        write(f"  - Minimum Trades >= {gates['min_trades']}\n")
+        write(RULE + "\n")
 
         # Best Overall
-        logger.info("")
-        logger.info("-" * 100)
-        logger.info("[BEST] BEST OVERALL (Composite Score)")
-        logger.info("-" * 100)
+        self._write_section_header(write, "[BEST] BEST OVERALL (Composite Score)")
         best = comparison['best_overall']
         if best:
-            logger.info(f"Strategy: {best['strategy'].upper()} (Phase {best['phase']})")
-            logger.info(f"Composite Score: {best.get('composite_score', 0):.2f} / 100")
-            logger.info(f"Profit: ${best.get('net_profit', 0):.2f}")
-            logger.info(f"Win Rate: {best.get('win_rate', 0):.1f}%")
-            logger.info(f"Profit Factor: {best.get('profit_factor', 0):.2f}")
-            logger.info(f"Max Drawdown: {best.get('max_drawdown_pct', 0):.2f}%")
-            logger.info(f"Total Trades: {best.get('total_trades', 0)}")
+            write(f"Strategy: {best['strategy'].upper()} (Phase {best['phase']})\n")
+            write(f"Composite Score: {best.get('composite_score', 0):.2f} / 100\n")
+            write(f"Profit: ${best.get('net_profit', 0):.2f}\n")
+            write(f"Win Rate: {best.get('win_rate', 0):.1f}%\n")
+            write(f"Profit Factor: {best.get('profit_factor', 0):.2f}\n")
+            write(f"Max Drawdown: {best.get('max_drawdown_pct', 0):.2f}%\n")
+            write(f"Total Trades: {best.get('total_trades', 0)}\n")
             if best.get('consistency_score') is not None:
-                logger.info(f"Consistency Score: {best.get('consistency_score'):.2f} (multi-period)")
-            logger.info(f"Parameters: {json.dumps(best.get('parameters', {}), indent=2)}")
-            logger.info(f"Results: {best.get('run_dir', '')}")
-        else:
-            logger.warning("[FAILED] NO PARAMETERS PASSED QUALITY GATES!")
+                write(f"Consistency Score: {best.get('consistency_score'):.2f} (multi-period)\n")
+            write("Parameters: " + ", ".join(f"{k}={v}" for k, v in best.get('parameters', {}).items()) + "\n")
+            write(f"Results: {best.get('run_dir', '')}\n")
+
+        rankings = comparison['rankings']
 
         # Top 5 by Composite Score
-        logger.info("")
-        logger.info("-" * 100)
-        logger.info("[TOP 5] BY COMPOSITE SCORE (Recommended)")
-        logger.info("-" * 100)
-        logger.info(f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Score':<12} {'Profit':<10} {'Win Rate':<10} {'Max DD':<10}")
-        logger.info("-" * 100)
-
-        composite_ranking = comparison['rankings'].get('by_composite_score', [])
-        for i, item in enumerate(composite_ranking[:5], 1):
-            logger.info(
-                f"{i:<6} {item['strategy'].upper():<20} {item['phase']:<7} "
-                f"{item.get('composite_score', 0):<11.1f} ${item.get('net_profit', 0):<9.2f} "
-                f"{item.get('win_rate', 0):<9.1f}% {item.get('max_drawdown_pct', 0):<9.2f}%"
-            )
+        self._write_section_header(write, "[TOP 5] BY COMPOSITE SCORE (Recommended)")
+        write(COMPOSITE_HEADER + "\n")
+        write(SUBRULE + "\n")
+        for i, item in enumerate(rankings.get('by_composite_score', [])[:5], 1):
+            write(COMPOSITE_ROW_FMT(
+                i, item['strategy'].upper(), item['phase'], item.get('composite_score', 0),
+                item.get('net_profit', 0), item.get('win_rate', 0), item.get('max_drawdown_pct', 0)
+            ))
 
         # Top 5 by Profit
-        logger.info("")
-        logger.info("-" * 100)
-        logger.info("[TOP 5] BY PROFIT")
-        logger.info("-" * 100)
-        logger.info(f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Profit':<12} {'Win Rate':<10} {'Trades':<8}")
-        logger.info("-" * 100)
-
-        for i, item in enumerate(comparison['rankings']['by_profit'][:5], 1):
-            logger.info(
-                f"{i:<6} {item['strategy'].upper():<20} {item['phase']:<7} "
-                f"${item['profit']:<11.2f} {item['win_rate']:<9.1f}% {item['total_trades']:<8}"
-            )
+        self._write_section_header(write, "[TOP 5] BY PROFIT")
+        write(PROFIT_HEADER + "\n")
+        write(SUBRULE + "\n")
+        for i, item in enumerate(rankings['by_profit'][:5], 1):
+            write(PROFIT_ROW_FMT(
+                i, item['strategy'].upper(), item['phase'],
+                item['profit'], item['win_rate'], item['total_trades']
+            ))
 
         # Top 5 by Win Rate
-        logger.info("")
-        logger.info("-" * 100)
-        logger.info("[TOP 5] BY WIN RATE")
-        logger.info("-" * 100)
-        logger.info(f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Win Rate':<12} {'Profit':<10} {'Trades':<8}")
-        logger.info("-" * 100)
-
-        for i, item in enumerate(comparison['rankings']['by_win_rate'][:5], 1):
-            logger.info(
-                f"{i:<6} {item['strategy'].upper():<20} {item['phase']:<7} "
-                f"{item['win_rate']:<11.1f}% ${item['profit']:<9.2f} {item['total_trades']:<8}"
-            )
+        self._write_section_header(write, "[TOP 5] BY WIN RATE")
+        write(WIN_RATE_HEADER + "\n")
+        write(SUBRULE + "\n")
+        for i, item in enumerate(rankings['by_win_rate'][:5], 1):
+            write(WIN_RATE_ROW_FMT(
+                i, item['strategy'].upper(), item['phase'],
+                item['win_rate'], item['profit'], item['total_trades']
+            ))
 
         # Top 5 by Lowest Drawdown (Safest)
-        logger.info("")
-        logger.info("-" * 100)
-        logger.info("[TOP 5] BY LOWEST DRAWDOWN (Safest)")
-        logger.info("-" * 100)
-        logger.info(f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Max DD':<12} {'Profit':<10} {'Win Rate':<10}")
-        logger.info("-" * 100)
-
-        for i, item in enumerate(comparison['rankings']['by_lowest_drawdown'][:5], 1):
-            logger.info(
-                f"{i:<6} {item['strategy'].upper():<20} {item['phase']:<7} "
-                f"{item['max_drawdown_pct']:<11.2f}% ${item['profit']:<9.2f} {item['win_rate']:<9.1f}%"
-            )
+        self._write_section_header(write, "[TOP 5] BY LOWEST DRAWDOWN (Safest)")
+        write(DRAWDOWN_HEADER + "\n")
+        write(SUBRULE + "\n")
+        for i, item in enumerate(rankings['by_lowest_drawdown'][:5], 1):
+            write(DRAWDOWN_ROW_FMT(
+                i, item['strategy'].upper(), item['phase'],
+                item['max_drawdown_pct'], item['profit'], item['win_rate']
+            ))
 
         # Top 5 by Risk-Adjusted
-        logger.info("")
-        logger.info("-" * 100)
-        logger.info("[TOP 5] BY RISK-ADJUSTED RETURN (Recommended)")
-        logger.info("-" * 100)
-        logger.info(f"{'Rank':<6} {'Strategy':<20} {'Phase':<7} {'Score':<12} {'Profit':<10} {'Max DD':<10}")
-        logger.info("-" * 100)
-
-        for i, item in enumerate(comparison['rankings']['by_risk_adjusted'][:5], 1):
-            logger.info(
-                f"{i:<6} {item['strategy'].upper():<20} {item['phase']:<7} "
-                f"{item['value']:<11.2f} ${item['profit']:<9.2f} {item['max_drawdown_pct']:<9.2f}%"
-            )
-
-        logger.info("")
-        logger.info("=" * 100)
+        self._write_section_header(write, "[TOP 5] BY RISK-ADJUSTED RETURN (Recommended)")
+        write(RISK_ADJUSTED_HEADER + "\n")
+        write(SUBRULE + "\n")
+        for i, item in enumerate(rankings['by_risk_adjusted'][:5], 1):
+            write(RISK_ADJUSTED_ROW_FMT(
+                i, item['strategy'].upper(), item['phase'],
+                item['risk_adjusted'], item['profit'], item['max_drawdown_pct']
+            ))
+
+        write("\n")
+        write(RULE)
+
+        return buf.getvalue()
+
+    @staticmethod
+    def _write_section_header(write, title: str):
+        """Write a report section header to a buffer's write method."""
+        write("\n")
+        write(SUBRULE + "\n")
+        write(title + "\n")
+        write(SUBRULE + "\n")
 
     def save_comparison(self, comparison: Dict[str, Any], output_file: str):
         """Save comparison to JSON file."""
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w') as f:
-            json.dump(comparison, f, indent=2)
+        write_json(output_path, comparison)
 
         logger.info(f"Saved comparison report to: {output_path}")
 
 
+def aggregate(
+    batch_dir: Optional[str] = None,
+    run_dirs: Optional[List[str]] = None,
+    ranking_profile: str = 'balanced',
+    top_n: Optional[int] = 10,
+    output_file: Optional[str] = None,
+    results: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Load, compare, report and save results in one call.
+
+    Args:
+        batch_dir: Directory containing batch_metadata.json from batch run.
+        run_dirs: List of individual run directories to compare.
+        ranking_profile: Ranking profile name.
+        top_n: Entries kept per ranking (None = all).
+        output_file: Where to save the comparison JSON. Defaults to
+            comparison_report.json in batch_dir; not saved for run_dirs.
+        results: Already loaded results for batch_dir, skipping the
+            results DB and run files.
+
+    Returns:
+        Comparison dictionary.
+    """
+    aggregator = ResultsAggregator(batch_dir=batch_dir, run_dirs=run_dirs, ranking_profile=ranking_profile)
+
+    aggregator.load_results(results)
+    comparison = aggregator.generate_comparison(top_n=top_n)
+    aggregator.print_comparison(comparison)
+
+    if output_file is None and batch_dir:
+        output_file = str(Path(batch_dir) / "comparison_report.json")
+    if output_file:
+        aggregator.save_comparison(comparison, output_file)
+
+    return comparison
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Aggregate and compare results from multiple grid search runs with intelligent ranking'
@@ -419,6 +667,12 @@ def main():
         type=str,
         help='Output file for comparison JSON (optional)'
     )
+    parser.add_argument(
+        '--top-n',
+        type=int,
+        default=10,
+        help='Entries kept per ranking in the comparison (0 = all, default: 10)'
+    )
     parser.add_argument(
         '--profile',
         type=str,
@@ -434,27 +688,14 @@ def main():
 
     logger.info(f"Using ranking profile: {args.profile}")
 
-    # Create aggregator
-    if args.batch:
-        aggregator = ResultsAggregator(batch_dir=args.batch, ranking_profile=args.profile)
-    else:
-        run_dirs = [d.strip() for d in args.runs.split(',')]
-        aggregator = ResultsAggregator(run_dirs=run_dirs, ranking_profile=args.profile)
-
-    # Load and compare results
-    aggregator.load_results()
-    comparison = aggregator.generate_comparison()
-
-    # Print comparison
-    aggregator.print_comparison(comparison)
-
-    # Save to file if requested
-    if args.output:
-        aggregator.save_comparison(comparison, args.output)
-    elif args.batch:
-        # Auto-save to batch directory
-        output_file = Path(args.batch) / "comparison_report.json"
-        aggregator.save_comparison(comparison, str(output_file))
+    run_dirs = None if args.batch else [d.strip() for d in args.runs.split(',')]
+    aggregate(
+        batch_dir=args.batch,
+        run_dirs=run_dirs,
+        ranking_profile=args.profile,
+        top_n=args.top_n or None,
+        output_file=args.output
+    )
 
 
 if __name__ == '__main__':
@@ -5,17 +5,111 @@ Analyzes grid search results and ranks parameter combinations.
 """
 
 import argparse
-import json
+import functools
+import importlib.util
+import logging
 import os
+from itertools import islice
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 import sys
 
+import numpy as np
+
+# numba is only imported once a run is large enough to use it (the import
+# alone costs ~0.5s); find_spec checks availability without importing
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils import setup_logger
+from utils import setup_logger, read_json, write_json
 
 logger = setup_logger("ANALYZE")
 
+# Combo loading is I/O bound, so oversubscribe the CPU count
+LOAD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Aggregate fields copied into the analysis array, in one lookup per combo
+AGGREGATE_FIELDS = itemgetter('total_profit', 'avg_win_rate', 'total_trades')
+
+# Report layout, compiled once instead of re-parsing f-strings per row
+THIN_RULE = "─" * 100
+SUBRULE = "-" * 100
+PROFIT_HEADER = f"{'Rank':<6} {'Combo':<8} {'Profit':<14} {'Win Rate':<12} {'Trades':<10} Parameters"
+WIN_RATE_HEADER = f"{'Rank':<6} {'Combo':<8} {'Win Rate':<12} {'Profit':<14} {'Trades':<10} Parameters"
+PROFIT_FACTOR_HEADER = f"{'Rank':<6} {'Combo':<8} {'PF':<8} {'Profit':<14} {'Win Rate':<12} Parameters"
+DRAWDOWN_HEADER = f"{'Rank':<6} {'Combo':<8} {'MaxDD':<10} {'Profit':<14} {'Win Rate':<12} Parameters"
+SHARPE_HEADER = f"{'Rank':<6} {'Combo':<8} {'P/DD':<10} {'Profit':<14} {'MaxDD':<10} Parameters"
+PROFIT_ROW_FMT = "{:<6} {:<8} ${:<13.2f} {:<11.1f}% {:<10} {}".format
+WIN_RATE_ROW_FMT = "{:<6} {:<8} {:<11.1f}% ${:<13.2f} {:<10} {}".format
+PROFIT_FACTOR_ROW_FMT = "{:<6} {:<8} {:<7.2f} ${:<13.2f} {:<11.1f}% {}".format
+DRAWDOWN_ROW_FMT = "{:<6} {:<8} {:<9.1f}% ${:<13.2f} {:<11.1f}% {}".format
+SHARPE_ROW_FMT = "{:<6} {:<8} {:<9.1f} ${:<13.2f} {:<9.1f}% {}".format
+
+# Per-combo metrics used for ranking
+ANALYSIS_DTYPE = [
+    ('profit', 'f8'),
+    ('win_rate', 'f8'),
+    ('avg_pf', 'f8'),
+    ('max_dd', 'f8'),
+    ('sharpe', 'f8'),
+    ('trades', 'i8'),
+]
+
+# Below this many combos the NumPy path beats JIT dispatch overhead
+NUMBA_MIN_COMBOS = 500
+
+
+def _derived_metrics_loop(profit, pf, dd, avg_pf, max_dd, sharpe):
+    """
+    Fused single pass over the symbol matrices; same results as the
+    NumPy path in ResultsAnalyzer._compute_derived_metrics.
+
+    Plain Python; compiled with Numba by _derived_metrics_kernel().
+    """
+    for i in range(pf.shape[0]):
+        pf_sum = 0.0
+        pf_count = 0
+        worst_dd = 100.0
+        has_dd = False
+        for j in range(pf.shape[1]):
+            if pf[i, j] > 0:
+                pf_sum += pf[i, j]
+                pf_count += 1
+            if not np.isnan(dd[i, j]) and (not has_dd or dd[i, j] > worst_dd):
+                worst_dd = dd[i, j]
+                has_dd = True
+
+        avg_pf[i] = pf_sum / pf_count if pf_count > 0 else 0.0
+        max_dd[i] = worst_dd
+        sharpe[i] = profit[i] / worst_dd if worst_dd > 0 else 0.0
+
+
+@functools.lru_cache(maxsize=1)
+def _derived_metrics_kernel():
+    """Import numba and JIT-compile _derived_metrics_loop on first use."""
+    from numba import njit
+    return njit(cache=True)(_derived_metrics_loop)
+
+
+def _top_indices(values: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+    """
+    Indices of the top-k values in rank order.
+
+    Uses np.argpartition (O(n)) to select candidates, then orders only those.
+    Ties are broken by original position, matching a stable full sort.
+    """
+    key = -values if descending else values
+    if len(key) <= k:
+        return np.argsort(key, kind='stable')
+
+    kth = key[np.argpartition(key, k - 1)[:k]].max()
+    better = np.flatnonzero(key < kth)
+    ties = np.flatnonzero(key == kth)[:k - len(better)]
+    idx = np.concatenate([better, ties])
+    return idx[np.argsort(key[idx], kind='stable')]
+
 
 class ResultsAnalyzer:
     """Analyze and rank grid search results."""
@@ -24,22 +118,29 @@ class ResultsAnalyzer:
         self.run_dir = run_directory
         self.results = []
         self.metadata = {}
+        self._arr = None
+        self._params_strs = {}
 
     def load_results(self):
         """Load all results from the run directory."""
+        self._arr = None
+        self._params_strs = {}
+
         # Load metadata
         metadata_file = os.path.join(self.run_dir, 'metadata.json')
         if os.path.exists(metadata_file):
-            with open(metadata_file, 'r') as f:
-                self.metadata = json.load(f)
+            self.metadata = read_json(metadata_file)
 
         # Load all combo results
-        combo_files = [f for f in os.listdir(self.run_dir) if f.startswith('combo_') and f.endswith('.json')]
+        with os.scandir(self.run_dir) as entries:
+            combo_entries = [e for e in entries if e.name.startswith('combo_') and e.name.endswith('.json')]
+        combo_entries.sort(key=lambda e: e.name)
 
-        for combo_file in sorted(combo_files):
-            file_path = os.path.join(self.run_dir, combo_file)
-            with open(file_path, 'r') as f:
-                self.results.append(json.load(f))
+        combo_paths = [e.path for e in combo_entries]
+        if combo_paths:
+            # map() preserves file order
+            with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(combo_paths))) as executor:
+                self.results.extend(executor.map(read_json, combo_paths))
 
         logger.info(f"Loaded {len(self.results)} combinations from {self.run_dir}")
 
@@ -49,216 +150,286 @@ class ResultsAnalyzer:
             logger.error("No results to analyze")
             return
 
+        # Everything but the recommendation file is report-only
+        report = logger.isEnabledFor(logging.INFO)
+
         # Print run info
-        logger.info(f"\n{'='*100}")
-        logger.info(f"GRID SEARCH RESULTS ANALYSIS")
-        logger.info(f"{'='*100}")
-        logger.info(f"Run: {os.path.basename(self.run_dir)}")
-        logger.info(f"Strategy: {self.metadata.get('strategy', 'Unknown')}")
-        logger.info(f"Symbols: {', '.join(self.metadata.get('symbols', []))}")
-        logger.info(f"Total Combinations: {len(self.results)}")
-        logger.info(f"{'='*100}\n")
+        if report:
+            self._log_run_info()
+
+        # Derived metrics are computed once; the rankings only read them
+        self._compute_derived_metrics()
 
         # Rankings by different metrics
-        self._rank_by_profit()
-        self._rank_by_win_rate()
-        self._rank_by_profit_factor()
-        self._rank_by_drawdown()
-        self._rank_by_sharpe()
+        if report:
+            self._rank_by_profit()
+            self._rank_by_win_rate()
+            self._rank_by_profit_factor()
+            self._rank_by_drawdown()
+            self._rank_by_sharpe()
 
         # Overall recommendation
         self._generate_recommendation()
 
+    def _log_run_info(self):
+        """Log the run header."""
+        lines = []
+        lines.append(f"\n{'='*100}")
+        lines.append(f"GRID SEARCH RESULTS ANALYSIS")
+        lines.append(f"{'='*100}")
+        lines.append(f"Run: {os.path.basename(self.run_dir)}")
+        lines.append(f"Strategy: {self.metadata.get('strategy', 'Unknown')}")
+        lines.append(f"Symbols: {', '.join(self.metadata.get('symbols', []))}")
+        lines.append(f"Total Combinations: {len(self.results)}")
+        lines.append(f"{'='*100}\n")
+        logger.info("\n".join(lines))
+
+    def _compute_derived_metrics(self) -> np.ndarray:
+        """
+        Pack per-combo metrics into a structured array in a single pass.
+
+        Derived metrics are computed with vector ops: average profit factor
+        over symbols with PF > 0, worst drawdown across symbols, and the
+        profit/drawdown ratio. Large runs use a Numba kernel when available.
+        """
+        if self._arr is not None:
+            return self._arr
+
+        n = len(self.results)
+        n_symbols = max((len(r['results']) for r in self.results), default=0)
+
+        # Symbol-level metrics, NaN-padded for combos with fewer symbols
+        pf = np.full((n, n_symbols), np.nan)
+        dd = np.full((n, n_symbols), np.nan)
+        for i, result in enumerate(self.results):
+            for j, symbol_result in enumerate(result['results'].values()):
+                pf[i, j] = symbol_result['profit_factor']
+                dd[i, j] = symbol_result['max_drawdown_pct']
+
+        arr = np.empty(n, dtype=ANALYSIS_DTYPE)
+        if n:
+            aggregates = [AGGREGATE_FIELDS(r['aggregate']) for r in self.results]
+            arr['profit'], arr['win_rate'], arr['trades'] = zip(*aggregates)
+
+        if NUMBA_AVAILABLE and n > NUMBA_MIN_COMBOS:
+            kernel = _derived_metrics_kernel()
+            kernel(arr['profit'], pf, dd, arr['avg_pf'], arr['max_dd'], arr['sharpe'])
+            self._arr = arr
+            return arr
+
+        positive_pf = pf > 0
+        pf_count = positive_pf.sum(axis=1)
+        pf_sum = np.where(positive_pf, pf, 0.0).sum(axis=1)
+        arr['avg_pf'] = np.divide(pf_sum, pf_count, out=np.zeros(n), where=pf_count > 0)
+
+        has_dd = ~np.isnan(dd).all(axis=1) if n_symbols else np.zeros(n, dtype=bool)
+        arr['max_dd'] = 100.0
+        if has_dd.any():
+            arr['max_dd'][has_dd] = np.nanmax(dd[has_dd], axis=1)
+
+        arr['sharpe'] = np.divide(
+            arr['profit'], arr['max_dd'], out=np.zeros(n), where=arr['max_dd'] > 0
+        )
+
+        self._arr = arr
+        return arr
+
+    def _params_str(self, idx: int) -> str:
+        """First four parameters of a combo as 'k=v, ...', built once per combo."""
+        params_str = self._params_strs.get(idx)
+        if params_str is None:
+            parameters = self.results[idx]['parameters']
+            params_str = ', '.join(f"{k}={v}" for k, v in islice(parameters.items(), 4))
+            self._params_strs[idx] = params_str
+        return params_str
+
     def _rank_by_profit(self):
         """Rank combinations by total profit."""
-        sorted_results = sorted(
-            self.results,
-            key=lambda x: x['aggregate']['total_profit'],
-            reverse=True
-        )
+        arr = self._arr
 
-        logger.info(f"\n{'─'*100}")
-        logger.info("RANKED BY TOTAL PROFIT")
-        logger.info(f"{'─'*100}")
-        logger.info(f"{'Rank':<6} {'Combo':<8} {'Profit':<14} {'Win Rate':<12} {'Trades':<10} Parameters")
-        logger.info(f"{'-'*100}")
-
-        for i, result in enumerate(sorted_results[:10], 1):
-            params_str = ', '.join([f"{k}={v}" for k, v in list(result['parameters'].items())[:4]])
-            logger.info(
-                f"{i:<6} {result['combo_id']:<8} "
-                f"${result['aggregate']['total_profit']:<13.2f} "
-                f"{result['aggregate']['avg_win_rate']:<11.1f}% "
-                f"{result['aggregate']['total_trades']:<10} "
-                f"{params_str}"
-            )
+        lines = []
+        lines.append(f"\n{THIN_RULE}")
+        lines.append("RANKED BY TOTAL PROFIT")
+        lines.append(THIN_RULE)
+        lines.append(PROFIT_HEADER)
+        lines.append(SUBRULE)
+
+        for i, idx in enumerate(_top_indices(arr['profit'], 10), 1):
+            row = arr[idx]
+            lines.append(PROFIT_ROW_FMT(
+                i, self.results[idx]['combo_id'], row['profit'], row['win_rate'], row['trades'],
+                self._params_str(idx)
+            ))
+
+        logger.info("\n".join(lines))
 
     def _rank_by_win_rate(self):
         """Rank combinations by win rate."""
-        sorted_results = sorted(
-            self.results,
-            key=lambda x: x['aggregate']['avg_win_rate'],
-            reverse=True
-        )
+        arr = self._arr
 
-        logger.info(f"\n{'─'*100}")
-        logger.info("RANKED BY WIN RATE")
-        logger.info(f"{'─'*100}")
-        logger.info(f"{'Rank':<6} {'Combo':<8} {'Win Rate':<12} {'Profit':<14} {'Trades':<10} Parameters")
-        logger.info(f"{'-'*100}")
-
-        for i, result in enumerate(sorted_results[:10], 1):
-            params_str = ', '.join([f"{k}={v}" for k, v in list(result['parameters'].items())[:4]])
-            logger.info(
-                f"{i:<6} {result['combo_id']:<8} "
-                f"{result['aggregate']['avg_win_rate']:<11.1f}% "
-                f"${result['aggregate']['total_profit']:<13.2f} "
-                f"{result['aggregate']['total_trades']:<10} "
-                f"{params_str}"
-            )
+        lines = []
+        lines.append(f"\n{THIN_RULE}")
+        lines.append("RANKED BY WIN RATE")
+        lines.append(THIN_RULE)
+        lines.append(WIN_RATE_HEADER)
+        lines.append(SUBRULE)
+
+        for i, idx in enumerate(_top_indices(arr['win_rate'], 10), 1):
+            row = arr[idx]
+            lines.append(WIN_RATE_ROW_FMT(
+                i, self.results[idx]['combo_id'], row['win_rate'], row['profit'], row['trades'],
+                self._params_str(idx)
+            ))
+
+        logger.info("\n".join(lines))
 
     def _rank_by_profit_factor(self):
         """Rank combinations by average profit factor."""
-        # Calculate average profit factor across symbols
-        for result in self.results:
-            pf_values = [r['profit_factor'] for r in result['results'].values() if r['profit_factor'] > 0]
-            result['avg_profit_factor'] = sum(pf_values) / len(pf_values) if pf_values else 0
-
-        sorted_results = sorted(
-            self.results,
-            key=lambda x: x.get('avg_profit_factor', 0),
-            reverse=True
-        )
+        arr = self._arr
 
-        logger.info(f"\n{'─'*100}")
-        logger.info("RANKED BY PROFIT FACTOR")
-        logger.info(f"{'─'*100}")
-        logger.info(f"{'Rank':<6} {'Combo':<8} {'PF':<8} {'Profit':<14} {'Win Rate':<12} Parameters")
-        logger.info(f"{'-'*100}")
-
-        for i, result in enumerate(sorted_results[:10], 1):
-            params_str = ', '.join([f"{k}={v}" for k, v in list(result['parameters'].items())[:4]])
-            logger.info(
-                f"{i:<6} {result['combo_id']:<8} "
-                f"{result.get('avg_profit_factor', 0):<7.2f} "
-                f"${result['aggregate']['total_profit']:<13.2f} "
-                f"{result['aggregate']['avg_win_rate']:<11.1f}% "
-                f"{params_str}"
-            )
+        lines = []
+        lines.append(f"\n{THIN_RULE}")
+        lines.append("RANKED BY PROFIT FACTOR")
+        lines.append(THIN_RULE)
+        lines.append(PROFIT_FACTOR_HEADER)
+        lines.append(SUBRULE)
+
+        for i, idx in enumerate(_top_indices(arr['avg_pf'], 10), 1):
+            row = arr[idx]
+            lines.append(PROFIT_FACTOR_ROW_FMT(
+                i, self.results[idx]['combo_id'], row['avg_pf'], row['profit'], row['win_rate'],
+                self._params_str(idx)
+            ))
+
+        logger.info("\n".join(lines))
 
     def _rank_by_drawdown(self):
         """Rank combinations by lowest max drawdown."""
-        # Calculate max drawdown across symbols
-        for result in self.results:
-            dd_values = [r['max_drawdown_pct'] for r in result['results'].values()]
-            result['max_drawdown'] = max(dd_values) if dd_values else 100
-
-        sorted_results = sorted(
-            self.results,
-            key=lambda x: x.get('max_drawdown', 100)
-        )
+        arr = self._arr
+
+        lines = []
+        lines.append(f"\n{THIN_RULE}")
+        lines.append("RANKED BY LOWEST DRAWDOWN (Safest)")
+        lines.append(THIN_RULE)
+        lines.append(DRAWDOWN_HEADER)
+        lines.append(SUBRULE)
+
+        for i, idx in enumerate(_top_indices(arr['max_dd'], 10, descending=False), 1):
+            row = arr[idx]
+            lines.append(DRAWDOWN_ROW_FMT(
+                i, self.results[idx]['combo_id'], row['max_dd'], row['profit'], row['win_rate'],
+                self._params_str(idx)
+            ))
 
-        logger.info(f"\n{'─'*100}")
-        logger.info("RANKED BY LOWEST DRAWDOWN (Safest)")
-        logger.info(f"{'─'*100}")
-        logger.info(f"{'Rank':<6} {'Combo':<8} {'MaxDD':<10} {'Profit':<14} {'Win Rate':<12} Parameters")
-        logger.info(f"{'-'*100}")
-
-        for i, result in enumerate(sorted_results[:10], 1):
-            params_str = ', '.join([f"{k}={v}" for k, v in list(result['parameters'].items())[:4]])
-            logger.info(
-                f"{i:<6} {result['combo_id']:<8} "
-                f"{result.get('max_drawdown', 0):<9.1f}% "
-                f"${result['aggregate']['total_profit']:<13.2f} "
-                f"{result['aggregate']['avg_win_rate']:<11.1f}% "
-                f"{params_str}"
-            )
+        logger.info("\n".join(lines))
 
     def _rank_by_sharpe(self):
         """Rank combinations by risk-adjusted returns (Sharpe-like metric)."""
         # Simple Sharpe approximation: Profit / MaxDD
-        for result in self.results:
-            profit = result['aggregate']['total_profit']
-            max_dd = result.get('max_drawdown', 1)
-            result['sharpe_proxy'] = profit / max_dd if max_dd > 0 else 0
-
-        sorted_results = sorted(
-            self.results,
-            key=lambda x: x.get('sharpe_proxy', 0),
-            reverse=True
-        )
+        arr = self._arr
+
+        lines = []
+        lines.append(f"\n{THIN_RULE}")
+        lines.append("RANKED BY RISK-ADJUSTED RETURNS (Profit/DD ratio)")
+        lines.append(THIN_RULE)
+        lines.append(SHARPE_HEADER)
+        lines.append(SUBRULE)
+
+        for i, idx in enumerate(_top_indices(arr['sharpe'], 10), 1):
+            row = arr[idx]
+            lines.append(SHARPE_ROW_FMT(
+                i, self.results[idx]['combo_id'], row['sharpe'], row['profit'], row['max_dd'],
+                self._params_str(idx)
+            ))
 
-        logger.info(f"\n{'─'*100}")
-        logger.info("RANKED BY RISK-ADJUSTED RETURNS (Profit/DD ratio)")
-        logger.info(f"{'─'*100}")
-        logger.info(f"{'Rank':<6} {'Combo':<8} {'P/DD':<10} {'Profit':<14} {'MaxDD':<10} Parameters")
-        logger.info(f"{'-'*100}")
-
-        for i, result in enumerate(sorted_results[:10], 1):
-            params_str = ', '.join([f"{k}={v}" for k, v in list(result['parameters'].items())[:4]])
-            logger.info(
-                f"{i:<6} {result['combo_id']:<8} "
-                f"{result.get('sharpe_proxy', 0):<9.1f} "
-                f"${result['aggregate']['total_profit']:<13.2f} "
-                f"{result.get('max_drawdown', 0):<9.1f}% "
-                f"{params_str}"
-            )
+        logger.info("\n".join(lines))
 
     def _generate_recommendation(self):
         """Generate overall recommendation."""
+        arr = self._arr
+
         # Best by profit
-        best_profit = max(self.results, key=lambda x: x['aggregate']['total_profit'])
+        best_profit = self.results[int(np.argmax(arr['profit']))]
 
         # Best by win rate
-        best_wr = max(self.results, key=lambda x: x['aggregate']['avg_win_rate'])
+        best_wr = self.results[int(np.argmax(arr['win_rate']))]
 
         # Best by drawdown (lowest)
-        best_dd = min(self.results, key=lambda x: x.get('max_drawdown', 100))
+        best_dd_idx = int(np.argmin(arr['max_dd']))
+        best_dd = self.results[best_dd_idx]
 
         # Best risk-adjusted
-        best_sharpe = max(self.results, key=lambda x: x.get('sharpe_proxy', 0))
-
-        logger.info(f"\n{'='*100}")
-        logger.info("RECOMMENDATION SUMMARY")
-        logger.info(f"{'='*100}\n")
-
-        logger.info(f"BEST FOR MAXIMUM PROFIT:")
-        logger.info(f"  Combo: {best_profit['combo_id']}")
-        logger.info(f"  Parameters: {best_profit['parameters']}")
-        logger.info(f"  Profit: ${best_profit['aggregate']['total_profit']:.2f}")
-        logger.info(f"  Win Rate: {best_profit['aggregate']['avg_win_rate']:.1f}%")
-
-        logger.info(f"\nBEST FOR CONSISTENCY (Highest Win Rate):")
-        logger.info(f"  Combo: {best_wr['combo_id']}")
-        logger.info(f"  Parameters: {best_wr['parameters']}")
-        logger.info(f"  Win Rate: {best_wr['aggregate']['avg_win_rate']:.1f}%")
-        logger.info(f"  Profit: ${best_wr['aggregate']['total_profit']:.2f}")
-
-        logger.info(f"\nBEST FOR SAFETY (Lowest Drawdown):")
-        logger.info(f"  Combo: {best_dd['combo_id']}")
-        logger.info(f"  Parameters: {best_dd['parameters']}")
-        logger.info(f"  Max Drawdown: {best_dd.get('max_drawdown', 0):.1f}%")
-        logger.info(f"  Profit: ${best_dd['aggregate']['total_profit']:.2f}")
-
-        logger.info(f"\nBEST RISK-ADJUSTED (Recommended):")
-        logger.info(f"  Combo: {best_sharpe['combo_id']}")
-        logger.info(f"  Parameters: {best_sharpe['parameters']}")
-        logger.info(f"  Profit/DD Ratio: {best_sharpe.get('sharpe_proxy', 0):.1f}")
-        logger.info(f"  Profit: ${best_sharpe['aggregate']['total_profit']:.2f}")
-        logger.info(f"  Max Drawdown: {best_sharpe.get('max_drawdown', 0):.1f}%")
+        best_sharpe_idx = int(np.argmax(arr['sharpe']))
+        best_sharpe = self.results[best_sharpe_idx]
 
         # Save recommended parameters
         rec_file = os.path.join(self.run_dir, 'recommended_params.json')
-        with open(rec_file, 'w') as f:
-            json.dump({
-                'best_profit': best_profit['parameters'],
-                'best_win_rate': best_wr['parameters'],
-                'best_drawdown': best_dd['parameters'],
-                'best_risk_adjusted': best_sharpe['parameters']
-            }, f, indent=2)
+        write_json(rec_file, {
+            'best_profit': best_profit['parameters'],
+            'best_win_rate': best_wr['parameters'],
+            'best_drawdown': best_dd['parameters'],
+            'best_risk_adjusted': best_sharpe['parameters']
+        })
+
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        lines = []
+        lines.append(f"\n{'='*100}")
+        lines.append("RECOMMENDATION SUMMARY")
+        lines.append(f"{'='*100}\n")
+
+        lines.append(f"BEST FOR MAXIMUM PROFIT:")
+        lines.append(f"  Combo: {best_profit['combo_id']}")
+        lines.append(f"  Parameters: {best_profit['parameters']}")
+        lines.append(f"  Profit: ${best_profit['aggregate']['total_profit']:.2f}")
+        lines.append(f"  Win Rate: {best_profit['aggregate']['avg_win_rate']:.1f}%")
+
+        lines.append(f"\nBEST FOR CONSISTENCY (Highest Win Rate):")
+        lines.append(f"  Combo: {best_wr['combo_id']}")
+        lines.append(f"  Parameters: {best_wr['parameters']}")
+        lines.append(f"  Win Rate: {best_wr['aggregate']['avg_win_rate']:.1f}%")
+        lines.append(f"  Profit: ${best_wr['aggregate']['total_profit']:.2f}")
+
+        lines.append(f"\nBEST FOR SAFETY (Lowest Drawdown):")
+        lines.append(f"  Combo: {best_dd['combo_id']}")
+        lines.append(f"  Parameters: {best_dd['parameters']}")
+        lines.append(f"  Max Drawdown: {arr['max_dd'][best_dd_idx]:.1f}%")
+        lines.append(f"  Profit: ${best_dd['aggregate']['total_profit']:.2f}")
+
+        lines.append(f"\nBEST RISK-ADJUSTED (Recommended):")
+        lines.append(f"  Combo: {best_sharpe['combo_id']}")
+        lines.append(f"  Parameters: {best_sharpe['parameters']}")
+        lines.append(f"  Profit/DD Ratio: {arr['sharpe'][best_sharpe_idx]:.1f}")
+        lines.append(f"  Profit: ${best_sharpe['aggregate']['total_profit']:.2f}")
+        lines.append(f"  Max Drawdown: {arr['max_dd'][best_sharpe_idx]:.1f}%")
+
+        lines.append(f"\nRecommended parameters saved to: {rec_file}")
+        lines.append(f"{'='*100}\n")
 
-        logger.info(f"\nRecommended parameters saved to: {rec_file}")
-        logger.info(f"{'='*100}\n")
+        logger.info("\n".join(lines))
+
+
+def run(run_dir: str) -> ResultsAnalyzer:
+    """
+    Analyze a grid search run without going through the CLI.
+
+    Args:
+        run_dir: Grid search run directory.
+
+    Returns:
+        The analyzer (recommended_params.json is written if the run has results).
+
+    Raises:
+        FileNotFoundError: If the run directory does not exist.
+    """
+    if not os.path.exists(run_dir):
+        raise FileNotFoundError(f"Run directory not found: {run_dir}")
+
+    analyzer = ResultsAnalyzer(run_dir)
+    analyzer.load_results()
+    analyzer.analyze()
+    return analyzer
 
 
 def main():
@@ -269,14 +440,12 @@ def main():
 
     args = parser.parse_args()
 
-    if not os.path.exists(args.run):
-        logger.error(f"Run directory not found: {args.run}")
+    try:
+        run(args.run)
+    except FileNotFoundError as e:
+        logger.error(str(e))
         sys.exit(1)
 
-    analyzer = ResultsAnalyzer(args.run)
-    analyzer.load_results()
-    analyzer.analyze()
-
 
 if __name__ == "__main__":
     main()
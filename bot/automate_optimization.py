@@ -5,8 +5,7 @@ End-to-end automated optimization: generate params, test, analyze, compare, appl
 """
 
 import argparse
-import subprocess
-import json
+import math
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
@@ -15,10 +14,25 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils import setup_logger
+from utils import setup_logger, log_block
+from bot.aggregate_results import aggregate
+from bot.batch_grid_search import BatchGridSearchRunner
+from bot.config import StrategyType
+from bot.config_manager import ConfigManager
+from bot.optimize_parameters import PARAM_GRIDS, refine_param_grid
 
 logger = setup_logger("AUTOMATE")
 
+# Strategy names come from config so the CLI cannot drift from it
+ALL_STRATEGIES = [s.value for s in StrategyType]
+VALID_STRATEGIES = frozenset(ALL_STRATEGIES)
+VALID_PHASES = frozenset({1, 2, 3})
+
+
+def _step_banner(title: str) -> List[str]:
+    """Lines of a boxed step heading, preceded by a blank line."""
+    return ["", "┌" + "─" * 98 + "┐", f"│ {title}".ljust(99) + "│", "└" + "─" * 98 + "┘"]
+
 
 class WorkflowOrchestrator:
     """Orchestrates complete end-to-end optimization workflow."""
@@ -31,7 +45,9 @@ class WorkflowOrchestrator:
         days: int,
         max_combinations: int = 50,
         auto_apply: bool = False,
-        apply_type: str = 'risk_adjusted'
+        apply_type: str = 'risk_adjusted',
+        sampler: str = 'lhs',
+        refine_iters: int = 0
     ):
         self.strategies = strategies
         self.symbols = symbols
@@ -40,119 +56,131 @@ class WorkflowOrchestrator:
         self.max_combinations = max_combinations
         self.auto_apply = auto_apply
         self.apply_type = apply_type
+        self.sampler = sampler
+        self.refine_iters = refine_iters
 
         self.batch_dir = None
+        self.batch_results = None
         self.best_result = None
 
     def run(self):
         """Execute complete workflow."""
-        logger.info("=" * 100)
-        logger.info("🚀 AUTOMATED OPTIMIZATION WORKFLOW STARTED")
-        logger.info("=" * 100)
-        logger.info(f"Strategies: {', '.join(self.strategies)}")
-        logger.info(f"Symbols: {', '.join(self.symbols)}")
-        logger.info(f"Phases: {', '.join(map(str, self.phases))}")
-        logger.info(f"Days: {self.days}")
-        logger.info(f"Max Combinations: {self.max_combinations}")
-        logger.info(f"Auto-Apply Best Params: {'Yes' if self.auto_apply else 'No'}")
+        lines = [
+            "=" * 100,
+            "🚀 AUTOMATED OPTIMIZATION WORKFLOW STARTED",
+            "=" * 100,
+            f"Strategies: {', '.join(self.strategies)}",
+            f"Symbols: {', '.join(self.symbols)}",
+            f"Phases: {', '.join(map(str, self.phases))}",
+            f"Days: {self.days}",
+            f"Max Combinations: {self.max_combinations} ({self.sampler} sampling)",
+        ]
+        if self.refine_iters:
+            lines.append(f"Refinement Passes: {self.refine_iters}")
+        lines.append(f"Auto-Apply Best Params: {'Yes' if self.auto_apply else 'No'}")
         if self.auto_apply:
-            logger.info(f"Apply Type: {self.apply_type}")
-        logger.info("=" * 100)
+            lines.append(f"Apply Type: {self.apply_type}")
+        lines.append("=" * 100)
+        log_block(logger, lines)
 
         # Step 1: Run batch grid search
-        logger.info("")
-        logger.info("┌" + "─" * 98 + "┐")
-        logger.info("│ STEP 1/4: Running batch grid search for all strategies...".ljust(99) + "│")
-        logger.info("└" + "─" * 98 + "┘")
+        log_block(logger, _step_banner("STEP 1/4: Running batch grid search for all strategies..."))
 
         self._run_batch_grid_search()
 
         # Step 2: Aggregate and compare results
-        logger.info("")
-        logger.info("┌" + "─" * 98 + "┐")
-        logger.info("│ STEP 2/4: Aggregating and comparing results...".ljust(99) + "│")
-        logger.info("└" + "─" * 98 + "┘")
+        log_block(logger, _step_banner("STEP 2/4: Aggregating and comparing results..."))
 
         comparison = self._aggregate_results()
 
         # Step 3: Display best result
-        logger.info("")
-        logger.info("┌" + "─" * 98 + "┐")
-        logger.info("│ STEP 3/4: Identifying best strategy and parameters...".ljust(99) + "│")
-        logger.info("└" + "─" * 98 + "┘")
+        log_block(logger, _step_banner("STEP 3/4: Identifying best strategy and parameters..."))
 
         self._display_best_result(comparison)
 
+        # Optionally re-search progressively finer grids around the winner
+        if self.refine_iters:
+            self._refine_best_result()
+
         # Step 4: Optionally apply best parameters
         if self.auto_apply:
-            logger.info("")
-            logger.info("┌" + "─" * 98 + "┐")
-            logger.info("│ STEP 4/4: Applying best parameters to config...".ljust(99) + "│")
-            logger.info("└" + "─" * 98 + "┘")
+            log_block(logger, _step_banner("STEP 4/4: Applying best parameters to config..."))
 
             self._apply_best_parameters()
         else:
-            logger.info("")
-            logger.info("┌" + "─" * 98 + "┐")
-            logger.info("│ STEP 4/4: Skipping auto-apply (use --auto-apply to enable)".ljust(99) + "│")
-            logger.info("└" + "─" * 98 + "┘")
+            log_block(logger, _step_banner("STEP 4/4: Skipping auto-apply (use --auto-apply to enable)"))
 
         # Final summary
         self._print_final_summary()
 
-    def _run_batch_grid_search(self):
-        """Run batch grid search."""
-        cmd = [
-            'python', 'bot/batch_grid_search.py',
-            '--strategies', ','.join(self.strategies),
-            '--symbols', ','.join(self.symbols),
-            '--phases', ','.join(map(str, self.phases)),
-            '--days', str(self.days),
-            '--max-combinations', str(self.max_combinations)
-        ]
-
-        logger.info(f"Running: {' '.join(cmd)}")
-
-        result = subprocess.run(cmd)
-
-        if result.returncode != 0:
+    def _run_batch_grid_search(
+        self,
+        strategies: Optional[List[str]] = None,
+        phases: Optional[List[int]] = None,
+        param_grids: Optional[dict] = None
+    ):
+        """Run batch grid search (all configured strategies/phases by default)."""
+        runner = BatchGridSearchRunner(
+            strategies=strategies or self.strategies,
+            symbols=self.symbols,
+            phases=phases or self.phases,
+            days=self.days,
+            max_combinations=self.max_combinations,
+            sampler=self.sampler,
+            param_grids=param_grids
+        )
+
+        results = runner.run()
+
+        if any(r['status'] == 'failed' for r in results.values()):
             logger.error("Batch grid search failed")
             sys.exit(1)
 
-        # Find the most recent batch directory
-        batch_dirs = sorted(Path("tests/results").glob("batch_*"), key=lambda p: p.stat().st_mtime, reverse=True)
-        if not batch_dirs:
-            logger.error("No batch results found")
-            sys.exit(1)
-
-        self.batch_dir = batch_dirs[0]
+        self.batch_dir = runner.batch_dir
+        # Handed straight to aggregation instead of being re-read from disk
+        self.batch_results = runner.run_results
         logger.info(f"✓ Batch grid search completed: {self.batch_dir}")
 
     def _aggregate_results(self) -> dict:
         """Aggregate and compare results."""
-        cmd = [
-            'python', 'bot/aggregate_results.py',
-            '--batch', str(self.batch_dir)
-        ]
+        try:
+            comparison = aggregate(batch_dir=str(self.batch_dir), results=self.batch_results)
+        except (OSError, ValueError) as e:
+            logger.error(f"Results aggregation failed: {e}")
+            sys.exit(1)
 
-        logger.info(f"Running: {' '.join(cmd)}")
+        logger.info(f"✓ Results aggregated and compared")
+        return comparison
 
-        result = subprocess.run(cmd)
+    def _refine_best_result(self):
+        """Re-run the best strategy/phase on finer grids centred on its best parameters."""
+        strategy = self.best_result['strategy']
+        phase = self.best_result['phase']
+        tested = {key: list(values) for key, values in PARAM_GRIDS[strategy].items()}
 
-        if result.returncode != 0:
-            logger.warning("Results aggregation had issues, but continuing...")
+        for i in range(1, self.refine_iters + 1):
+            grid = refine_param_grid(tested, self.best_result['parameters'])
+            n_combinations = math.prod(len(values) for values in grid.values())
+            if n_combinations <= 1:
+                logger.info("Parameter grid fully resolved, stopping refinement")
+                break
 
-        # Load comparison report
-        comparison_file = self.batch_dir / "comparison_report.json"
-        if not comparison_file.exists():
-            logger.error("Comparison report not found")
-            sys.exit(1)
+            log_block(logger, _step_banner(
+                f"REFINEMENT {i}/{self.refine_iters}: {strategy} phase {phase} "
+                f"({n_combinations} combinations)"
+            ))
 
-        with open(comparison_file, 'r') as f:
-            comparison = json.load(f)
+            self._run_batch_grid_search([strategy], [phase], {strategy: grid})
+            comparison = self._aggregate_results()
 
-        logger.info(f"✓ Results aggregated and compared")
-        return comparison
+            for key, values in grid.items():
+                tested[key] = sorted(set(tested[key]).union(values))
+
+            candidate = comparison.get('best_overall')
+            if candidate and candidate['risk_adjusted_score'] > self.best_result['risk_adjusted_score']:
+                self._display_best_result(comparison)
+            else:
+                logger.info("No improvement over current best parameters")
 
     def _display_best_result(self, comparison: dict):
         """Display best overall result."""
@@ -164,22 +192,23 @@ class WorkflowOrchestrator:
 
         self.best_result = best
 
-        logger.info("")
-        logger.info("=" * 100)
-        logger.info("🏆 BEST OVERALL STRATEGY (Risk-Adjusted)")
-        logger.info("=" * 100)
-        logger.info(f"Strategy:          {best['strategy'].upper()}")
-        logger.info(f"Phase:             {best['phase']}")
-        logger.info(f"Profit:            ${best['profit']:.2f}")
-        logger.info(f"Win Rate:          {best['win_rate']:.1f}%")
-        logger.info(f"Max Drawdown:      {best['max_drawdown_pct']:.2f}%")
-        logger.info(f"Risk-Adj Score:    {best['risk_adjusted_score']:.2f}")
-        logger.info(f"Total Trades:      {best['total_trades']}")
-        logger.info("─" * 100)
-        logger.info("Best Parameters:")
-        for param, value in best['parameters'].items():
-            logger.info(f"  {param}: {value}")
-        logger.info("=" * 100)
+        log_block(logger, [
+            "",
+            "=" * 100,
+            "🏆 BEST OVERALL STRATEGY (Risk-Adjusted)",
+            "=" * 100,
+            f"Strategy:          {best['strategy'].upper()}",
+            f"Phase:             {best['phase']}",
+            f"Profit:            ${best['profit']:.2f}",
+            f"Win Rate:          {best['win_rate']:.1f}%",
+            f"Max Drawdown:      {best['max_drawdown_pct']:.2f}%",
+            f"Risk-Adj Score:    {best['risk_adjusted_score']:.2f}",
+            f"Total Trades:      {best['total_trades']}",
+            "─" * 100,
+            "Best Parameters:",
+            *(f"  {param}: {value}" for param, value in best['parameters'].items()),
+            "=" * 100,
+        ])
 
     def _apply_best_parameters(self):
         """Apply best parameters to config."""
@@ -201,33 +230,13 @@ class WorkflowOrchestrator:
             return
 
         # Apply parameters using config manager
-        cmd = [
-            'python', 'bot/config_manager.py',
-            '--apply', str(params_file)
-        ]
-
-        if self.apply_type != 'best':
-            cmd.extend(['--param-type', self.apply_type])
+        manager = ConfigManager()
 
-        logger.info(f"Running: {' '.join(cmd)}")
-
-        result = subprocess.run(cmd)
-
-        if result.returncode != 0:
+        if not manager.apply_from_file(str(params_file), param_type=self.apply_type):
             logger.error("Failed to apply parameters")
             return
 
-        # Set active strategy
-        cmd = [
-            'python', 'bot/config_manager.py',
-            '--set-strategy', self.best_result['strategy']
-        ]
-
-        logger.info(f"Running: {' '.join(cmd)}")
-
-        result = subprocess.run(cmd)
-
-        if result.returncode != 0:
+        if not manager.set_active_strategy(self.best_result['strategy']):
             logger.error("Failed to set active strategy")
             return
 
@@ -235,40 +244,47 @@ class WorkflowOrchestrator:
 
     def _print_final_summary(self):
         """Print final summary and next steps."""
-        logger.info("")
-        logger.info("=" * 100)
-        logger.info("✅ AUTOMATED OPTIMIZATION WORKFLOW COMPLETED")
-        logger.info("=" * 100)
-        logger.info(f"Batch Results:     {self.batch_dir}")
+        lines = [
+            "",
+            "=" * 100,
+            "✅ AUTOMATED OPTIMIZATION WORKFLOW COMPLETED",
+            "=" * 100,
+            f"Batch Results:     {self.batch_dir}",
+        ]
         if self.best_result:
-            logger.info(f"Best Strategy:     {self.best_result['strategy'].upper()} (Phase {self.best_result['phase']})")
-            logger.info(f"Expected Profit:   ${self.best_result['profit']:.2f}")
-            logger.info(f"Win Rate:          {self.best_result['win_rate']:.1f}%")
+            lines += [
+                f"Best Strategy:     {self.best_result['strategy'].upper()} (Phase {self.best_result['phase']})",
+                f"Expected Profit:   ${self.best_result['profit']:.2f}",
+                f"Win Rate:          {self.best_result['win_rate']:.1f}%",
+            ]
 
-        logger.info("─" * 100)
-        logger.info("NEXT STEPS:")
-        logger.info("─" * 100)
+        lines += ["─" * 100, "NEXT STEPS:", "─" * 100]
 
         if self.auto_apply:
-            logger.info("✓ Config has been updated with best parameters")
-            logger.info("")
-            logger.info("1. Review config:  bot/config.py")
-            logger.info("2. Run backtest:   python bot/backtest_runner.py --symbols EURUSD --phase 1 --days 90")
-            logger.info("3. Start bot:      python bot/main.py")
+            lines += [
+                "✓ Config has been updated with best parameters",
+                "",
+                "1. Review config:  bot/config.py",
+                "2. Run backtest:   python bot/backtest_runner.py --symbols EURUSD --phase 1 --days 90",
+                "3. Start bot:      python bot/main.py",
+            ]
         else:
-            logger.info("1. Review results: python bot/aggregate_results.py --batch " + str(self.batch_dir))
-            logger.info("2. Apply params:   python bot/config_manager.py --apply <params_file>")
-            logger.info("3. Run backtest:   python bot/backtest_runner.py --symbols EURUSD --phase 1 --days 90")
-            logger.info("4. Start bot:      python bot/main.py")
-
-        logger.info("")
-        logger.info("MANUAL COMMANDS (if needed):")
-        logger.info("─" * 100)
+            lines += [
+                "1. Review results: python bot/aggregate_results.py --batch " + str(self.batch_dir),
+                "2. Apply params:   python bot/config_manager.py --apply <params_file>",
+                "3. Run backtest:   python bot/backtest_runner.py --symbols EURUSD --phase 1 --days 90",
+                "4. Start bot:      python bot/main.py",
+            ]
+
+        lines += ["", "MANUAL COMMANDS (if needed):", "─" * 100]
         if self.best_result:
-            logger.info(f"Apply best params: python bot/config_manager.py --apply {self.best_result['run_dir']}/best_params.json")
-            logger.info(f"Set strategy:      python bot/config_manager.py --set-strategy {self.best_result['strategy']}")
+            lines += [
+                f"Apply best params: python bot/config_manager.py --apply {self.best_result['run_dir']}/best_params.json",
+                f"Set strategy:      python bot/config_manager.py --set-strategy {self.best_result['strategy']}",
+            ]
 
-        logger.info("=" * 100)
+        lines.append("=" * 100)
+        log_block(logger, lines)
 
 
 def main():
@@ -329,6 +345,18 @@ Examples:
         default=50,
         help='Maximum parameter combinations per strategy (default: 50)'
     )
+    parser.add_argument(
+        '--sampler',
+        choices=['lhs', 'sobol', 'random', 'grid'],
+        default='lhs',
+        help='How to pick combinations from large parameter grids (default: lhs)'
+    )
+    parser.add_argument(
+        '--refine-iters',
+        type=int,
+        default=0,
+        help='Extra grid searches on progressively finer grids around the best result (default: 0)'
+    )
     parser.add_argument(
         '--auto-apply',
         action='store_true',
@@ -344,15 +372,14 @@ Examples:
     args = parser.parse_args()
 
     # Parse strategies
-    all_strategies = ['elastic_band', 'fvg', 'macd_rsi', 'elastic_bb']
     if args.strategies.lower() == 'all':
-        strategies = all_strategies
+        strategies = list(ALL_STRATEGIES)
     else:
         strategies = [s.strip() for s in args.strategies.split(',')]
-        invalid = [s for s in strategies if s not in all_strategies]
+        invalid = [s for s in strategies if s not in VALID_STRATEGIES]
         if invalid:
             logger.error(f"Invalid strategies: {invalid}")
-            logger.error(f"Valid strategies: {all_strategies}")
+            logger.error(f"Valid strategies: {ALL_STRATEGIES}")
             sys.exit(1)
 
     # Parse symbols
@@ -360,7 +387,7 @@ Examples:
 
     # Parse phases
     phases = [int(p.strip()) for p in args.phases.split(',')]
-    if any(p not in [1, 2, 3] for p in phases):
+    if not VALID_PHASES.issuperset(phases):
         logger.error("Phases must be 1, 2, or 3")
         sys.exit(1)
 
@@ -372,7 +399,9 @@ Examples:
         days=args.days,
         max_combinations=args.max_combinations,
         auto_apply=args.auto_apply,
-        apply_type=args.apply_type
+        apply_type=args.apply_type,
+        sampler=args.sampler,
+        refine_iters=args.refine_iters
     )
 
     orchestrator.run()
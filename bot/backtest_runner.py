@@ -5,27 +5,117 @@ Run backtests on multiple symbols and phases, generate reports.
 """
 
 import argparse
+from collections import Counter
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
 try:
     import MetaTrader5 as mt5
     MT5_AVAILABLE = True
 except ImportError:
     MT5_AVAILABLE = False
     mt5 = None
-import json
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils import setup_logger
-from bot.config import TradingPhase, STRATEGY_CONFIG
-from bot.backtester import Backtester, BacktestResult
+from utils import setup_logger, write_json_array
+from bot.config import TradingPhase, STRATEGY_CONFIG, PHASE_CONFIGS
+from bot.backtester import Backtester, BacktestResult, _ensure_mt5
 
 
 logger = setup_logger("BT_RUNNER")
 
+# (symbol, phase, start_date, end_date, initial_balance)
+BacktestTask = Tuple[str, TradingPhase, datetime, datetime, float]
+
+# Summary report table layout
+SUMMARY_HEADER = f"{'Symbol':<10} {'Phase':<15} {'Trades':<8} {'Win%':<8} {'Net P/L':<12} {'PF':<6} {'MaxDD%':<8}"
+SUMMARY_ROW_FMT = "{:<10} {:<15} {:<8} {:<8.1f} ${:<11.2f} {:<6.2f} {:<8.1f}".format
+SUMMARY_TOTAL_FMT = "{:<10} {:<15} {:<8} {:<8} ${:<11.2f}".format
+EXIT_COUNTS_FMT = "  TP: {} | SL: {} | TIME: {}".format
+
+# Numeric summary columns, in SUMMARY_ROW_FMT order after symbol/phase
+SUMMARY_FIELDS = ('total_trades', 'win_rate', 'net_profit', 'profit_factor', 'max_drawdown_pct')
+_summary_values = attrgetter(*SUMMARY_FIELDS)
+
+# BacktestResult.phase holds the config name, so look configs up by name
+_PHASE_BY_NAME = {config.name: config for config in PHASE_CONFIGS.values()}
+
+# A phase result this far past its drawdown limit, or below this win rate,
+# rules out the remaining phases (signals do not depend on the phase, only
+# position size does)
+PRUNE_DD_FACTOR = 2.0
+PRUNE_MIN_WIN_RATE = 20.0
+
+
+def _run_in_worker(*task) -> BacktestResult:
+    """Pool entry point: run_single_backtest after a lazy MT5 connect."""
+    _ensure_mt5()
+    return run_single_backtest(*task)
+
+
+def _resolve_n_jobs(n_jobs: int, n_tasks: int) -> int:
+    """Worker count for n_jobs (-1 = all cores), capped at the task count."""
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    return max(1, min(n_jobs, n_tasks))
+
+
+def create_backtest_pool(n_jobs: int = -1) -> ProcessPoolExecutor:
+    """
+    Create a worker pool that can be shared by several run_backtests calls.
+
+    Workers connect to MT5 on their first task and keep the connection, so
+    the startup cost is paid once per worker rather than once per batch.
+
+    Args:
+        n_jobs: Worker processes (-1 = all cores).
+
+    Returns:
+        ProcessPoolExecutor; the caller owns it and should use it as a context manager.
+    """
+    return ProcessPoolExecutor(max_workers=n_jobs if n_jobs > 0 else os.cpu_count() or 1)
+
+
+def run_backtests(
+    tasks: List[BacktestTask],
+    n_jobs: int = 1,
+    executor: Optional[ProcessPoolExecutor] = None
+) -> List[BacktestResult]:
+    """
+    Run independent backtests, in parallel worker processes when n_jobs != 1.
+
+    Args:
+        tasks: (symbol, phase, start_date, end_date, initial_balance) tuples.
+        n_jobs: Worker processes (-1 = all cores, 1 = run in this process).
+            Ignored when executor is given.
+        executor: Existing pool from create_backtest_pool() to run on.
+
+    Returns:
+        Results in task order.
+    """
+    for symbol, phase, *_ in tasks:
+        logger.info(f"Running backtest for {symbol} - {phase.value}...")
+
+    if not tasks:
+        return []
+
+    # map() keeps task order
+    if executor is not None:
+        return list(executor.map(_run_in_worker, *zip(*tasks)))
+
+    n_workers = _resolve_n_jobs(n_jobs, len(tasks))
+    if n_workers == 1:
+        return [run_single_backtest(*task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(_run_in_worker, *zip(*tasks)))
+
 
 def run_single_backtest(
     symbol: str,
@@ -44,124 +134,157 @@ def run_multi_symbol_backtest(
     phase: TradingPhase,
     start_date: datetime,
     end_date: datetime,
-    initial_balance: float
+    initial_balance: float,
+    n_jobs: int = 1,
+    executor: Optional[ProcessPoolExecutor] = None
 ) -> List[BacktestResult]:
     """Run backtests on multiple symbols."""
-    results = []
+    tasks = [(symbol, phase, start_date, end_date, initial_balance) for symbol in symbols]
+    return run_backtests(tasks, n_jobs, executor)
 
-    for symbol in symbols:
-        logger.info(f"Running backtest for {symbol}...")
-        result = run_single_backtest(symbol, phase, start_date, end_date, initial_balance)
-        results.append(result)
 
-    return results
+def is_clearly_unviable(result: BacktestResult) -> bool:
+    """Default run_phase_comparison prune check: far past the DD limit or a very low win rate."""
+    config = _PHASE_BY_NAME.get(result.phase)
+    if config is None:
+        return False
+    return (result.max_drawdown_pct > PRUNE_DD_FACTOR * config.daily_loss_buffer or
+            result.win_rate < PRUNE_MIN_WIN_RATE)
 
 
 def run_phase_comparison(
     symbol: str,
     start_date: datetime,
     end_date: datetime,
-    initial_balance: float
+    initial_balance: float,
+    n_jobs: int = 1,
+    executor: Optional[ProcessPoolExecutor] = None,
+    prune_fn: Optional[Callable[[BacktestResult], bool]] = is_clearly_unviable
 ) -> List[BacktestResult]:
-    """Run backtests for all phases on a symbol."""
+    """
+    Run backtests for all phases on a symbol.
+
+    Phases run in order and stop at the first result prune_fn rejects. When
+    running in parallel only Phase 1 is checked; the remaining phases then
+    run together.
+
+    Args:
+        prune_fn: Returns True when a result makes the remaining phases
+            pointless (None = always run every phase).
+
+    Returns:
+        Results in phase order, up to and including a pruned phase.
+    """
+    tasks = [(symbol, phase, start_date, end_date, initial_balance) for phase in TradingPhase]
+    if prune_fn is None:
+        return run_backtests(tasks, n_jobs, executor)
+
+    parallel = executor is not None or _resolve_n_jobs(n_jobs, len(tasks)) > 1
     results = []
+    for i, task in enumerate(tasks):
+        if parallel and i > 0:
+            results.extend(run_backtests(tasks[i:], n_jobs, executor))
+            break
 
-    for phase in TradingPhase:
-        logger.info(f"Running backtest for {symbol} - {phase.value}...")
-        result = run_single_backtest(symbol, phase, start_date, end_date, initial_balance)
+        result = run_backtests([task], n_jobs, executor)[0]
         results.append(result)
-
+        if prune_fn(result):
+            logger.info(f"Pruning {symbol}: {result.phase} is unviable, skipping remaining phases")
+            break
     return results
 
 
+def _result_to_dict(r: BacktestResult) -> dict:
+    """
+    JSON report entry for one backtest result, including its trades.
+
+    Datetimes are left as-is; write_json_array serializes them in ISO
+    format (natively in C with orjson).
+    """
+    return {
+        'symbol': r.symbol,
+        'phase': r.phase,
+        'start_date': r.start_date,
+        'end_date': r.end_date,
+        'initial_balance': r.initial_balance,
+        'final_balance': r.final_balance,
+        'net_profit': r.net_profit,
+        'total_trades': r.total_trades,
+        'winning_trades': r.winning_trades,
+        'losing_trades': r.losing_trades,
+        'win_rate': r.win_rate,
+        'profit_factor': r.profit_factor,
+        'max_drawdown': r.max_drawdown,
+        'max_drawdown_pct': r.max_drawdown_pct,
+        'max_consecutive_losses': r.max_consecutive_losses,
+        'average_win': r.average_win,
+        'average_loss': r.average_loss,
+        'expectancy': r.expectancy,
+        'trades': [
+            {
+                'entry_time': t.entry_time,
+                'exit_time': t.exit_time,
+                'direction': t.direction,
+                'entry_price': t.entry_price,
+                'exit_price': t.exit_price,
+                'profit': t.profit,
+                'profit_pips': t.profit_pips,
+                'exit_reason': t.exit_reason
+            }
+            for t in r.trades
+        ]
+    }
+
+
 def generate_report(results: List[BacktestResult], output_file: str = None):
     """Generate a summary report of backtest results."""
     if not results:
         logger.warning("No results to report")
         return
 
-    # Console report
-    print("\n" + "=" * 80)
-    print("BACKTEST SUMMARY REPORT")
-    print("=" * 80)
-
-    # Header
-    print(f"{'Symbol':<10} {'Phase':<15} {'Trades':<8} {'Win%':<8} {'Net P/L':<12} {'PF':<6} {'MaxDD%':<8}")
-    print("-" * 80)
-
-    # Results
-    total_net = 0
-    total_trades = 0
-
-    for r in results:
-        net_pct = r.net_profit / r.initial_balance * 100 if r.initial_balance > 0 else 0
-        print(
-            f"{r.symbol:<10} {r.phase:<15} {r.total_trades:<8} "
-            f"{r.win_rate:<8.1f} ${r.net_profit:<11.2f} "
-            f"{r.profit_factor:<6.2f} {r.max_drawdown_pct:<8.1f}"
+    # One SUMMARY_FIELDS row per result; totals are column reductions
+    table = np.array([_summary_values(r) for r in results], dtype=float)
+    trades_col = SUMMARY_FIELDS.index('total_trades')
+    net_col = SUMMARY_FIELDS.index('net_profit')
+
+    # Console report, built up and written in one go
+    lines = ["", "=" * 80, "BACKTEST SUMMARY REPORT", "=" * 80, SUMMARY_HEADER, "-" * 80]
+    lines.extend(
+        SUMMARY_ROW_FMT(r.symbol, r.phase, r.total_trades, *row[1:])
+        for r, row in zip(results, table.tolist())
+    )
+    lines.append("-" * 80)
+
+    # Per-phase subtotals when the report covers several phases
+    phase_index = {phase: i for i, phase in enumerate(dict.fromkeys(r.phase for r in results))}
+    if len(phase_index) > 1:
+        groups = np.fromiter((phase_index[r.phase] for r in results), int, len(results))
+        phase_trades = np.bincount(groups, weights=table[:, trades_col])
+        phase_net = np.bincount(groups, weights=table[:, net_col])
+        lines.extend(
+            SUMMARY_TOTAL_FMT('TOTAL', phase, int(phase_trades[i]), '', phase_net[i])
+            for phase, i in phase_index.items()
         )
-        total_net += r.net_profit
-        total_trades += r.total_trades
 
-    print("-" * 80)
-    print(f"{'TOTAL':<10} {'':<15} {total_trades:<8} {'':<8} ${total_net:<11.2f}")
-    print("=" * 80)
+    total_trades, total_net = table[:, [trades_col, net_col]].sum(axis=0).tolist()
+    lines += [SUMMARY_TOTAL_FMT('TOTAL', '', int(total_trades), '', total_net), "=" * 80]
 
     # Detailed trade breakdown by exit reason
-    print("\nEXIT REASON BREAKDOWN:")
-    print("-" * 40)
+    lines += ["", "EXIT REASON BREAKDOWN:", "-" * 40]
 
     for r in results:
         if r.total_trades == 0:
             continue
 
-        tp_exits = sum(1 for t in r.trades if t.exit_reason == 'TP')
-        sl_exits = sum(1 for t in r.trades if t.exit_reason == 'SL')
-        time_exits = sum(1 for t in r.trades if t.exit_reason == 'TIME')
+        exit_counts = Counter(t.exit_reason for t in r.trades)
+        lines.append(f"{r.symbol} ({r.phase}):")
+        lines.append(EXIT_COUNTS_FMT(exit_counts['TP'], exit_counts['SL'], exit_counts['TIME']))
 
-        print(f"{r.symbol} ({r.phase}):")
-        print(f"  TP: {tp_exits} | SL: {sl_exits} | TIME: {time_exits}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    # Save to JSON if output file specified
+    # Save to JSON if output file specified, one result at a time
     if output_file:
-        report_data = []
-        for r in results:
-            report_data.append({
-                'symbol': r.symbol,
-                'phase': r.phase,
-                'start_date': r.start_date.isoformat(),
-                'end_date': r.end_date.isoformat(),
-                'initial_balance': r.initial_balance,
-                'final_balance': r.final_balance,
-                'net_profit': r.net_profit,
-                'total_trades': r.total_trades,
-                'winning_trades': r.winning_trades,
-                'losing_trades': r.losing_trades,
-                'win_rate': r.win_rate,
-                'profit_factor': r.profit_factor,
-                'max_drawdown': r.max_drawdown,
-                'max_drawdown_pct': r.max_drawdown_pct,
-                'max_consecutive_losses': r.max_consecutive_losses,
-                'average_win': r.average_win,
-                'average_loss': r.average_loss,
-                'expectancy': r.expectancy,
-                'trades': [
-                    {
-                        'entry_time': t.entry_time.isoformat(),
-                        'exit_time': t.exit_time.isoformat(),
-                        'direction': t.direction,
-                        'entry_price': t.entry_price,
-                        'exit_price': t.exit_price,
-                        'profit': t.profit,
-                        'profit_pips': t.profit_pips,
-                        'exit_reason': t.exit_reason
-                    }
-                    for t in r.trades
-                ]
-            })
-
-        with open(output_file, 'w') as f:
-            json.dump(report_data, f, indent=2)
+        write_json_array(output_file, (_result_to_dict(r) for r in results))
 
         logger.info(f"Report saved to {output_file}")
 
@@ -175,37 +298,34 @@ def check_phase_viability(results: List[BacktestResult]) -> dict:
     - Max drawdown must stay under daily limit
     - Win rate should be reasonable (>40%)
     """
-    from bot.config import PHASE_CONFIGS
+    results = [r for r in results if r.phase in _PHASE_BY_NAME]
+    configs = [_PHASE_BY_NAME[r.phase] for r in results]
+
+    # Evaluate every criterion for all results at once
+    n = len(results)
+    profit_pct = np.fromiter((r.net_profit / r.initial_balance * 100 for r in results), float, n)
+    max_dd_pct = np.fromiter((r.max_drawdown_pct for r in results), float, n)
+    win_rate = np.fromiter((r.win_rate for r in results), float, n)
+    target = np.fromiter((c.profit_target for c in configs), float, n)
+    dd_limit = np.fromiter((c.daily_loss_buffer for c in configs), float, n)
+
+    target_met = (target <= 0) | (profit_pct >= target)
+    dd_ok = max_dd_pct < dd_limit
+    win_rate_ok = win_rate >= 40
+    viable = target_met & dd_ok & win_rate_ok
 
     analysis = {}
-
-    for r in results:
-        phase_config = None
-        for phase, config in PHASE_CONFIGS.items():
-            if config.name == r.phase:
-                phase_config = config
-                break
-
-        if phase_config is None:
-            continue
-
-        key = f"{r.symbol}_{r.phase}"
-
-        profit_pct = r.net_profit / r.initial_balance * 100
-        target_met = profit_pct >= phase_config.profit_target if phase_config.profit_target > 0 else True
-        dd_ok = r.max_drawdown_pct < phase_config.daily_loss_buffer
-        win_rate_ok = r.win_rate >= 40
-
-        analysis[key] = {
-            'viable': target_met and dd_ok and win_rate_ok,
-            'profit_pct': profit_pct,
-            'target': phase_config.profit_target,
-            'target_met': target_met,
+    for i, (r, config) in enumerate(zip(results, configs)):
+        analysis[f"{r.symbol}_{r.phase}"] = {
+            'viable': bool(viable[i]),
+            'profit_pct': float(profit_pct[i]),
+            'target': config.profit_target,
+            'target_met': bool(target_met[i]),
             'max_dd_pct': r.max_drawdown_pct,
-            'dd_limit': phase_config.daily_loss_buffer,
-            'dd_ok': dd_ok,
+            'dd_limit': config.daily_loss_buffer,
+            'dd_ok': bool(dd_ok[i]),
             'win_rate': r.win_rate,
-            'win_rate_ok': win_rate_ok
+            'win_rate_ok': bool(win_rate_ok[i])
         }
 
     # Print analysis
@@ -236,6 +356,8 @@ def main():
                        help="Initial balance")
     parser.add_argument("--output", type=str, default=None,
                        help="Output JSON file for report")
+    parser.add_argument("--n-jobs", type=int, default=-1,
+                       help="Parallel backtest processes (-1 = all cores, 1 = sequential)")
 
     args = parser.parse_args()
 
@@ -257,18 +379,13 @@ def main():
             phase_map = {'1': TradingPhase.PHASE_1, '2': TradingPhase.PHASE_2, '3': TradingPhase.PHASE_3}
             phases = [phase_map[args.phase]]
 
-        # Run backtests
-        all_results = []
-
-        for phase in phases:
-            results = run_multi_symbol_backtest(
-                symbols=symbols,
-                phase=phase,
-                start_date=start_date,
-                end_date=end_date,
-                initial_balance=args.balance
-            )
-            all_results.extend(results)
+        # Run backtests: phases x symbols as one batch so the pool is created once
+        tasks = [
+            (symbol, phase, start_date, end_date, args.balance)
+            for phase in phases
+            for symbol in symbols
+        ]
+        all_results = run_backtests(tasks, args.n_jobs)
 
         # Generate report
         generate_report(all_results, args.output)
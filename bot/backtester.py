@@ -5,7 +5,12 @@ Tests the Elastic Band strategy on historical data to validate performance
 before live trading.
 """
 
+import functools
+import importlib.util
+import types
+
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
@@ -15,15 +20,592 @@ try:
 except ImportError:
     MT5_AVAILABLE = False
     mt5 = None
+try:
+    from scipy.signal import lfilter, lfiltic
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    lfilter = lfiltic = None
+
+# numba is only imported when a backtest is long enough to use it
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils import setup_logger
+from utils import setup_logger, fetch_rates
 from bot.config import STRATEGY_CONFIG, PHASE_CONFIGS, TradingPhase
 
 
+# Below this many bars the plain Python loop beats JIT dispatch overhead
+NUMBA_MIN_BARS = 2000
+
+# Indicator sets memoized per process for shared (read-only) rate arrays, so
+# parameter sweeps only recompute them when an indicator period changes
+INDICATOR_CACHE_SIZE = 128
+
+SIGNAL_ELASTIC_BAND = 0
+SIGNAL_FVG = 1
+
+DIRECTION_BUY = 1
+DIRECTION_SELL = -1
+DIRECTIONS = {DIRECTION_BUY: 'BUY', DIRECTION_SELL: 'SELL'}
+
+EXIT_SL = 0
+EXIT_TP = 1
+EXIT_TIME = 2
+EXIT_REASONS = ('SL', 'TP', 'TIME')
+
+# One row per closed trade, filled by _simulate_bars
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', 'i8'),
+    ('exit_idx', 'i8'),
+    ('direction', 'i1'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('sl', 'f8'),
+    ('tp', 'f8'),
+    ('volume', 'f8'),
+    ('profit', 'f8'),
+    ('profit_pips', 'f8'),
+    ('exit_reason', 'i1'),
+    ('balance', 'f8'),
+])
+
+
+def _entry_signals(
+    close, high, low, ema_trend, ema_reversion, rsi, signal_mode, pip_size,
+    pip_tolerance, rsi_oversold, rsi_overbought, min_gap_pips
+):
+    """
+    Entry signal for every bar: DIRECTION_BUY, DIRECTION_SELL or 0.
+
+    Whole-array NumPy expressions, so _simulate_bars only visits the bars
+    that can open a position. FVG compares each bar with the one two bars
+    back and Elastic Band uses the previous RSI, so the first bars never
+    signal. Compiled with Numba inside the grid kernel.
+    """
+    signals = np.zeros(close.shape[0], dtype=np.int8)
+    if signal_mode == SIGNAL_FVG:
+        offset = 2
+        gap_low = low[2:]
+        gap_high = high[2:]
+        # Bullish gap: current low above the high from 2 bars ago
+        buy = (gap_low > high[:-2]) & ((gap_low - high[:-2]) / pip_size >= min_gap_pips)
+        # Bearish gap: current high below the low from 2 bars ago
+        sell = (gap_high < low[:-2]) & ((low[:-2] - gap_high) / pip_size >= min_gap_pips)
+    else:
+        offset = 1
+        buy = ((close[1:] > ema_trend[1:]) &
+               (low[1:] <= (ema_reversion[1:] + pip_tolerance)) &
+               (rsi[:-1] < rsi_oversold) &
+               (rsi[1:] >= rsi_oversold))
+        sell = ((close[1:] < ema_trend[1:]) &
+                (high[1:] >= (ema_reversion[1:] - pip_tolerance)) &
+                (rsi[:-1] > rsi_overbought) &
+                (rsi[1:] <= rsi_overbought))
+
+    # BUY takes precedence where both fire
+    shifted = signals[offset:]
+    shifted[sell] = DIRECTION_SELL
+    shifted[buy] = DIRECTION_BUY
+    return signals
+
+
+def _simulate_bars(
+    close, high, low, atr, signals, start_idx, pip_size, sl_multiplier, rr_ratio,
+    risk_pct, pip_value, volume_step, volume_min, volume_max, max_duration,
+    timeframe_minutes, balance
+):
+    """
+    Bar-by-bar position simulation for Backtester.run.
+
+    Positions open on the entry signals from _entry_signals; while flat,
+    the loop jumps straight to the next signalling bar.
+
+    Plain Python; compiled with Numba by _simulate_kernel().
+
+    Returns:
+        (trades, final_balance) where trades is a TRADE_DTYPE array of the
+        closed trades in exit order.
+    """
+    n_bars = close.shape[0]
+    trades = np.empty(max(n_bars - start_idx, 0), dtype=TRADE_DTYPE)
+    n_trades = 0
+    candidates = np.flatnonzero(signals[start_idx:]) + start_idx
+
+    in_position = False
+    position_entry_idx = 0
+    position_direction = 0
+    position_entry_price = 0.0
+    position_sl = 0.0
+    position_tp = 0.0
+    position_volume = 0.0
+
+    i = start_idx
+    while i < n_bars:
+        # Check exit conditions if in position
+        if in_position:
+            # Direction codes are +1/-1, so scaling price differences by the
+            # direction turns the BUY/SELL comparisons into one test each:
+            # SL on the adverse extreme, TP on the favourable one (SL first)
+            is_buy = position_direction == DIRECTION_BUY
+            adverse = low[i] if is_buy else high[i]
+            favourable = high[i] if is_buy else low[i]
+            hit_sl = position_direction * (adverse - position_sl) <= 0
+            hit_tp = position_direction * (favourable - position_tp) >= 0
+
+            exit_reason = EXIT_SL if hit_sl else (EXIT_TP if hit_tp else -1)
+            exit_price = position_sl if hit_sl else position_tp
+
+            # Time exit, only if profitable
+            if (i - position_entry_idx) * timeframe_minutes >= max_duration and exit_reason == -1:
+                exit_price = close[i]
+                if position_direction * (exit_price - position_entry_price) > 0:
+                    exit_reason = EXIT_TIME
+
+            if exit_reason != -1:
+                profit_pips = position_direction * (exit_price - position_entry_price) / pip_size
+                profit = profit_pips * pip_value * position_volume
+                balance += profit
+
+                trade = trades[n_trades]
+                trade['entry_idx'] = position_entry_idx
+                trade['exit_idx'] = i
+                trade['direction'] = position_direction
+                trade['entry_price'] = position_entry_price
+                trade['exit_price'] = exit_price
+                trade['sl'] = position_sl
+                trade['tp'] = position_tp
+                trade['volume'] = position_volume
+                trade['profit'] = profit
+                trade['profit_pips'] = profit_pips
+                trade['exit_reason'] = exit_reason
+                trade['balance'] = balance
+                n_trades += 1
+
+                in_position = False
+
+        # Check entry signals if not in position
+        if not in_position:
+            signal = signals[i]
+            if signal != 0:
+                sl_pips = atr[i] / pip_size * sl_multiplier
+                sl_distance = sl_pips * pip_size
+                tp_distance = sl_distance * rr_ratio
+                risk_amount = balance * (risk_pct / 100)
+
+                if sl_pips > 0 and pip_value > 0:
+                    volume = risk_amount / (sl_pips * pip_value)
+                    volume = round(volume / volume_step) * volume_step
+                    volume = max(volume_min, min(volume, volume_max))
+
+                    # Simplified: use close as entry
+                    position_entry_price = close[i]
+                    if signal == DIRECTION_BUY:
+                        position_sl = position_entry_price - sl_distance
+                        position_tp = position_entry_price + tp_distance
+                    else:
+                        position_sl = position_entry_price + sl_distance
+                        position_tp = position_entry_price - tp_distance
+
+                    in_position = True
+                    position_entry_idx = i
+                    position_direction = signal
+                    position_volume = volume
+
+            if not in_position:
+                # Flat bars without a signal change nothing; skip them
+                k = np.searchsorted(candidates, i + 1)
+                i = candidates[k] if k < candidates.shape[0] else n_bars
+                continue
+
+        i += 1
+
+    return trades[:n_trades], balance
+
+
+def _ema_from_sma_seed(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA seeded with the SMA of the first `period` values (zeros before it).
+
+    The recurrence is a first-order IIR filter, so with scipy it runs as a
+    single lfilter pass; otherwise as a Python loop.
+    """
+    out = np.zeros(len(values))
+    multiplier = 2 / (period + 1)
+    out[period - 1] = np.mean(values[:period])
+
+    if SCIPY_AVAILABLE:
+        b, a = [multiplier], [1.0, multiplier - 1.0]
+        out[period:], _ = lfilter(b, a, values[period:], zi=lfiltic(b, a, [out[period - 1]]))
+        return out
+
+    for i in range(period, len(values)):
+        out[i] = (values[i] * multiplier) + (out[i - 1] * (1 - multiplier))
+
+    return out
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range per bar; the first bar has no previous close."""
+    tr = high - low
+    prev_close = close[:-1]
+    tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev_close),
+                                           np.abs(low[1:] - prev_close)))
+    return tr
+
+
+def _wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's running mean: the SMA of the first `period` values, then one
+    smoothed update per following value (len(values) - period + 1 outputs).
+
+    With scipy this is a single lfilter pass (alpha = 1/period), which
+    agrees with the Python recurrence to rounding error.
+    """
+    out = np.empty(len(values) - period + 1)
+    out[0] = np.mean(values[:period])
+
+    if SCIPY_AVAILABLE:
+        b, a = [1 / period], [1.0, 1 / period - 1.0]
+        out[1:], _ = lfilter(b, a, values[period:], zi=lfiltic(b, a, [out[0]]))
+        return out
+
+    for k in range(1, len(out)):
+        out[k] = (out[k - 1] * (period - 1) + values[period + k - 1]) / period
+
+    return out
+
+
+def _indicators_loop(
+    close, high, low, ema_trend_period, ema_reversion_period, rsi_period, atr_period,
+    ema_trend_seed, ema_reversion_seed, gain_seed, loss_seed, atr_seed,
+    ema_trend, ema_reversion, rsi, atr
+):
+    """
+    Fused single pass computing the same series as _calculate_ema (x2),
+    _calculate_rsi and _calculate_atr, writing into the output arrays.
+
+    The SMA seeds are computed by the caller with np.mean so results match
+    the separate methods exactly. Plain Python; compiled with Numba by
+    _indicators_kernel().
+    """
+    trend_multiplier = 2 / (ema_trend_period + 1)
+    reversion_multiplier = 2 / (ema_reversion_period + 1)
+    atr_multiplier = 2 / (atr_period + 1)
+
+    trend_value = 0.0
+    reversion_value = 0.0
+    atr_value = 0.0
+    avg_gain = gain_seed
+    avg_loss = loss_seed
+
+    for i in range(close.shape[0]):
+        if i == ema_trend_period - 1:
+            trend_value = ema_trend_seed
+        elif i >= ema_trend_period:
+            trend_value = (close[i] * trend_multiplier) + (trend_value * (1 - trend_multiplier))
+        ema_trend[i] = trend_value
+
+        if i == ema_reversion_period - 1:
+            reversion_value = ema_reversion_seed
+        elif i >= ema_reversion_period:
+            reversion_value = (close[i] * reversion_multiplier) + (reversion_value * (1 - reversion_multiplier))
+        ema_reversion[i] = reversion_value
+
+        true_range = high[i] - low[i]
+        if i > 0:
+            true_range = max(true_range, max(abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])))
+        if i == atr_period - 1:
+            atr_value = atr_seed
+        elif i >= atr_period:
+            atr_value = (true_range * atr_multiplier) + (atr_value * (1 - atr_multiplier))
+        atr[i] = atr_value
+
+        if i > rsi_period:
+            delta = close[i] - close[i - 1]
+            avg_gain = (avg_gain * (rsi_period - 1) + (delta if delta > 0 else 0.0)) / rsi_period
+            avg_loss = (avg_loss * (rsi_period - 1) + (-delta if delta < 0 else 0.0)) / rsi_period
+        if i < rsi_period:
+            rsi[i] = 0.0
+        elif avg_loss == 0:
+            rsi[i] = 100.0
+        else:
+            rsi[i] = 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _rsi_from_wilder(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI from Wilder-smoothed average gains/losses; zero before the first period."""
+    rsi = np.zeros(len(close))
+    deltas = np.diff(close)
+
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+
+    # rsi[period:] from the smoothed averages; no losses means RSI 100
+    avg_gain = _wilder_average(gains, period)
+    avg_loss = _wilder_average(losses, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi[period:] = np.where(avg_loss == 0, 100, 100 - (100 / (1 + avg_gain / avg_loss)))
+
+    return rsi
+
+
+def _compute_indicators(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    ema_trend_period: int,
+    ema_reversion_period: int,
+    rsi_period: int,
+    atr_period: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate the trend EMA, reversion EMA, RSI and ATR.
+
+    Long series use one fused JIT pass over the bars instead of a pass per
+    indicator.
+    """
+    if not (NUMBA_AVAILABLE and len(close) > NUMBA_MIN_BARS):
+        return (
+            _ema_from_sma_seed(close, ema_trend_period),
+            _ema_from_sma_seed(close, ema_reversion_period),
+            _rsi_from_wilder(close, rsi_period),
+            _ema_from_sma_seed(_true_range(high, low, close), atr_period)
+        )
+
+    # SMA seeds via np.mean, as the per-indicator functions compute them
+    deltas = np.diff(close[:rsi_period + 1])
+    head = slice(0, atr_period)
+    true_range = _true_range(high[head], low[head], close[head])
+
+    outputs = tuple(np.empty(len(close)) for _ in range(4))
+    _indicators_kernel()(
+        close, high, low,
+        ema_trend_period, ema_reversion_period, rsi_period, atr_period,
+        np.mean(close[:ema_trend_period]), np.mean(close[:ema_reversion_period]),
+        np.mean(np.where(deltas > 0, deltas, 0)), np.mean(np.where(deltas < 0, -deltas, 0)),
+        np.mean(true_range),
+        *outputs
+    )
+    return outputs
+
+
+def _rate_columns(rates: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Copy close/high/low/time out of an MT5 rates array into contiguous arrays.
+
+    Fields of the structured array are strided views interleaved with the
+    unused columns; the indicator passes and simulation loop read these
+    copies sequentially instead.
+    """
+    return (
+        np.ascontiguousarray(rates['close'], dtype=np.float64),
+        np.ascontiguousarray(rates['high'], dtype=np.float64),
+        np.ascontiguousarray(rates['low'], dtype=np.float64),
+        np.ascontiguousarray(rates['time'], dtype=np.int64)
+    )
+
+
+class _SharedRates:
+    """
+    Hashable handle on a read-only rates array, compared by identity.
+
+    fetch_rates hands every caller the same immutable array for a range,
+    so identity stands in for content without hashing the buffer; the
+    handle keeps the array alive, so its id cannot be reused while cached.
+    """
+
+    __slots__ = ('rates',)
+
+    def __init__(self, rates: np.ndarray):
+        self.rates = rates
+
+    def __hash__(self):
+        return id(self.rates)
+
+    def __eq__(self, other):
+        return isinstance(other, _SharedRates) and other.rates is self.rates
+
+
+@functools.lru_cache(maxsize=INDICATOR_CACHE_SIZE)
+def _shared_columns(shared: _SharedRates) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Memoized _rate_columns for a shared rates array; results are read-only."""
+    columns = _rate_columns(shared.rates)
+    for column in columns:
+        column.flags.writeable = False
+    return columns
+
+
+@functools.lru_cache(maxsize=INDICATOR_CACHE_SIZE)
+def _shared_indicators(
+    shared: _SharedRates,
+    ema_trend_period: int,
+    ema_reversion_period: int,
+    rsi_period: int,
+    atr_period: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Memoized _compute_indicators for a shared rates array; results are read-only."""
+    close, high, low, _ = _shared_columns(shared)
+    indicators = _compute_indicators(
+        close, high, low, ema_trend_period, ema_reversion_period, rsi_period, atr_period
+    )
+    for series in indicators:
+        series.flags.writeable = False
+    return indicators
+
+
+@functools.lru_cache(maxsize=1)
+def _indicators_kernel():
+    """Import numba and JIT-compile _indicators_loop on first use."""
+    from numba import njit
+    return njit(cache=True)(_indicators_loop)
+
+
+@functools.lru_cache(maxsize=1)
+def _simulate_kernel():
+    """Import numba and JIT-compile _simulate_bars on first use."""
+    from numba import njit
+    return njit(cache=True)(_simulate_bars)
+
+
+# Columns of the per-combination output of _simulate_grid
+(GRID_TOTAL_TRADES, GRID_WINNING_TRADES, GRID_GROSS_PROFIT, GRID_GROSS_LOSS,
+ GRID_MAX_DRAWDOWN, GRID_MAX_CONSECUTIVE_LOSSES, GRID_FINAL_BALANCE) = range(7)
+GRID_COLUMNS = 7
+
+# Columns of the per-combination settings passed to _simulate_grid
+(GRID_PIP_TOLERANCE, GRID_RSI_OVERSOLD, GRID_RSI_OVERBOUGHT, GRID_MIN_GAP_PIPS,
+ GRID_SL_MULTIPLIER, GRID_RR_RATIO, GRID_MAX_DURATION) = range(7)
+
+# Loop over parameter combinations; numba.prange in the compiled grid kernel
+_grid_range = range
+
+
+def _trade_totals(trades, initial_balance, out):
+    """
+    Sum a TRADE_DTYPE array into the GRID_* totals, in one pass.
+
+    Same definitions as Backtester._calculate_results: break-even trades
+    count as losses and drawdown is measured from the running balance
+    peak, starting at the initial balance.
+    """
+    winning = 0
+    gross_profit = 0.0
+    gross_loss = 0.0
+    peak = initial_balance
+    max_drawdown = 0.0
+    losing_run = 0
+    max_losing_run = 0
+
+    for k in range(trades.shape[0]):
+        profit = trades[k]['profit']
+        if profit > 0:
+            winning += 1
+            gross_profit += profit
+            losing_run = 0
+        else:
+            gross_loss -= profit
+            losing_run += 1
+            if losing_run > max_losing_run:
+                max_losing_run = losing_run
+
+        balance = trades[k]['balance']
+        if balance > peak:
+            peak = balance
+        if peak - balance > max_drawdown:
+            max_drawdown = peak - balance
+
+    out[GRID_TOTAL_TRADES] = trades.shape[0]
+    out[GRID_WINNING_TRADES] = winning
+    out[GRID_GROSS_PROFIT] = gross_profit
+    out[GRID_GROSS_LOSS] = gross_loss
+    out[GRID_MAX_DRAWDOWN] = max_drawdown
+    out[GRID_MAX_CONSECUTIVE_LOSSES] = max_losing_run
+
+
+def _simulate_grid(
+    close, high, low, ema_rows, rsi_rows, atr_rows, rows, start_idx, settings,
+    signal_mode, pip_size, risk_pct, pip_value, volume_step, volume_min, volume_max,
+    timeframe_minutes, balance, out
+):
+    """
+    Simulate every parameter combination over one price series.
+
+    Combination p reads its indicators from ema_rows[rows[p, 0]] (trend),
+    ema_rows[rows[p, 1]] (reversion), rsi_rows[rows[p, 2]] and
+    atr_rows[rows[p, 3]], its scalars from settings[p, GRID_*], and
+    writes its GRID_* totals to out[p].
+
+    Plain Python; compiled with Numba by _grid_kernel(), which runs the
+    combinations in parallel.
+    """
+    for p in _grid_range(rows.shape[0]):
+        signals = _entry_signals(
+            close, high, low, ema_rows[rows[p, 0]], ema_rows[rows[p, 1]], rsi_rows[rows[p, 2]],
+            signal_mode, pip_size, settings[p, GRID_PIP_TOLERANCE], settings[p, GRID_RSI_OVERSOLD],
+            settings[p, GRID_RSI_OVERBOUGHT], settings[p, GRID_MIN_GAP_PIPS]
+        )
+        trades, final_balance = _simulate_bars(
+            close, high, low, atr_rows[rows[p, 3]], signals, start_idx[p], pip_size,
+            settings[p, GRID_SL_MULTIPLIER], settings[p, GRID_RR_RATIO], risk_pct, pip_value,
+            volume_step, volume_min, volume_max, settings[p, GRID_MAX_DURATION],
+            timeframe_minutes, balance
+        )
+        _trade_totals(trades, balance, out[p])
+        out[p, GRID_FINAL_BALANCE] = final_balance
+
+
+@functools.lru_cache(maxsize=1)
+def _grid_kernel():
+    """
+    Import numba and compile _simulate_grid with parallel=True on first use.
+
+    The loop is rebuilt over a copy of the module globals in which
+    _entry_signals/_simulate_bars/_trade_totals are their compiled kernels
+    and _grid_range is numba.prange, leaving the plain Python loop intact.
+    """
+    from numba import njit, prange
+    namespace = dict(
+        globals(),
+        _entry_signals=njit(cache=True)(_entry_signals),
+        _simulate_bars=_simulate_kernel(),
+        _trade_totals=njit(cache=True)(_trade_totals),
+        _grid_range=prange
+    )
+    grid = types.FunctionType(_simulate_grid.__code__, namespace, _simulate_grid.__name__)
+    return njit(parallel=True, cache=True)(grid)
+
+
+# Set once this process has connected to MT5 as a pool worker
+_mt5_ready = False
+
+
+def _ensure_mt5():
+    """Connect this worker process to MT5 once (terminal handles are per-process)."""
+    global _mt5_ready
+    if _mt5_ready:
+        return
+    if not mt5.initialize():
+        raise RuntimeError(f"MT5 initialize failed in worker: {mt5.last_error()}")
+    _mt5_ready = True
+
+
+def _run_one(
+    symbol: str,
+    phase: TradingPhase,
+    strategy_class,
+    start_date: datetime,
+    end_date: datetime,
+    initial_balance: float
+) -> 'BacktestResult':
+    """Pool entry point for Backtester.run_batch: one symbol in a worker process."""
+    _ensure_mt5()
+    return Backtester(phase, strategy_class=strategy_class).run(symbol, start_date, end_date, initial_balance)
+
+
 @dataclass
 class BacktestTrade:
     """Represents a trade in backtesting."""
@@ -93,8 +675,18 @@ class BacktestResult:
     # Trade list
     trades: List[BacktestTrade] = field(default_factory=list)
 
-    # Equity curve
-    equity_curve: List[Tuple[datetime, float]] = field(default_factory=list)
+    # Equity curve: balance after each closed trade, from the first bar's
+    # initial balance, as epoch seconds and values
+    equity_times: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    equity_values: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def equity_curve(self) -> List[Tuple[datetime, float]]:
+        """Equity curve as (datetime, balance) pairs, built on access."""
+        return [
+            (datetime.fromtimestamp(t), value)
+            for t, value in zip(self.equity_times.tolist(), self.equity_values.tolist())
+        ]
 
 
 class Backtester:
@@ -143,16 +735,7 @@ class Backtester:
         Returns:
             BacktestResult with performance metrics.
         """
-        # Initialize strategy if provided
-        strategy_instance = None
-        strategy_name = "Elastic_Band"
-        if self.strategy_class:
-            try:
-                strategy_instance = self.strategy_class("BACKTEST")
-                strategy_name = self.strategy_class.__name__
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize strategy class: {e}, using default")
-                strategy_instance = None
+        strategy_instance, strategy_name = self._init_strategy()
 
         self.logger.info(
             f"Starting backtest | {symbol} | {start_date.date()} to {end_date.date()} | "
@@ -172,16 +755,18 @@ class Backtester:
                 final_balance=initial_balance
             )
 
-        # Calculate indicators for entire dataset
-        close = rates['close']
-        high = rates['high']
-        low = rates['low']
-        times = rates['time']
-
-        ema_trend = self._calculate_ema(close, self.ema_trend_period)
-        ema_reversion = self._calculate_ema(close, self.ema_reversion_period)
-        rsi = self._calculate_rsi(close, self.rsi_period)
-        atr = self._calculate_atr(rates, self.atr_period)
+        # Contiguous per-field arrays for the indicators and simulation loop;
+        # extracted once per shared (read-only) rates array
+        if rates.flags.writeable:
+            close, high, low, times = _rate_columns(rates)
+            ema_trend, ema_reversion, rsi, atr = self._calculate_indicators(close, high, low)
+        else:
+            shared = _SharedRates(rates)
+            close, high, low, times = _shared_columns(shared)
+            ema_trend, ema_reversion, rsi, atr = _shared_indicators(
+                shared, self.ema_trend_period, self.ema_reversion_period,
+                self.rsi_period, self.atr_period
+            )
 
         # Get pip size for symbol
         symbol_info = mt5.symbol_info(symbol)
@@ -196,204 +781,46 @@ class Backtester:
                 final_balance=initial_balance
             )
 
-        if symbol_info.digits == 3 or symbol_info.digits == 5:
-            pip_size = symbol_info.point * 10
-        else:
-            pip_size = symbol_info.point
-
+        pip_size, pip_value = self._pip_size_and_value(symbol_info)
         pip_tolerance = self.ema_tolerance_pips * pip_size
 
-        # Simulation state
-        balance = initial_balance
-        equity_curve = [(datetime.fromtimestamp(times[0]), balance)]
-        trades: List[BacktestTrade] = []
-
-        # Position state
-        in_position = False
-        position_entry_idx = 0
-        position_direction = None
-        position_entry_price = 0.0
-        position_sl = 0.0
-        position_tp = 0.0
-        position_volume = 0.0
-
-        # Market features at entry (for validation)
-        entry_rsi = 0.0
-        entry_ema_trend = 0.0
-        entry_ema_reversion = 0.0
-        entry_atr = 0.0
-        entry_distance_to_ema = 0.0
-        entry_trend_strength = 0.0
-        entry_is_trending = False
+        # Detect strategy type and use appropriate signal logic and parameters
+        # (MACD+RSI uses the Elastic Band signal until it is implemented)
+        if strategy_instance and 'FVG' in strategy_name:
+            signal_mode = SIGNAL_FVG
+            sl_multiplier = STRATEGY_CONFIG.get('atr_sl_multiplier', 2.0)
+            rr_ratio = STRATEGY_CONFIG.get('fvg_risk_reward_ratio', 1.5)
+        else:
+            signal_mode = SIGNAL_ELASTIC_BAND
+            sl_multiplier = self.atr_sl_multiplier
+            rr_ratio = self.rr_ratio
+
+        risk_pct = (self.phase_config.risk_per_trade_min +
+                   self.phase_config.risk_per_trade_max) / 2
 
         # Start after we have enough data for indicators
         start_idx = self.ema_trend_period + 10
 
-        # Main simulation loop
-        for i in range(start_idx, len(rates)):
-            current_time = datetime.fromtimestamp(times[i])
-
-            # Check exit conditions if in position
-            if in_position:
-                exit_reason = None
-                exit_price = 0.0
-
-                if position_direction == 'BUY':
-                    # Check SL
-                    if low[i] <= position_sl:
-                        exit_reason = 'SL'
-                        exit_price = position_sl
-                    # Check TP
-                    elif high[i] >= position_tp:
-                        exit_reason = 'TP'
-                        exit_price = position_tp
-                else:  # SELL
-                    # Check SL
-                    if high[i] >= position_sl:
-                        exit_reason = 'SL'
-                        exit_price = position_sl
-                    # Check TP
-                    elif low[i] <= position_tp:
-                        exit_reason = 'TP'
-                        exit_price = position_tp
-
-                # Check time exit
-                duration_minutes = (i - position_entry_idx) * STRATEGY_CONFIG['timeframe_minutes']
-                if duration_minutes >= self.max_duration and exit_reason is None:
-                    exit_price = close[i]
-                    # Only time exit if profitable
-                    if position_direction == 'BUY' and exit_price > position_entry_price:
-                        exit_reason = 'TIME'
-                    elif position_direction == 'SELL' and exit_price < position_entry_price:
-                        exit_reason = 'TIME'
-
-                # Close position
-                if exit_reason:
-                    # Calculate profit
-                    if position_direction == 'BUY':
-                        profit_pips = (exit_price - position_entry_price) / pip_size
-                    else:
-                        profit_pips = (position_entry_price - exit_price) / pip_size
-
-                    # Calculate money profit (simplified)
-                    tick_value = symbol_info.trade_tick_value
-                    tick_size = symbol_info.trade_tick_size
-                    pip_value = (pip_size / tick_size) * tick_value
-                    profit = profit_pips * pip_value * position_volume
-
-                    balance += profit
-
-                    # Record trade with market features
-                    trade = BacktestTrade(
-                        entry_time=datetime.fromtimestamp(times[position_entry_idx]),
-                        exit_time=current_time,
-                        symbol=symbol,
-                        direction=position_direction,
-                        entry_price=position_entry_price,
-                        exit_price=exit_price,
-                        sl=position_sl,
-                        tp=position_tp,
-                        volume=position_volume,
-                        profit=profit,
-                        profit_pips=profit_pips,
-                        exit_reason=exit_reason,
-                        duration_minutes=duration_minutes,
-                        # Market features at entry (for ML validation)
-                        rsi_at_entry=entry_rsi,
-                        ema_trend_value=entry_ema_trend,
-                        ema_reversion_value=entry_ema_reversion,
-                        atr_at_entry=entry_atr,
-                        distance_to_ema_pips=entry_distance_to_ema,
-                        trend_strength=entry_trend_strength,
-                        is_trending=entry_is_trending,
-                        # Strategy parameters used
-                        rsi_period=self.rsi_period,
-                        atr_sl_multiplier=self.atr_sl_multiplier,
-                        risk_reward_ratio=self.rr_ratio,
-                        ema_touch_tolerance_pips=self.ema_tolerance_pips,
-                        ema_reversion_period=self.ema_reversion_period
-                    )
-                    trades.append(trade)
-
-                    in_position = False
-                    equity_curve.append((current_time, balance))
-
-            # Check entry signals if not in position
-            if not in_position:
-                # Detect strategy type and use appropriate signal logic
-                if strategy_instance and 'FVG' in strategy_name:
-                    # FVG Strategy: Check for Fair Value Gaps
-                    signal = self._check_fvg_signal(rates, i, pip_size)
-                elif strategy_instance and 'MACD' in strategy_name:
-                    # MACD+RSI Strategy (to be implemented)
-                    signal = self._check_signal(
-                        close[i], close[i-1], high[i], low[i],
-                        ema_trend[i], ema_reversion[i],
-                        rsi[i], rsi[i-1],
-                        pip_tolerance
-                    )
-                else:
-                    # Default: Elastic Band Strategy
-                    signal = self._check_signal(
-                        close[i], close[i-1], high[i], low[i],
-                        ema_trend[i], ema_reversion[i],
-                        rsi[i], rsi[i-1],
-                        pip_tolerance
-                    )
-
-                if signal:
-                    # Calculate position size
-                    atr_pips = atr[i] / pip_size
-
-                    # Use strategy-specific parameters
-                    if strategy_instance and 'FVG' in strategy_name:
-                        sl_multiplier = STRATEGY_CONFIG.get('atr_sl_multiplier', 2.0)
-                        rr_ratio = STRATEGY_CONFIG.get('fvg_risk_reward_ratio', 1.5)
-                    else:
-                        sl_multiplier = self.atr_sl_multiplier
-                        rr_ratio = self.rr_ratio
-
-                    sl_pips = atr_pips * sl_multiplier
-                    sl_distance = sl_pips * pip_size
-                    tp_distance = sl_distance * rr_ratio
-
-                    risk_pct = (self.phase_config.risk_per_trade_min +
-                               self.phase_config.risk_per_trade_max) / 2
-                    risk_amount = balance * (risk_pct / 100)
-
-                    tick_value = symbol_info.trade_tick_value
-                    tick_size = symbol_info.trade_tick_size
-                    pip_value = (pip_size / tick_size) * tick_value
-
-                    if sl_pips > 0 and pip_value > 0:
-                        volume = risk_amount / (sl_pips * pip_value)
-                        volume = round(volume / symbol_info.volume_step) * symbol_info.volume_step
-                        volume = max(symbol_info.volume_min, min(volume, symbol_info.volume_max))
-
-                        if signal == 'BUY':
-                            entry_price = close[i]  # Simplified: use close as entry
-                            position_sl = entry_price - sl_distance
-                            position_tp = entry_price + tp_distance
-                        else:  # SELL
-                            entry_price = close[i]
-                            position_sl = entry_price + sl_distance
-                            position_tp = entry_price - tp_distance
-
-                        # Capture market features at entry (for ML validation)
-                        entry_rsi = rsi[i]
-                        entry_ema_trend = ema_trend[i]
-                        entry_ema_reversion = ema_reversion[i]
-                        entry_atr = atr[i]
-                        entry_distance_to_ema = abs(close[i] - ema_reversion[i]) / pip_size
-                        entry_trend_strength = abs(ema_trend[i] - ema_reversion[i]) / close[i]
-                        entry_is_trending = close[i] > ema_trend[i] if signal == 'BUY' else close[i] < ema_trend[i]
-
-                        # Enter position
-                        in_position = True
-                        position_entry_idx = i
-                        position_direction = signal
-                        position_entry_price = entry_price
-                        position_volume = volume
+        simulate = _simulate_bars
+        if NUMBA_AVAILABLE and len(rates) > NUMBA_MIN_BARS:
+            simulate = _simulate_kernel()
+
+        signals = _entry_signals(
+            close, high, low, ema_trend, ema_reversion, rsi, signal_mode, pip_size,
+            pip_tolerance, self.rsi_oversold, self.rsi_overbought,
+            STRATEGY_CONFIG.get('fvg_min_gap_pips', 5)
+        )
+        closed, balance = simulate(
+            close, high, low, atr, signals, start_idx, pip_size, sl_multiplier, rr_ratio,
+            risk_pct, pip_value, symbol_info.volume_step, symbol_info.volume_min,
+            symbol_info.volume_max, self.max_duration, STRATEGY_CONFIG['timeframe_minutes'],
+            initial_balance
+        )
+
+        trades = self._build_trades(symbol, closed, times, close, ema_trend, ema_reversion,
+                                    rsi, atr, pip_size)
+        equity_times = np.concatenate((times[:1], times[closed['exit_idx']]))
+        equity_values = np.concatenate(([initial_balance], closed['balance']))
 
         # Calculate results
         result = self._calculate_results(
@@ -403,7 +830,9 @@ class Backtester:
             initial_balance=initial_balance,
             final_balance=balance,
             trades=trades,
-            equity_curve=equity_curve
+            equity_times=equity_times,
+            equity_values=equity_values,
+            profits=closed['profit']
         )
 
         self._log_results(result)
@@ -417,16 +846,216 @@ class Backtester:
 
         return result
 
+    def _init_strategy(self) -> Tuple[Any, str]:
+        """Instantiate the strategy class, if any; returns (instance or None, name)."""
+        if self.strategy_class:
+            try:
+                return self.strategy_class("BACKTEST"), self.strategy_class.__name__
+            except Exception as e:
+                self.logger.warning(f"Failed to initialize strategy class: {e}, using default")
+        return None, "Elastic_Band"
+
+    @staticmethod
+    def _pip_size_and_value(symbol_info) -> Tuple[float, float]:
+        """Pip size and the account-currency value of one pip per lot."""
+        if symbol_info.digits == 3 or symbol_info.digits == 5:
+            pip_size = symbol_info.point * 10
+        else:
+            pip_size = symbol_info.point
+        return pip_size, (pip_size / symbol_info.trade_tick_size) * symbol_info.trade_tick_value
+
+    def run_param_grid(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        param_sets: List[Dict[str, Any]],
+        initial_balance: float = 10000.0,
+        float32: bool = False
+    ) -> List[BacktestResult]:
+        """
+        Backtest a symbol once per parameter set, sharing the price data.
+
+        Each parameter set overrides STRATEGY_CONFIG keys as a grid search
+        does; every distinct indicator series is computed once and the
+        combinations are simulated together, in parallel across cores when
+        numba is installed. Results carry the performance metrics only
+        (no trades or equity curve).
+
+        Args:
+            symbol: Trading symbol.
+            start_date: Backtest start date.
+            end_date: Backtest end date.
+            param_sets: STRATEGY_CONFIG overrides, one dict per combination.
+            initial_balance: Starting account balance for each combination.
+            float32: Simulate on float32 prices and indicators (computed in
+                float64), halving the memory the combinations stream
+                through, for coarse screening of large grids. float32 keeps
+                ~7 significant digits: enough for 5-digit FX quotes, but
+                coarser than a point for high-priced symbols (indices,
+                gold, crypto), and signals/exits right at a threshold can
+                differ from run(). Balances and profits stay float64.
+
+        Returns:
+            BacktestResults in param_sets order.
+        """
+        strategy_instance, strategy_name = self._init_strategy()
+        configs = [{**STRATEGY_CONFIG, **params} for params in param_sets]
+        empty = [
+            BacktestResult(
+                symbol=symbol,
+                phase=self.phase_config.name,
+                start_date=start_date,
+                end_date=end_date,
+                initial_balance=initial_balance,
+                final_balance=initial_balance
+            )
+            for _ in configs
+        ]
+
+        self.logger.info(
+            f"Starting grid backtest | {symbol} | {start_date.date()} to {end_date.date()} | "
+            f"Phase: {self.phase_config.name} | Strategy: {strategy_name} | "
+            f"{len(configs)} combinations"
+        )
+
+        rates = self._fetch_historical_data(symbol, start_date, end_date)
+        symbol_info = mt5.symbol_info(symbol) if rates is not None else None
+        if rates is None or symbol_info is None:
+            self.logger.error(f"No data or symbol info for {symbol}")
+            return empty
+
+        # Combinations without enough history for their trend EMA are not
+        # simulated, as in run()
+        viable = [len(rates) >= c['ema_trend_period'] + 100 for c in configs]
+        if not any(viable):
+            self.logger.error("Insufficient historical data")
+            return empty
+
+        if rates.flags.writeable:
+            close, high, low, _ = _rate_columns(rates)
+        else:
+            close, high, low, _ = _shared_columns(_SharedRates(rates))
+
+        # One row per distinct indicator period, shared by the combinations
+        simulated = [c for c, ok in zip(configs, viable) if ok]
+        ema_periods = sorted({c[key] for c in simulated for key in ('ema_trend_period', 'ema_reversion_period')})
+        rsi_periods = sorted({c['rsi_period'] for c in simulated})
+        atr_periods = sorted({c['atr_period'] for c in simulated})
+        dtype = np.float32 if float32 else np.float64
+        true_range = _true_range(high, low, close)
+        ema_rows = np.stack([_ema_from_sma_seed(close, period) for period in ema_periods]).astype(dtype, copy=False)
+        rsi_rows = np.stack([_rsi_from_wilder(close, period) for period in rsi_periods]).astype(dtype, copy=False)
+        atr_rows = np.stack([_ema_from_sma_seed(true_range, period) for period in atr_periods]).astype(dtype, copy=False)
+        close, high, low = (prices.astype(dtype, copy=False) for prices in (close, high, low))
+
+        pip_size, pip_value = self._pip_size_and_value(symbol_info)
+        is_fvg = bool(strategy_instance) and 'FVG' in strategy_name
+        rows = np.array([
+            (ema_periods.index(c['ema_trend_period']), ema_periods.index(c['ema_reversion_period']),
+             rsi_periods.index(c['rsi_period']), atr_periods.index(c['atr_period'])) if ok else (0, 0, 0, 0)
+            for c, ok in zip(configs, viable)
+        ], dtype=np.int64)
+        # Skipped combinations start past the last bar, so they trade nothing
+        start_idx = np.array([
+            c['ema_trend_period'] + 10 if ok else len(rates) for c, ok in zip(configs, viable)
+        ], dtype=np.int64)
+        settings = np.array([
+            (c['ema_touch_tolerance_pips'] * pip_size, c['rsi_oversold'], c['rsi_overbought'],
+             c.get('fvg_min_gap_pips', 5), c.get('atr_sl_multiplier', 2.0),
+             c.get('fvg_risk_reward_ratio', 1.5) if is_fvg else c['risk_reward_ratio'],
+             c['max_trade_duration_minutes'])
+            for c in configs
+        ], dtype=np.float64)
+        risk_pct = (self.phase_config.risk_per_trade_min +
+                    self.phase_config.risk_per_trade_max) / 2
+
+        simulate = _simulate_grid
+        if NUMBA_AVAILABLE and len(rates) * len(configs) > NUMBA_MIN_BARS:
+            simulate = _grid_kernel()
+
+        totals = np.zeros((len(configs), GRID_COLUMNS))
+        simulate(
+            close, high, low, ema_rows, rsi_rows, atr_rows, rows, start_idx, settings,
+            SIGNAL_FVG if is_fvg else SIGNAL_ELASTIC_BAND, pip_size, risk_pct, pip_value,
+            symbol_info.volume_step, symbol_info.volume_min, symbol_info.volume_max,
+            STRATEGY_CONFIG['timeframe_minutes'], initial_balance, totals
+        )
+
+        results = []
+        for result, row in zip(empty, totals.tolist()):
+            if row[GRID_TOTAL_TRADES]:
+                result.final_balance = row[GRID_FINAL_BALANCE]
+                result.total_trades = int(row[GRID_TOTAL_TRADES])
+                result.winning_trades = int(row[GRID_WINNING_TRADES])
+                result.gross_profit = row[GRID_GROSS_PROFIT]
+                result.gross_loss = row[GRID_GROSS_LOSS]
+                result.max_drawdown = row[GRID_MAX_DRAWDOWN]
+                result.max_consecutive_losses = int(row[GRID_MAX_CONSECUTIVE_LOSSES])
+                self._derive_metrics(result)
+            results.append(result)
+        return results
+
+    def run_batch(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        initial_balance: float = 10000.0,
+        n_jobs: int = -1
+    ) -> List[BacktestResult]:
+        """
+        Run this backtest on several symbols, one worker process per symbol.
+
+        Symbols are independent, so each runs in its own process with its
+        own MT5 connection. A symbol whose backtest raises is logged and
+        left out of the results.
+
+        Args:
+            symbols: Trading symbols.
+            start_date: Backtest start date.
+            end_date: Backtest end date.
+            initial_balance: Starting account balance for each symbol.
+            n_jobs: Worker processes (-1 = all cores, 1 = run in this process).
+
+        Returns:
+            BacktestResults in symbol order.
+        """
+        n_workers = min(n_jobs if n_jobs > 0 else os.cpu_count() or 1, len(symbols))
+        results = {}
+
+        if n_workers <= 1:
+            for symbol in symbols:
+                try:
+                    results[symbol] = self.run(symbol, start_date, end_date, initial_balance)
+                except Exception as e:
+                    self.logger.error(f"Backtest failed for {symbol}: {e}")
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                futures = {
+                    pool.submit(_run_one, symbol, self.phase, self.strategy_class,
+                                start_date, end_date, initial_balance): symbol
+                    for symbol in symbols
+                }
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        results[symbol] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Backtest failed for {symbol}: {e}")
+
+        return [results[symbol] for symbol in symbols if symbol in results]
+
     def _fetch_historical_data(
         self,
         symbol: str,
         start_date: datetime,
         end_date: datetime
     ) -> Optional[np.ndarray]:
-        """Fetch historical OHLC data from MT5."""
+        """Fetch historical OHLC data from MT5 (memoized per symbol/timeframe/range)."""
         timeframe = mt5.TIMEFRAME_M15
 
-        rates = mt5.copy_rates_range(symbol, timeframe, start_date, end_date)
+        rates = fetch_rates(symbol, timeframe, start_date, end_date)
 
         if rates is None or len(rates) == 0:
             self.logger.error(f"Failed to fetch historical data for {symbol}")
@@ -435,70 +1064,114 @@ class Backtester:
         self.logger.info(f"Fetched {len(rates)} bars for {symbol}")
         return rates
 
-    def _calculate_ema(self, data: np.ndarray, period: int) -> np.ndarray:
-        """Calculate EMA."""
-        ema = np.zeros(len(data))
-        multiplier = 2 / (period + 1)
+    def _build_trades(
+        self,
+        symbol: str,
+        closed: np.ndarray,
+        times: np.ndarray,
+        close: np.ndarray,
+        ema_trend: np.ndarray,
+        ema_reversion: np.ndarray,
+        rsi: np.ndarray,
+        atr: np.ndarray,
+        pip_size: float
+    ) -> List[BacktestTrade]:
+        """
+        Convert simulated TRADE_DTYPE rows into BacktestTrades with their entry features.
 
-        ema[period - 1] = np.mean(data[:period])
+        Columns and entry features are gathered with one fancy-index per
+        array and converted to Python scalars in bulk; only the timestamps
+        of actual trades are turned into (local, naive) datetimes.
+        """
+        timeframe_minutes = STRATEGY_CONFIG['timeframe_minutes']
+        entry_idx = closed['entry_idx']
+        exit_idx = closed['exit_idx']
+        is_buy = closed['direction'] == DIRECTION_BUY
+
+        entry_close = close[entry_idx]
+        entry_trend = ema_trend[entry_idx]
+        entry_reversion = ema_reversion[entry_idx]
+        columns = zip(
+            [datetime.fromtimestamp(t) for t in times[entry_idx].tolist()],
+            [datetime.fromtimestamp(t) for t in times[exit_idx].tolist()],
+            [DIRECTIONS[d] for d in closed['direction'].tolist()],
+            closed['entry_price'].tolist(),
+            closed['exit_price'].tolist(),
+            closed['sl'].tolist(),
+            closed['tp'].tolist(),
+            closed['volume'].tolist(),
+            closed['profit'].tolist(),
+            closed['profit_pips'].tolist(),
+            [EXIT_REASONS[r] for r in closed['exit_reason'].tolist()],
+            ((exit_idx - entry_idx) * timeframe_minutes).tolist(),
+            rsi[entry_idx].tolist(),
+            entry_trend.tolist(),
+            entry_reversion.tolist(),
+            atr[entry_idx].tolist(),
+            (np.abs(entry_close - entry_reversion) / pip_size).tolist(),
+            (np.abs(entry_trend - entry_reversion) / entry_close).tolist(),
+            np.where(is_buy, entry_close > entry_trend, entry_close < entry_trend).tolist()
+        )
 
-        for i in range(period, len(data)):
-            ema[i] = (data[i] * multiplier) + (ema[i - 1] * (1 - multiplier))
+        return [
+            BacktestTrade(
+                entry_time=entry_time,
+                exit_time=exit_time,
+                symbol=symbol,
+                direction=direction,
+                entry_price=entry_price,
+                exit_price=exit_price,
+                sl=sl,
+                tp=tp,
+                volume=volume,
+                profit=profit,
+                profit_pips=profit_pips,
+                exit_reason=exit_reason,
+                duration_minutes=duration,
+                # Market features at entry (for ML validation)
+                rsi_at_entry=rsi_at_entry,
+                ema_trend_value=ema_trend_value,
+                ema_reversion_value=ema_reversion_value,
+                atr_at_entry=atr_at_entry,
+                distance_to_ema_pips=distance_to_ema_pips,
+                trend_strength=trend_strength,
+                is_trending=is_trending,
+                # Strategy parameters used
+                rsi_period=self.rsi_period,
+                atr_sl_multiplier=self.atr_sl_multiplier,
+                risk_reward_ratio=self.rr_ratio,
+                ema_touch_tolerance_pips=self.ema_tolerance_pips,
+                ema_reversion_period=self.ema_reversion_period
+            )
+            for (entry_time, exit_time, direction, entry_price, exit_price, sl, tp, volume,
+                 profit, profit_pips, exit_reason, duration, rsi_at_entry, ema_trend_value,
+                 ema_reversion_value, atr_at_entry, distance_to_ema_pips, trend_strength,
+                 is_trending) in columns
+        ]
+
+    def _calculate_indicators(
+        self,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate the trend EMA, reversion EMA, RSI and ATR for this backtest's periods."""
+        return _compute_indicators(
+            close, high, low,
+            self.ema_trend_period, self.ema_reversion_period, self.rsi_period, self.atr_period
+        )
 
-        return ema
+    def _calculate_ema(self, data: np.ndarray, period: int) -> np.ndarray:
+        """Calculate EMA."""
+        return _ema_from_sma_seed(data, period)
 
     def _calculate_rsi(self, close: np.ndarray, period: int) -> np.ndarray:
         """Calculate RSI."""
-        rsi = np.zeros(len(close))
-        deltas = np.diff(close)
-
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-
-        avg_gain = np.mean(gains[:period])
-        avg_loss = np.mean(losses[:period])
-
-        if avg_loss == 0:
-            rsi[period] = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi[period] = 100 - (100 / (1 + rs))
-
-        for i in range(period, len(close) - 1):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-
-            if avg_loss == 0:
-                rsi[i + 1] = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi[i + 1] = 100 - (100 / (1 + rs))
-
-        return rsi
+        return _rsi_from_wilder(close, period)
 
     def _calculate_atr(self, rates: np.ndarray, period: int) -> np.ndarray:
         """Calculate ATR."""
-        high = rates['high']
-        low = rates['low']
-        close = rates['close']
-
-        atr = np.zeros(len(rates))
-        tr = np.zeros(len(rates))
-        tr[0] = high[0] - low[0]
-
-        for i in range(1, len(rates)):
-            hl = high[i] - low[i]
-            hc = abs(high[i] - close[i - 1])
-            lc = abs(low[i] - close[i - 1])
-            tr[i] = max(hl, hc, lc)
-
-        atr[period - 1] = np.mean(tr[:period])
-
-        multiplier = 2 / (period + 1)
-        for i in range(period, len(rates)):
-            atr[i] = (tr[i] * multiplier) + (atr[i - 1] * (1 - multiplier))
-
-        return atr
+        return _ema_from_sma_seed(_true_range(rates['high'], rates['low'], rates['close']), period)
 
     def _check_signal(
         self,
@@ -588,9 +1261,17 @@ class Backtester:
         initial_balance: float,
         final_balance: float,
         trades: List[BacktestTrade],
-        equity_curve: List[Tuple[datetime, float]]
+        equity_times: np.ndarray,
+        equity_values: np.ndarray,
+        profits: Optional[np.ndarray] = None
     ) -> BacktestResult:
-        """Calculate backtest performance metrics."""
+        """
+        Calculate backtest performance metrics.
+
+        Metrics are array reductions over per-trade profits and the equity
+        values; callers that already hold the profits (e.g. the simulation
+        records) pass them to skip extracting them from the trades.
+        """
         result = BacktestResult(
             symbol=symbol,
             phase=self.phase_config.name,
@@ -599,21 +1280,45 @@ class Backtester:
             initial_balance=initial_balance,
             final_balance=final_balance,
             trades=trades,
-            equity_curve=equity_curve
+            equity_times=equity_times,
+            equity_values=equity_values
         )
 
         if not trades:
             return result
 
+        if profits is None:
+            profits = np.fromiter((t.profit for t in trades), float, len(trades))
+
+        wins = profits > 0
+        losses = ~wins
+
         # Basic counts
         result.total_trades = len(trades)
-        result.winning_trades = sum(1 for t in trades if t.profit > 0)
-        result.losing_trades = sum(1 for t in trades if t.profit <= 0)
+        result.winning_trades = int(np.count_nonzero(wins))
 
         # Profit metrics
-        result.gross_profit = sum(t.profit for t in trades if t.profit > 0)
-        result.gross_loss = abs(sum(t.profit for t in trades if t.profit < 0))
-        result.net_profit = final_balance - initial_balance
+        result.gross_profit = float(profits[wins].sum())
+        result.gross_loss = abs(float(profits[profits < 0].sum()))
+
+        # Max drawdown from the running equity peak (never below the start)
+        peak = np.maximum(np.maximum.accumulate(equity_values), initial_balance)
+        result.max_drawdown = max(float((peak - equity_values).max()), 0) if len(equity_values) else 0
+
+        # Max consecutive losses: longest run of losing trades, from the
+        # start/end edges of each run
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], losses.view(np.int8), [0]))))
+        result.max_consecutive_losses = int((edges[1::2] - edges[::2]).max()) if len(edges) else 0
+
+        self._derive_metrics(result)
+        return result
+
+    @staticmethod
+    def _derive_metrics(result: BacktestResult):
+        """Fill the ratio metrics of a result from its trade counts, sums and drawdown."""
+        initial_balance = result.initial_balance
+        result.losing_trades = result.total_trades - result.winning_trades
+        result.net_profit = result.final_balance - initial_balance
 
         # Win rate
         result.win_rate = (result.winning_trades / result.total_trades * 100) if result.total_trades > 0 else 0
@@ -631,32 +1336,8 @@ class Backtester:
         if result.total_trades > 0:
             result.expectancy = result.net_profit / result.total_trades
 
-        # Max drawdown
-        peak = initial_balance
-        max_dd = 0
-        for _, equity in equity_curve:
-            if equity > peak:
-                peak = equity
-            dd = peak - equity
-            if dd > max_dd:
-                max_dd = dd
-
-        result.max_drawdown = max_dd
-        result.max_drawdown_pct = (max_dd / initial_balance * 100) if initial_balance > 0 else 0
-
-        # Max consecutive losses
-        max_consec = 0
-        current_consec = 0
-        for trade in trades:
-            if trade.profit <= 0:
-                current_consec += 1
-                max_consec = max(max_consec, current_consec)
-            else:
-                current_consec = 0
-
-        result.max_consecutive_losses = max_consec
-
-        return result
+        # Max drawdown relative to the starting balance
+        result.max_drawdown_pct = (result.max_drawdown / initial_balance * 100) if initial_balance > 0 else 0
 
     def _log_results(self, result: BacktestResult):
         """Log backtest results."""
@@ -5,21 +5,71 @@ Runs grid searches for multiple strategies/phases without manual intervention.
 """
 
 import argparse
+import logging
 import subprocess
 import json
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils import setup_logger
+from utils.mt5_cache import RATES_CACHE_ENV, RATES_CACHE_DIR, prune_rates_cache
+from utils.results_db import ResultsDB
+from bot import analyze_results, grid_search, optimize_parameters
 
 logger = setup_logger("BATCH_GS")
 
+# Holds the id of the most recently started batch, so callers can find it
+# without stat()ing every tests/results/batch_* directory
+LATEST_BATCH_FILE = Path("tests/results/latest_batch.txt")
+
+# Strategy/phase runs executed at once by default
+DEFAULT_JOBS = max(1, (os.cpu_count() or 1) // 2)
+
+
+def newest_subdir(parent: Path, prefix: str) -> Optional[Path]:
+    """
+    Return the most recently modified subdirectory of parent named prefix*.
+
+    Uses os.scandir so names are filtered and directory checks answered
+    from the directory read, stat()ing only the matching entries.
+    """
+    try:
+        with os.scandir(parent) as it:
+            entries = [e for e in it if e.name.startswith(prefix) and e.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return None
+    if not entries:
+        return None
+    return Path(max(entries, key=lambda e: e.stat(follow_symlinks=False).st_mtime).path)
+
+
+def _init_worker(env: Dict[str, str]):
+    """
+    Prepare a pool process for in-process runs: apply the environment a
+    grid search subprocess would get, and quiet the per-combination logs
+    that subprocess runs kept in their captured output.
+    """
+    os.environ.update(env)
+    grid_search.logger.setLevel(logging.WARNING)
+    analyze_results.logger.setLevel(logging.WARNING)
+
+
+def latest_batch_dir() -> Optional[Path]:
+    """Return the directory of the most recently started batch, if any."""
+    try:
+        batch_id = LATEST_BATCH_FILE.read_text().strip()
+    except FileNotFoundError:
+        # Batches started before LATEST_BATCH_FILE existed
+        return newest_subdir(LATEST_BATCH_FILE.parent, "batch_")
+    return Path(f"tests/results/batch_{batch_id}")
+
 
 class BatchGridSearchRunner:
     """Orchestrates grid searches across multiple strategies and phases."""
@@ -33,7 +83,11 @@ class BatchGridSearchRunner:
         max_combinations: int = 50,
         multi_period: bool = False,
         num_periods: int = 1,
-        resume_from: Optional[str] = None
+        resume_from: Optional[str] = None,
+        sampler: str = 'lhs',
+        param_grids: Optional[Dict[str, Dict[str, List[Any]]]] = None,
+        jobs: int = DEFAULT_JOBS,
+        use_subprocess: bool = False
     ):
         self.strategies = strategies
         self.symbols = symbols
@@ -42,6 +96,14 @@ class BatchGridSearchRunner:
         self.max_combinations = max_combinations
         self.multi_period = multi_period
         self.num_periods = num_periods
+        self.sampler = sampler
+        # Per-strategy grids overriding optimize_parameters' built-in ones
+        self.param_grids = param_grids or {}
+        # Strategy/phase runs executed concurrently
+        self.jobs = max(1, jobs)
+        # Run each step as its own Python process instead of calling the
+        # scripts' run() functions in a pool worker
+        self.use_subprocess = use_subprocess
 
         # Resume from existing batch or create new
         if resume_from:
@@ -56,10 +118,17 @@ class BatchGridSearchRunner:
             self.batch_id = datetime.now().strftime("%Y_%m_%d_%H%M%S")
             self.batch_dir = Path(f"tests/results/batch_{self.batch_id}")
             self.batch_dir.mkdir(parents=True, exist_ok=True)
+            LATEST_BATCH_FILE.write_text(self.batch_id)
             self.results = {}
             self.completed_runs = set()
 
         self.checkpoint_file = self.batch_dir / "checkpoint.json"
+        # One backtest window for every run, so the grid searches request
+        # identical rate ranges and share RATES_CACHE_DIR downloads
+        self.end_date = datetime.now().replace(microsecond=0)
+        # ResultsAggregator-style results of the successful runs, filled
+        # when the batch completes
+        self.run_results: List[Dict[str, Any]] = []
         self.start_time = None
         self.end_time = None
 
@@ -112,88 +181,178 @@ class BatchGridSearchRunner:
         logger.info(f"Phases: {', '.join(map(str, self.phases))}")
         logger.info(f"Days: {self.days}")
         logger.info(f"Max Combinations: {self.max_combinations}")
+        logger.info(f"Concurrent Runs: {self.jobs}")
         if self.multi_period:
             logger.info(f"Multi-Period: Yes ({self.num_periods} periods)")
         logger.info(f"Results Directory: {self.batch_dir}")
         logger.info("=" * 80)
 
-        total_runs = len(self.strategies) * len(self.phases)
-        current_run = 0
+        pruned = prune_rates_cache(RATES_CACHE_DIR)
+        if pruned:
+            logger.info(f"Removed {pruned} expired rate downloads from {RATES_CACHE_DIR}")
+
+        run_order = [f"{strategy}_phase{phase}" for strategy in self.strategies for phase in self.phases]
+        total_runs = len(run_order)
+        finished_runs = 0
 
-        # Run grid search for each strategy and phase combination
+        # Parameters are generated once per strategy up front: every phase
+        # of a strategy reads the same parameter file, so it must not be
+        # rewritten while another phase's grid search is running
+        pending = []
         for strategy in self.strategies:
+            phases = []
             for phase in self.phases:
-                current_run += 1
                 run_key = f"{strategy}_phase{phase}"
-
                 # Skip if already completed (resume capability)
                 if run_key in self.completed_runs:
                     logger.info(f"[SKIP]  Skipping {run_key} (already completed)")
-                    continue
-
-                logger.info("")
-                logger.info("-" * 80)
-                logger.info(f"RUN {current_run}/{total_runs}: {strategy.upper()} - Phase {phase}")
-                logger.info("-" * 80)
-
-                try:
-                    # Step 1: Generate parameters
-                    logger.info(f"[1/3] Generating parameters for {strategy}...")
-                    self._generate_parameters(strategy)
-
-                    # Step 2: Run grid search
-                    logger.info(f"[2/3] Running grid search for {strategy} (Phase {phase})...")
-                    run_dir = self._run_grid_search(strategy, phase)
-
-                    # Step 3: Analyze results
-                    logger.info(f"[3/3] Analyzing results for {strategy} (Phase {phase})...")
-                    analysis_result = self._analyze_results(run_dir)
-
-                    # Store results
-                    self.results[run_key] = {
-                        'strategy': strategy,
-                        'phase': phase,
-                        'run_dir': str(run_dir),
-                        'status': 'success',
-                        'analysis': analysis_result
-                    }
-
-                    # Mark as completed
-                    self.completed_runs.add(run_key)
-
-                    # Save checkpoint after each successful run
-                    self._save_checkpoint()
-
-                    logger.info(f"[OK] Completed {strategy} - Phase {phase}")
-
-                except Exception as e:
-                    logger.error(f"[X] Failed {strategy} - Phase {phase}: {e}")
-                    self.results[run_key] = {
+                    finished_runs += 1
+                else:
+                    phases.append(phase)
+            if not phases:
+                continue
+
+            logger.info(f"Generating parameters for {strategy}...")
+            try:
+                self._generate_parameters(strategy)
+            except Exception as e:
+                logger.error(f"[X] Failed to generate parameters for {strategy}: {e}")
+                for phase in phases:
+                    self.results[f"{strategy}_phase{phase}"] = {
                         'strategy': strategy,
                         'phase': phase,
                         'status': 'failed',
                         'error': str(e)
                     }
+                    finished_runs += 1
+                self._save_checkpoint()
+                continue
 
-                    # Save checkpoint even after failures
-                    self._save_checkpoint()
+            pending.extend((strategy, phase) for phase in phases)
+
+        # Results and checkpoints are only touched from this thread. Pool
+        # processes import numpy/numba once and reuse them for every run
+        # they take; subprocess runs only need threads to overlap them
+        if self.use_subprocess:
+            executor = ThreadPoolExecutor(max_workers=self.jobs)
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=self.jobs, initializer=_init_worker, initargs=(self._run_env(),)
+            )
+        with executor:
+            futures = [executor.submit(self._run_one, strategy, phase) for strategy, phase in pending]
+            for future in as_completed(futures):
+                run_key, result = future.result()
+                finished_runs += 1
+                self.results[run_key] = result
+                if result['status'] == 'success':
+                    self.completed_runs.add(run_key)
+                    logger.info(f"[OK] Completed {result['strategy']} - Phase {result['phase']} "
+                                f"({finished_runs}/{total_runs})")
+                else:
+                    logger.error(f"[X] Failed {result['strategy']} - Phase {result['phase']}: "
+                                 f"{result['error']} ({finished_runs}/{total_runs})")
+
+                # Save checkpoint after every run, successful or not
+                self._save_checkpoint()
+
+        # Report runs in strategy/phase order rather than completion order
+        self.results = {
+            run_key: self.results[run_key] for run_key in run_order if run_key in self.results
+        }
 
         self.end_time = datetime.now()
 
         # Save batch metadata
         self._save_batch_metadata()
+        self._record_results()
 
         # Print summary
         self._print_summary()
 
         return self.results
 
+    def _run_one(self, strategy: str, phase: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run the grid search and analysis for one strategy and phase.
+
+        Returns:
+            (run_key, result entry); failures are reported in the entry
+            rather than raised.
+        """
+        run_key = f"{strategy}_phase{phase}"
+        logger.info(f"[START] {strategy.upper()} - Phase {phase}")
+
+        try:
+            run_dir = self._run_grid_search(strategy, phase)
+            analysis_result = self._analyze_results(run_dir)
+        except Exception as e:
+            return run_key, {
+                'strategy': strategy,
+                'phase': phase,
+                'status': 'failed',
+                'error': str(e)
+            }
+
+        return run_key, {
+            'strategy': strategy,
+            'phase': phase,
+            'run_dir': str(run_dir),
+            'status': 'success',
+            'analysis': analysis_result
+        }
+
+    def _record_results(self):
+        """
+        Add every successful run to the results DB and to run_results, so
+        aggregation can skip their JSON files. Done once the batch is
+        complete, so resumed runs are included too.
+        """
+        runs = []
+        self.run_results = []
+        for run_key, run in self.results.items():
+            if run['status'] != 'success':
+                continue
+
+            analysis = run.get('analysis') or {}
+            best_params = analysis.get('best_params')
+            if best_params is None:
+                best_params_file = Path(run['run_dir']) / "best_params.json"
+                if not best_params_file.exists():
+                    continue
+                with open(best_params_file, 'r') as f:
+                    best_params = json.load(f)
+
+            runs.append((run_key, run, best_params, analysis.get('recommended_params')))
+            # Same shape as ResultsDB.load_batch
+            self.run_results.append({
+                'run_dir': run['run_dir'],
+                'strategy': run['strategy'],
+                'phase': run['phase'],
+                'best_params': best_params,
+                'recommended_params': analysis.get('recommended_params'),
+                'metadata': run
+            })
+
+        with ResultsDB() as db:
+            db.record_runs(self.batch_id, runs)
+
     def _generate_parameters(self, strategy: str):
         """Generate parameter combinations for a strategy."""
+        if not self.use_subprocess or strategy in self.param_grids:
+            optimize_parameters.run(
+                strategy=strategy,
+                max_combinations=self.max_combinations,
+                sampler=self.sampler,
+                param_grids=self.param_grids
+            )
+            return
+
         cmd = [
             sys.executable, 'bot/optimize_parameters.py',
             '--strategy', strategy,
-            '--max-combinations', str(self.max_combinations)
+            '--max-combinations', str(self.max_combinations),
+            '--sampler', self.sampler
         ]
 
         result = subprocess.run(cmd, capture_output=True, text=True)
@@ -201,9 +360,32 @@ class BatchGridSearchRunner:
         if result.returncode != 0:
             raise RuntimeError(f"Failed to generate parameters: {result.stderr}")
 
+    def _run_env(self) -> Dict[str, str]:
+        """Environment variables set for every grid search."""
+        env = {RATES_CACHE_ENV: str(RATES_CACHE_DIR)}
+        if 'NUMBA_NUM_THREADS' not in os.environ:
+            # Concurrent runs share the cores instead of each starting a
+            # parallel-kernel thread per core
+            env['NUMBA_NUM_THREADS'] = str(max(1, (os.cpu_count() or 1) // self.jobs))
+        return env
+
     def _run_grid_search(self, strategy: str, phase: int) -> Path:
         """Run grid search for a strategy and phase."""
         params_file = f"tests/parameter_sets/{strategy}_params.json"
+        # Named after the batch rather than found as the newest run_*
+        # directory, which is ambiguous while other runs are in progress
+        run_id = f"{self.batch_id}_phase{phase}"
+
+        if not self.use_subprocess:
+            return Path(grid_search.run(
+                strategy=strategy,
+                params=params_file,
+                symbols=self.symbols,
+                phase=str(phase),
+                days=self.days,
+                end_date=self.end_date,
+                run_id=run_id
+            ))
 
         cmd = [
             sys.executable, 'bot/grid_search.py',
@@ -211,39 +393,42 @@ class BatchGridSearchRunner:
             '--params', params_file,
             '--symbols', ','.join(self.symbols),
             '--phase', str(phase),
-            '--days', str(self.days)
+            '--days', str(self.days),
+            '--end-date', self.end_date.isoformat(),
+            '--run-id', run_id
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        env = {**os.environ, **self._run_env()}
+        result = subprocess.run(cmd, capture_output=True, text=True, env=env)
 
         if result.returncode != 0:
             raise RuntimeError(f"Grid search failed: {result.stderr}")
 
-        # Parse run directory from output
-        # The grid search creates: tests/results/{strategy}/run_TIMESTAMP
-        # We need to find the most recent run directory
-        strategy_results_dir = Path(f"tests/results/{strategy}")
-        if not strategy_results_dir.exists():
-            raise RuntimeError(f"Results directory not found: {strategy_results_dir}")
-
-        run_dirs = sorted(strategy_results_dir.glob("run_*"), key=lambda p: p.stat().st_mtime, reverse=True)
-        if not run_dirs:
-            raise RuntimeError(f"No run directories found in {strategy_results_dir}")
+        run_dir = Path(f"tests/results/{strategy}/run_{run_id}")
+        if not run_dir.is_dir():
+            raise RuntimeError(f"Results directory not found: {run_dir}")
 
-        return run_dirs[0]
+        return run_dir
 
     def _analyze_results(self, run_dir: Path) -> Optional[Dict[str, Any]]:
         """Analyze grid search results."""
-        cmd = [
-            sys.executable, 'bot/analyze_results.py',
-            '--run', str(run_dir)
-        ]
+        if self.use_subprocess:
+            cmd = [
+                sys.executable, 'bot/analyze_results.py',
+                '--run', str(run_dir)
+            ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(cmd, capture_output=True, text=True)
 
-        if result.returncode != 0:
-            logger.warning(f"Analysis failed: {result.stderr}")
-            return None
+            if result.returncode != 0:
+                logger.warning(f"Analysis failed: {result.stderr}")
+                return None
+        else:
+            try:
+                analyze_results.run(str(run_dir))
+            except Exception as e:
+                logger.warning(f"Analysis failed: {e}")
+                return None
 
         # Load best params from analysis
         best_params_file = run_dir / "best_params.json"
@@ -367,6 +552,12 @@ def main():
         default=50,
         help='Maximum parameter combinations per strategy (default: 50)'
     )
+    parser.add_argument(
+        '--sampler',
+        choices=['lhs', 'sobol', 'random', 'grid'],
+        default='lhs',
+        help='How to pick combinations from large parameter grids (default: lhs)'
+    )
     parser.add_argument(
         '--multi-period',
         action='store_true',
@@ -384,6 +575,17 @@ def main():
         default=None,
         help='Resume from existing batch ID (e.g., 2025_11_28_153702)'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f'Strategy/phase runs to execute concurrently (default: {DEFAULT_JOBS})'
+    )
+    parser.add_argument(
+        '--subprocess',
+        action='store_true',
+        help='Run each parameter generation/grid search/analysis as a separate Python process'
+    )
 
     args = parser.parse_args()
 
@@ -418,6 +620,10 @@ def main():
         logger.error("--num-periods must be between 1 and 3")
         sys.exit(1)
 
+    if args.jobs < 1:
+        logger.error("--jobs must be at least 1")
+        sys.exit(1)
+
     # Create and run batch grid search
     runner = BatchGridSearchRunner(
         strategies=strategies,
@@ -427,7 +633,10 @@ def main():
         max_combinations=args.max_combinations,
         multi_period=args.multi_period,
         num_periods=args.num_periods,
-        resume_from=args.resume
+        resume_from=args.resume,
+        sampler=args.sampler,
+        jobs=args.jobs,
+        use_subprocess=args.subprocess
     )
 
     results = runner.run()
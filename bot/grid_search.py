@@ -8,17 +8,21 @@ import argparse
 import json
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import time
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils import setup_logger
-from bot.config import TradingPhase, STRATEGY_CONFIG
+from bot.config import TradingPhase
 
 logger = setup_logger("GRID_SEARCH")
 
+# Combinations simulated together per Backtester.run_param_grid call;
+# results are saved and progress reported after each chunk
+GRID_CHUNK_SIZE = 64
+
 
 class GridSearchRunner:
     """
@@ -36,7 +40,9 @@ class GridSearchRunner:
         start_date: datetime,
         end_date: datetime,
         initial_balance: float,
-        output_dir: str
+        output_dir: str,
+        float32: bool = False,
+        run_id: Optional[str] = None
     ):
         self.strategy_name = strategy_name
         self.param_combinations = param_combinations
@@ -46,9 +52,12 @@ class GridSearchRunner:
         self.end_date = end_date
         self.initial_balance = initial_balance
         self.output_dir = output_dir
+        # Screen on float32 prices/indicators (see Backtester.run_param_grid)
+        self.float32 = float32
 
-        # Create run directory
-        run_id = datetime.now().strftime("%Y_%m_%d_%H%M%S")
+        # Create run directory; callers running several searches at once
+        # pass distinct run ids, since timestamps only resolve to the second
+        run_id = run_id or datetime.now().strftime("%Y_%m_%d_%H%M%S")
         self.run_dir = os.path.join(output_dir, strategy_name, f"run_{run_id}")
         os.makedirs(self.run_dir, exist_ok=True)
 
@@ -74,6 +83,7 @@ class GridSearchRunner:
             'start_date': self.start_date.isoformat(),
             'end_date': self.end_date.isoformat(),
             'initial_balance': self.initial_balance,
+            'float32': self.float32,
             'total_combinations': len(self.param_combinations),
             'created_at': datetime.now().isoformat()
         }
@@ -128,87 +138,84 @@ class GridSearchRunner:
             logger.info(f"Results: {self.run_dir}")
             logger.info(f"{'='*80}\n")
 
-            # Test each combination
-            for i, params in enumerate(self.param_combinations[resume_from:], start=resume_from):
-                combo_id = f"{i+1:03d}"
-
-                logger.info(f"\n{'─'*80}")
-                logger.info(f"Testing Combination {combo_id}/{self.total_combos}")
-                logger.info(f"Parameters: {params}")
-                logger.info(f"{'─'*80}")
-
-                # Backup original config
-                original_params = {}
-                for key, value in params.items():
-                    if key in STRATEGY_CONFIG:
-                        original_params[key] = STRATEGY_CONFIG[key]
-                        STRATEGY_CONFIG[key] = value
-
-                # Run backtests for all symbols
-                combo_results = {
-                    'combo_id': combo_id,
-                    'parameters': params,
-                    'results': {},
-                    'aggregate': {}
-                }
-
-                total_profit = 0
-                total_trades = 0
-                total_wins = 0
-
+            # Test the combinations a chunk at a time; each symbol's chunk is
+            # one run_param_grid pass over that symbol's rates
+            for chunk_start in range(resume_from, self.total_combos, GRID_CHUNK_SIZE):
+                chunk = self.param_combinations[chunk_start:chunk_start + GRID_CHUNK_SIZE]
+                chunk_results = {}
                 for symbol in self.symbols:
-                    logger.info(f"  Testing {symbol}...")
-
-                    # Create backtester with strategy class
+                    logger.info(f"  Testing {symbol} on combinations "
+                                f"{chunk_start + 1}-{chunk_start + len(chunk)}...")
                     backtester = Backtester(self.phase, strategy_class=strategy_class)
-                    result = backtester.run(
+                    chunk_results[symbol] = backtester.run_param_grid(
                         symbol,
                         self.start_date,
                         self.end_date,
-                        self.initial_balance
+                        chunk,
+                        self.initial_balance,
+                        float32=self.float32
                     )
 
-                    # Store results
-                    combo_results['results'][symbol] = {
-                        'net_profit': result.net_profit,
-                        'total_trades': result.total_trades,
-                        'win_rate': result.win_rate,
-                        'profit_factor': result.profit_factor,
-                        'max_drawdown_pct': result.max_drawdown_pct,
-                        'expectancy': result.expectancy
-                    }
+                for offset, params in enumerate(chunk):
+                    i = chunk_start + offset
+                    combo_id = f"{i+1:03d}"
 
-                    total_profit += result.net_profit
-                    total_trades += result.total_trades
-                    total_wins += result.winning_trades
+                    logger.info(f"\n{'─'*80}")
+                    logger.info(f"Combination {combo_id}/{self.total_combos}")
+                    logger.info(f"Parameters: {params}")
+                    logger.info(f"{'─'*80}")
 
-                # Calculate aggregates
-                avg_win_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
-                combo_results['aggregate'] = {
-                    'total_profit': total_profit,
-                    'total_trades': total_trades,
-                    'avg_win_rate': avg_win_rate
-                }
+                    combo_results = {
+                        'combo_id': combo_id,
+                        'parameters': params,
+                        'results': {},
+                        'aggregate': {}
+                    }
 
-                # Save combination results
-                combo_file = os.path.join(self.run_dir, f'combo_{combo_id}.json')
-                with open(combo_file, 'w') as f:
-                    json.dump(combo_results, f, indent=2)
+                    total_profit = 0
+                    total_trades = 0
+                    total_wins = 0
+
+                    for symbol in self.symbols:
+                        result = chunk_results[symbol][offset]
+
+                        # Store results
+                        combo_results['results'][symbol] = {
+                            'net_profit': result.net_profit,
+                            'total_trades': result.total_trades,
+                            'win_rate': result.win_rate,
+                            'profit_factor': result.profit_factor,
+                            'max_drawdown_pct': result.max_drawdown_pct,
+                            'expectancy': result.expectancy
+                        }
+
+                        total_profit += result.net_profit
+                        total_trades += result.total_trades
+                        total_wins += result.winning_trades
+
+                    # Calculate aggregates
+                    avg_win_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
+                    combo_results['aggregate'] = {
+                        'total_profit': total_profit,
+                        'total_trades': total_trades,
+                        'avg_win_rate': avg_win_rate
+                    }
 
-                # Restore original config
-                for key, value in original_params.items():
-                    STRATEGY_CONFIG[key] = value
+                    # Save combination results
+                    combo_file = os.path.join(self.run_dir, f'combo_{combo_id}.json')
+                    with open(combo_file, 'w') as f:
+                        json.dump(combo_results, f, indent=2)
 
-                # Update progress
-                self.completed_combos += 1
+                    # Update progress
+                    self.completed_combos += 1
 
-                # Track best
-                if total_profit > self.best_profit:
-                    self.best_profit = total_profit
-                    self.best_combo = combo_id
+                    # Track best
+                    if total_profit > self.best_profit:
+                        self.best_profit = total_profit
+                        self.best_combo = combo_id
 
-                # Print progress
-                self._print_progress(combo_id, params, total_profit, avg_win_rate)
+                    # Print progress
+                    self._print_progress(combo_id, params, total_profit, avg_win_rate)
 
             # Generate summary
             self._generate_summary()
@@ -324,6 +331,64 @@ class GridSearchRunner:
             )
 
 
+def run(
+    strategy: str,
+    params: str,
+    symbols: List[str],
+    phase: str = '1',
+    days: int = 90,
+    balance: float = 10000.0,
+    output: str = "tests/results",
+    resume: int = 0,
+    end_date: Optional[datetime] = None,
+    float32: bool = False,
+    run_id: Optional[str] = None
+) -> str:
+    """
+    Run a grid search without going through the CLI; arguments mirror
+    the command-line options.
+
+    Returns:
+        The run directory.
+
+    Raises:
+        FileNotFoundError: If the parameter file does not exist.
+        ValueError: If it holds no combinations.
+    """
+    # Load parameter combinations
+    if not os.path.exists(params):
+        raise FileNotFoundError(f"Parameter file not found: {params}")
+
+    with open(params, 'r') as f:
+        param_data = json.load(f)
+        combinations = param_data.get('combinations', [])
+
+    if not combinations:
+        raise ValueError("No parameter combinations found in file")
+
+    end_date = end_date or datetime.now()
+    start_date = end_date - timedelta(days=days)
+
+    phase_map = {'1': TradingPhase.PHASE_1, '2': TradingPhase.PHASE_2, '3': TradingPhase.PHASE_3}
+
+    # Create and run grid search
+    grid_search = GridSearchRunner(
+        strategy_name=strategy,
+        param_combinations=combinations,
+        symbols=symbols,
+        phase=phase_map[str(phase)],
+        start_date=start_date,
+        end_date=end_date,
+        initial_balance=balance,
+        output_dir=output,
+        float32=float32,
+        run_id=run_id
+    )
+
+    grid_search.run(resume_from=resume)
+    return grid_search.run_dir
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Automated Grid Search for Parameter Optimization")
@@ -343,44 +408,33 @@ def main():
                        help="Output directory for results")
     parser.add_argument("--resume", type=int, default=0,
                        help="Resume from combination number (0-based)")
+    parser.add_argument("--end-date", type=datetime.fromisoformat, default=None,
+                       help="Backtest end date, ISO format (default: now)")
+    parser.add_argument("--float32", action="store_true",
+                       help="Screen on float32 prices/indicators (faster, approximate)")
+    parser.add_argument("--run-id", type=str, default=None,
+                       help="Results go to <output>/<strategy>/run_<run-id> (default: timestamp)")
 
     args = parser.parse_args()
 
-    # Load parameter combinations
-    if not os.path.exists(args.params):
-        logger.error(f"Parameter file not found: {args.params}")
-        sys.exit(1)
-
-    with open(args.params, 'r') as f:
-        param_data = json.load(f)
-        combinations = param_data.get('combinations', [])
-
-    if not combinations:
-        logger.error("No parameter combinations found in file")
+    try:
+        run(
+            strategy=args.strategy,
+            params=args.params,
+            symbols=[s.strip() for s in args.symbols.split(',')],
+            phase=args.phase,
+            days=args.days,
+            balance=args.balance,
+            output=args.output,
+            resume=args.resume,
+            end_date=args.end_date,
+            float32=args.float32,
+            run_id=args.run_id
+        )
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(str(e))
         sys.exit(1)
 
-    # Parse arguments
-    symbols = [s.strip() for s in args.symbols.split(',')]
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=args.days)
-
-    phase_map = {'1': TradingPhase.PHASE_1, '2': TradingPhase.PHASE_2, '3': TradingPhase.PHASE_3}
-    phase = phase_map[args.phase]
-
-    # Create and run grid search
-    grid_search = GridSearchRunner(
-        strategy_name=args.strategy,
-        param_combinations=combinations,
-        symbols=symbols,
-        phase=phase,
-        start_date=start_date,
-        end_date=end_date,
-        initial_balance=args.balance,
-        output_dir=args.output
-    )
-
-    grid_search.run(resume_from=args.resume)
-
 
 if __name__ == "__main__":
     main()
@@ -5,7 +5,9 @@ Multi-objective optimization with quality gates for parameter selection.
 Provides composite scoring that balances profit, risk, and consistency.
 """
 
+import heapq
 import numpy as np
+from operator import itemgetter
 from typing import Dict, List, Optional, Any
 import sys
 import os
@@ -207,7 +209,47 @@ class IntelligentRanker:
             if self.quality_gates.passes(result):
                 passed.append(result)
 
-        if len(passed) == 0:
+        self._log_gate_summary(len(passed), len(results))
+
+        return passed
+
+    def quality_gate_mask(
+        self,
+        win_rate: np.ndarray,
+        profit_factor: np.ndarray,
+        max_drawdown_pct: np.ndarray,
+        total_trades: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized quality gate check over metric columns.
+
+        Same thresholds as QualityGates.passes; callers fill missing values
+        before passing the columns in.
+
+        Args:
+            win_rate: Win rate per result
+            profit_factor: Profit factor per result
+            max_drawdown_pct: Max drawdown % per result
+            total_trades: Trade count per result
+
+        Returns:
+            Boolean array, True where a result passed all gates
+        """
+        gates = self.quality_gates
+        mask = (
+            (win_rate >= gates.min_win_rate)
+            & (profit_factor >= gates.min_profit_factor)
+            & (max_drawdown_pct <= gates.max_drawdown_pct)
+            & (total_trades >= gates.min_trades)
+        )
+
+        self._log_gate_summary(int(mask.sum()), len(mask))
+
+        return mask
+
+    def _log_gate_summary(self, n_passed: int, n_total: int):
+        """Log how many results passed the quality gates."""
+        if n_passed == 0:
             logger.warning("⚠️  NO PARAMETERS PASSED QUALITY GATES!")
             logger.warning("   Quality Requirements:")
             logger.warning(f"   - Win Rate >= {self.quality_gates.min_win_rate}%")
@@ -215,14 +257,13 @@ class IntelligentRanker:
             logger.warning(f"   - Max Drawdown <= {self.quality_gates.max_drawdown_pct}%")
             logger.warning(f"   - Minimum Trades >= {self.quality_gates.min_trades}")
         else:
-            logger.info(f"✓ {len(passed)} / {len(results)} parameters passed quality gates ({len(passed)/len(results)*100:.1f}%)")
-
-        return passed
+            logger.info(f"✓ {n_passed} / {n_total} parameters passed quality gates ({n_passed/n_total*100:.1f}%)")
 
     def rank_results(
         self,
         results: List[Dict[str, Any]],
-        apply_gates: bool = True
+        apply_gates: bool = True,
+        top_n: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Rank results by composite score.
@@ -230,6 +271,8 @@ class IntelligentRanker:
         Args:
             results: List of backtest results
             apply_gates: If True, filter by quality gates first
+            top_n: If set, only return the best top_n results (heap
+                selection instead of a full sort)
 
         Returns:
             Sorted list of results (best first) with composite_score added
@@ -246,14 +289,12 @@ class IntelligentRanker:
             score = self.calculate_composite_score(result)
             result['composite_score'] = score if score is not None else 0
 
-        # Sort by composite score (highest first)
-        ranked = sorted(
-            results,
-            key=lambda x: x.get('composite_score', 0),
-            reverse=True
-        )
+        # Sort by composite score (highest first); nlargest keeps sorted()'s
+        # tie order
+        if top_n is not None:
+            return heapq.nlargest(top_n, results, key=itemgetter('composite_score'))
 
-        return ranked
+        return sorted(results, key=itemgetter('composite_score'), reverse=True)
 
     def generate_recommendations(
         self,
@@ -270,10 +311,9 @@ class IntelligentRanker:
         Returns:
             Dictionary with top recommendations and summary stats
         """
-        # Rank results
-        ranked = self.rank_results(results, apply_gates=True)
+        passed = self.apply_quality_gates(results)
 
-        if not ranked:
+        if not passed:
             return {
                 'passed_gates': False,
                 'total_tested': len(results),
@@ -282,15 +322,15 @@ class IntelligentRanker:
                 'summary': 'No parameters met quality gate requirements'
             }
 
-        # Get top N
-        top_results = ranked[:top_n]
+        # Only the top N are needed, so skip sorting the rest
+        top_results = self.rank_results(passed, apply_gates=False, top_n=top_n)
 
         # Calculate summary statistics
         summary = {
             'passed_gates': True,
             'total_tested': len(results),
-            'total_passed': len(ranked),
-            'pass_rate': len(ranked) / len(results) * 100,
+            'total_passed': len(passed),
+            'pass_rate': len(passed) / len(results) * 100,
             'top_recommendations': top_results,
             'best_composite_score': top_results[0].get('composite_score', 0),
             'best_profit': top_results[0].get('net_profit', 0),
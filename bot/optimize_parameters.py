@@ -9,10 +9,18 @@ import argparse
 import json
 import itertools
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import sys
 import os
 
+import numpy as np
+try:
+    from scipy.stats import qmc
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    qmc = None
+
 # Suppress MT5 import errors during parameter grid generation
 try:
     import MetaTrader5 as mt5
@@ -64,31 +72,127 @@ ELASTIC_BB_PARAMS = {
 }
 
 
-def generate_param_combinations(param_grid: Dict[str, List[Any]], max_combinations: int = 200) -> List[Dict[str, Any]]:
+PARAM_GRIDS = {
+    'elastic_band': ELASTIC_BAND_PARAMS,
+    'fvg': FVG_PARAMS,
+    'macd_rsi': MACD_RSI_PARAMS,
+    'elastic_bb': ELASTIC_BB_PARAMS,
+}
+
+SAMPLERS = ['lhs', 'sobol', 'random', 'grid']
+
+
+def _sample_unit_cube(sampler: str, n: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw n points in [0, 1)^dims with the given sampler."""
+    if sampler == 'sobol':
+        return qmc.Sobol(d=dims, seed=rng).random(n)
+    if sampler == 'lhs':
+        # One point per stratum in every dimension, strata shuffled per dimension
+        strata = np.argsort(rng.random((dims, n)), axis=1).T
+        return (strata + rng.random((n, dims))) / n
+    return rng.random((n, dims))
+
+
+def generate_param_combinations(
+    param_grid: Dict[str, List[Any]],
+    max_combinations: int = 200,
+    sampler: str = 'lhs',
+    seed: int = 0
+) -> List[Dict[str, Any]]:
     """
     Generate parameter combinations from a grid.
 
+    When the grid has more than max_combinations points, 'grid' takes an
+    evenly strided slice of the full product, while 'lhs', 'sobol' and
+    'random' sample the grid so every parameter's range is covered.
+
     Args:
         param_grid: Dictionary of parameter names to lists of values.
         max_combinations: Maximum number of combinations to generate.
+        sampler: One of SAMPLERS ('sobol' requires scipy).
+        seed: Random seed so a batch regenerates the same combinations.
 
     Returns:
         List of parameter dictionaries.
     """
     keys = list(param_grid.keys())
     values = [param_grid[k] for k in keys]
+    sizes = [len(v) for v in values]
+    total = int(np.prod(sizes, dtype=np.int64))
+
+    if total <= max_combinations or sampler == 'grid':
+        # Generate all combinations
+        all_combinations = list(itertools.product(*values))
+
+        # Limit to max_combinations
+        if len(all_combinations) > max_combinations:
+            # Sample evenly
+            step = len(all_combinations) // max_combinations
+            all_combinations = all_combinations[::step][:max_combinations]
+
+        # Convert to list of dicts
+        return [dict(zip(keys, combo)) for combo in all_combinations]
+
+    if sampler == 'sobol' and not SCIPY_AVAILABLE:
+        raise ValueError("The sobol sampler requires scipy (pip install scipy)")
+
+    # Map unit-cube points onto each parameter's discrete values, then
+    # dedupe by flat grid index (keeping first-seen order)
+    rng = np.random.default_rng(seed)
+    points = _sample_unit_cube(sampler, max_combinations, len(keys), rng)
+    indices = np.minimum((points * sizes).astype(np.int64), np.array(sizes) - 1)
+    flat = np.ravel_multi_index(indices.T, sizes)
+    _, first = np.unique(flat, return_index=True)
+    flat = flat[np.sort(first)]
+
+    # Top up collisions with random unused grid points
+    if len(flat) < max_combinations:
+        unused = np.setdiff1d(np.arange(total), flat, assume_unique=True)
+        extra = rng.choice(unused, max_combinations - len(flat), replace=False)
+        flat = np.concatenate([flat, extra])
+
+    columns = np.unravel_index(flat, sizes)
+    return [
+        {key: vals[i] for key, vals, i in zip(keys, values, row)}
+        for row in zip(*(c.tolist() for c in columns))
+    ]
+
+
+def refine_param_grid(param_grid: Dict[str, List[Any]], center: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    Build a narrower grid around the best parameters found so far.
 
-    # Generate all combinations
-    all_combinations = list(itertools.product(*values))
+    Each parameter gets its best value plus the midpoints towards its
+    nearest neighbours in param_grid, so refining repeatedly against a
+    grid that accumulates the tested values halves the step every pass.
 
-    # Limit to max_combinations
-    if len(all_combinations) > max_combinations:
-        # Sample evenly
-        step = len(all_combinations) // max_combinations
-        all_combinations = all_combinations[::step][:max_combinations]
+    Args:
+        param_grid: Values tested so far for each parameter.
+        center: Best parameter values.
+
+    Returns:
+        Grid with at most three values per parameter. Parameters missing
+        from center keep their param_grid values.
+    """
+    refined = {}
+    for key, values in param_grid.items():
+        ordered = sorted(set(values))
+        best = center.get(key)
+        if best not in ordered:
+            refined[key] = ordered
+            continue
+
+        i = ordered.index(best)
+        neighbours = ordered[max(i - 1, 0):i + 2]
+        integer = all(isinstance(v, int) for v in ordered)
 
-    # Convert to list of dicts
-    return [dict(zip(keys, combo)) for combo in all_combinations]
+        candidates = []
+        for v in neighbours:
+            mid = (v + best) / 2
+            candidates.append(int(round(mid)) if integer else round(mid, 4))
+        refined[key] = sorted(set(candidates))
+
+    return refined
 
 
 def print_optimization_plan(strategy_name: str, param_grid: Dict[str, List[Any]]):
@@ -136,6 +240,45 @@ def save_param_combinations(strategy_name: str, combinations: List[Dict[str, Any
     print(f"Saved {len(combinations)} parameter combinations to: {output_file}")
 
 
+def run(
+    strategy: str = 'all',
+    max_combinations: int = 100,
+    sampler: str = 'lhs',
+    seed: int = 0,
+    output_dir: str = 'tests/parameter_sets',
+    param_grids: Optional[Dict[str, Dict[str, List[Any]]]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate and save parameter combinations without going through the CLI.
+
+    Args:
+        strategy: Strategy name or 'all'.
+        max_combinations: Maximum combinations per strategy.
+        sampler: See generate_param_combinations.
+        seed: See generate_param_combinations.
+        output_dir: Directory for the {strategy}_params.json files.
+        param_grids: Per-strategy grids overriding PARAM_GRIDS.
+
+    Returns:
+        Generated combinations by strategy name.
+    """
+    grids = {**PARAM_GRIDS, **(param_grids or {})}
+    selected_strategies = grids if strategy == 'all' else {strategy: grids[strategy]}
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    generated = {}
+    for strategy_name, param_grid in selected_strategies.items():
+        combinations = generate_param_combinations(
+            param_grid, max_combinations, sampler=sampler, seed=seed
+        )
+        save_param_combinations(
+            strategy_name, combinations, os.path.join(output_dir, f'{strategy_name}_params.json')
+        )
+        generated[strategy_name] = combinations
+    return generated
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate parameter optimization grids for trading strategies')
     parser.add_argument(
@@ -150,6 +293,19 @@ def main():
         default=100,
         help='Maximum number of parameter combinations to generate (default: 100)'
     )
+    parser.add_argument(
+        '--sampler',
+        choices=SAMPLERS,
+        default='lhs',
+        help='How to pick combinations from grids larger than --max-combinations '
+             '(default: lhs; sobol requires scipy; grid = evenly strided slice)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed for the lhs/sobol/random samplers (default: 0)'
+    )
     parser.add_argument(
         '--output-dir',
         default='tests/parameter_sets',
@@ -158,35 +314,21 @@ def main():
 
     args = parser.parse_args()
 
-    # Create output directory
-    os.makedirs(args.output_dir, exist_ok=True)
-
-    strategies = {
-        'elastic_band': ELASTIC_BAND_PARAMS,
-        'fvg': FVG_PARAMS,
-        'macd_rsi': MACD_RSI_PARAMS,
-        'elastic_bb': ELASTIC_BB_PARAMS,
-    }
-
-    if args.strategy == 'all':
-        selected_strategies = strategies
-    else:
-        selected_strategies = {args.strategy: strategies[args.strategy]}
-
     print(f"\n{'#'*60}")
     print(f"PARAMETER OPTIMIZATION GRID GENERATOR")
     print(f"{'#'*60}")
 
-    for strategy_name, param_grid in selected_strategies.items():
-        # Print optimization plan
-        print_optimization_plan(strategy_name, param_grid)
-
-        # Generate combinations
-        combinations = generate_param_combinations(param_grid, args.max_combinations)
+    generated = run(
+        strategy=args.strategy,
+        max_combinations=args.max_combinations,
+        sampler=args.sampler,
+        seed=args.seed,
+        output_dir=args.output_dir
+    )
 
-        # Save to file
-        output_file = os.path.join(args.output_dir, f'{strategy_name}_params.json')
-        save_param_combinations(strategy_name, combinations, output_file)
+    for strategy_name, combinations in generated.items():
+        # Print optimization plan
+        print_optimization_plan(strategy_name, PARAM_GRIDS[strategy_name])
 
         # Print sample combinations
         print(f"\nSample parameter combinations for {strategy_name}:")
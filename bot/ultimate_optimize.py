@@ -22,6 +22,7 @@ from typing import Dict, Any, Optional, List
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils import setup_logger
+from bot.batch_grid_search import latest_batch_dir
 from bot.intelligent_ranker import create_ranker
 from bot.config import TradingPhase, STRATEGY_CONFIG
 
@@ -240,6 +241,9 @@ class UltimateOptimizer:
         logger.info("[STEP 2/8] Generating Extended Parameter Sets")
         logger.info("-" * 80)
 
+        # Strategies are independent, so start every generator up front and
+        # drain their pipes as each one finishes
+        procs = {}
         for strategy in self.strategies:
             logger.info(f"  Generating {self.max_combinations} combinations for {strategy.upper()}...")
 
@@ -249,10 +253,19 @@ class UltimateOptimizer:
                 '--max-combinations', str(self.max_combinations)
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            procs[strategy] = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
 
-            if result.returncode != 0:
-                logger.error(f"  [X] Failed to generate {strategy}: {result.stderr}")
+        for strategy, proc in procs.items():
+            _, stderr = proc.communicate()
+
+            if proc.returncode != 0:
+                logger.error(f"  [X] Failed to generate {strategy}: {stderr}")
+                for other in procs.values():
+                    if other.poll() is None:
+                        other.kill()
+                        other.communicate()
                 return False
 
             logger.info(f"  [OK] Generated {strategy}_params.json")
@@ -310,11 +323,10 @@ class UltimateOptimizer:
         # Find the batch directory
         if not self.batch_id:
             # Get most recent batch directory
-            batch_dirs = sorted(Path('tests/results').glob('batch_*'), key=lambda p: p.stat().st_mtime, reverse=True)
-            if not batch_dirs:
+            self.batch_dir = latest_batch_dir()
+            if self.batch_dir is None:
                 logger.error("  [X] No batch directory found")
                 return False
-            self.batch_dir = batch_dirs[0]
             self.batch_id = self.batch_dir.name.replace('batch_', '')
         else:
             self.batch_dir = Path(f'tests/results/batch_{self.batch_id}')
@@ -0,0 +1,197 @@
+"""
+Unit tests for Advanced Trade Management Module.
+
+Tests AdvancedTradeManager symbol caching and trade management actions.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.advanced_trade_manager import AdvancedTradeManager
+from bot.strategy import SignalType
+
+
+class TestAdvancedTradeManager(unittest.TestCase):
+    """Tests for AdvancedTradeManager class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.manager = AdvancedTradeManager("TEST")
+
+    def _mock_symbol_info(self, digits=5, point=0.00001, volume_min=0.01):
+        symbol_info = Mock()
+        symbol_info.digits = digits
+        symbol_info.point = point
+        symbol_info.volume_min = volume_min
+        return symbol_info
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_get_pip_size_cached(self, mock_mt5):
+        """Test pip size is fetched from MT5 once per symbol."""
+        mock_mt5.symbol_info.return_value = self._mock_symbol_info()
+
+        first = self.manager._get_pip_size('EURUSD')
+        second = self.manager._get_pip_size('EURUSD')
+
+        self.assertAlmostEqual(first, 0.0001)
+        self.assertEqual(first, second)
+        mock_mt5.symbol_info.assert_called_once_with('EURUSD')
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_get_pip_size_missing_symbol_not_cached(self, mock_mt5):
+        """Test failed symbol lookups are retried."""
+        mock_mt5.symbol_info.return_value = None
+
+        self.assertEqual(self.manager._get_pip_size('XXXYYY'), 0)
+        self.assertEqual(self.manager._get_pip_size('XXXYYY'), 0)
+
+        self.assertEqual(mock_mt5.symbol_info.call_count, 2)
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_invalidate_symbol(self, mock_mt5):
+        """Test invalidating a symbol forces a fresh lookup."""
+        mock_mt5.symbol_info.return_value = self._mock_symbol_info(digits=3, point=0.001)
+
+        self.manager._get_pip_size('USDJPY')
+        self.manager.invalidate_symbol('USDJPY')
+        self.manager._get_pip_size('USDJPY')
+
+        self.assertEqual(mock_mt5.symbol_info.call_count, 2)
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_manage_trade_breakeven(self, mock_mt5):
+        """Test SL moves to breakeven once profit reaches the trigger."""
+        mock_mt5.symbol_info.return_value = self._mock_symbol_info()
+        mock_mt5.order_send.return_value = Mock(retcode=mock_mt5.TRADE_RETCODE_DONE)
+        self.manager.enable_breakeven = True
+        self.manager.breakeven_trigger_r = 0.5
+
+        # SELL with 20 pip SL, currently 12 pips in profit (0.6R)
+        actions = self.manager.manage_trade(
+            7, 'EURUSD', SignalType.SELL, 1.1000, 1.0988, 1.1020, 1.0960, 20.0
+        )
+
+        self.assertTrue(actions['breakeven_set'])
+        self.assertIn(7, self.manager.breakeven_set)
+        self.assertEqual(mock_mt5.order_send.call_args[0][0]['sl'], 1.1000)
+
+        # Already at breakeven: no second request
+        actions = self.manager.manage_trade(
+            7, 'EURUSD', SignalType.SELL, 1.1000, 1.0985, 1.1000, 1.0960, 20.0
+        )
+        self.assertFalse(actions['breakeven_set'])
+        mock_mt5.order_send.assert_called_once()
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_manage_trade_below_trigger(self, mock_mt5):
+        """Test no action is taken below the breakeven trigger."""
+        mock_mt5.symbol_info.return_value = self._mock_symbol_info()
+        self.manager.enable_breakeven = True
+        self.manager.breakeven_trigger_r = 0.5
+
+        actions = self.manager.manage_trade(
+            8, 'EURUSD', SignalType.BUY, 1.1000, 1.1005, 1.0980, 1.1040, 20.0
+        )
+
+        self.assertFalse(any(actions.values()))
+        mock_mt5.order_send.assert_not_called()
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_manage_trade_fast_path(self, mock_mt5):
+        """Test fully managed tickets skip symbol lookups entirely."""
+        self.manager.enable_breakeven = True
+        self.manager.enable_partial_exits = False
+        self.manager.enable_trailing_stop = False
+        self.manager.breakeven_set.add(3)
+
+        actions = self.manager.manage_trade(
+            3, 'EURUSD', SignalType.BUY, 1.1000, 1.1050, 1.1000, 1.1080, 20.0
+        )
+
+        self.assertFalse(any(actions.values()))
+        mock_mt5.symbol_info.assert_not_called()
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_manage_trades_vectorized_matches_scalar(self, mock_mt5):
+        """Test the vectorized backtest path agrees with manage_trade."""
+        mock_mt5.symbol_info.return_value = self._mock_symbol_info()
+        mock_mt5.order_send.return_value = Mock(retcode=mock_mt5.TRADE_RETCODE_DONE)
+
+        tickets = np.array([1, 2, 3, 4])
+        directions = np.array([SignalType.BUY.value, SignalType.SELL.value,
+                               SignalType.BUY.value, SignalType.SELL.value])
+        entry = np.array([1.1000, 1.1000, 1.1000, 1.1000])
+        current = np.array([1.1030, 1.0990, 1.1002, 1.0960])
+        sl = np.array([1.0980, 1.1020, 1.0980, 1.1020])
+        tp = np.array([1.1040, 1.0960, 1.1040, 1.0960])
+
+        vectorized = AdvancedTradeManager("TEST_VEC")
+        for manager in (self.manager, vectorized):
+            manager.enable_breakeven = True
+            manager.breakeven_trigger_r = 0.5
+            manager.enable_partial_exits = False
+            manager.enable_trailing_stop = True
+            manager.trailing_start_r = 1.0
+            manager.trailing_distance_r = 0.5
+
+        result = vectorized.manage_trades_vectorized(tickets, directions, entry, current, sl, tp)
+
+        for i, ticket in enumerate(tickets):
+            direction = SignalType(directions[i])
+            actions = self.manager.manage_trade(
+                int(ticket), 'EURUSD', direction, entry[i], current[i], sl[i], tp[i], 20.0
+            )
+            self.assertEqual(actions['breakeven_set'], bool(result['breakeven_set'][i]))
+            self.assertEqual(actions['trailing_adjusted'], bool(result['trailing_adjusted'][i]))
+
+        self.assertEqual(vectorized.breakeven_set, self.manager.breakeven_set)
+        self.assertEqual(vectorized.breakeven_set, {1, 2, 4})
+        np.testing.assert_allclose(result['new_sl'], [1.1020, 1.1000, 1.0980, 1.0970])
+
+    def test_manage_trades_vectorized_tracking(self):
+        """Test tracked tickets are skipped until reset_tracking."""
+        self.manager.enable_breakeven = True
+        self.manager.breakeven_trigger_r = 0.5
+        self.manager.enable_trailing_stop = False
+        args = (np.array([5, 9]), np.array([SignalType.BUY.value] * 2),
+                np.array([1.1000, 1.1000]), np.array([1.1015, 1.1015]),
+                np.array([1.0980, 1.0980]), np.array([1.1040, 1.1040]))
+
+        first = self.manager.manage_trades_vectorized(*args)
+        second = self.manager.manage_trades_vectorized(*args)
+        self.manager.reset_tracking(9)
+        third = self.manager.manage_trades_vectorized(*args)
+
+        self.assertEqual(first['breakeven_set'].tolist(), [True, True])
+        self.assertEqual(second['breakeven_set'].tolist(), [False, False])
+        self.assertEqual(third['breakeven_set'].tolist(), [False, True])
+
+    @patch('bot.advanced_trade_manager.mt5')
+    def test_partial_close_uses_position_snapshot(self, mock_mt5):
+        """Test partial close reads positions/ticks from refresh_positions()."""
+        position = Mock(ticket=101, symbol='EURUSD', volume=1.0, type=mock_mt5.POSITION_TYPE_BUY)
+        mock_mt5.positions_get.return_value = [position]
+        mock_mt5.symbol_info_tick.return_value = Mock(bid=1.1000, ask=1.1002)
+        mock_mt5.symbol_info.return_value = self._mock_symbol_info()
+        mock_mt5.order_send.return_value = Mock(retcode=mock_mt5.TRADE_RETCODE_DONE)
+
+        self.assertEqual(self.manager.refresh_positions(), 1)
+        mock_mt5.positions_get.reset_mock()
+        mock_mt5.symbol_info_tick.reset_mock()
+
+        self.assertTrue(self.manager._partial_close(101, 'EURUSD', 0.5))
+
+        mock_mt5.positions_get.assert_not_called()
+        mock_mt5.symbol_info_tick.assert_not_called()
+        request = mock_mt5.order_send.call_args[0][0]
+        self.assertEqual(request['volume'], 0.5)
+        self.assertEqual(request['price'], 1.1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,269 @@
+"""
+Unit tests for Results Aggregator Module.
+
+Tests ResultsAggregator loading and ranking of grid search runs.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import aggregate_results
+from bot.aggregate_results import ResultsAggregator
+from bot.intelligent_ranker import QualityGates
+from utils.results_db import ResultsDB
+
+
+class TestResultsAggregator(unittest.TestCase):
+    """Tests for ResultsAggregator class."""
+
+    RUNS = [
+        ('fvg', 1, {'profit': 500.0, 'win_rate': 55.0, 'profit_factor': 1.6,
+                    'max_drawdown_pct': 5.0, 'total_trades': 40, 'gap': 3}),
+        ('macd_rsi', 1, {'profit': 800.0, 'win_rate': 48.0, 'profit_factor': 1.4,
+                         'max_drawdown_pct': 8.0, 'total_trades': 60, 'fast': 12}),
+        ('elastic_band', 2, {'profit': 300.0, 'win_rate': 62.0, 'profit_factor': 1.9,
+                             'max_drawdown_pct': 2.0, 'total_trades': 35, 'ema': 50}),
+    ]
+
+    def setUp(self):
+        """Create a batch directory with three successful runs and one failure."""
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        results = {}
+
+        for i, (strategy, phase, best_params) in enumerate(self.RUNS):
+            run_dir = self.tmp_dir / strategy / f"run_{i}"
+            run_dir.mkdir(parents=True)
+            (run_dir / "best_params.json").write_text(json.dumps(best_params))
+            (run_dir / "metadata.json").write_text(json.dumps({'strategy': strategy, 'phase': phase}))
+            results[f"{strategy}_phase{phase}"] = {
+                'status': 'success',
+                'strategy': strategy,
+                'phase': phase,
+                'run_dir': str(run_dir),
+            }
+
+        results['fvg_phase3'] = {'status': 'failed', 'strategy': 'fvg', 'phase': 3, 'run_dir': None}
+
+        batch_metadata = {'batch_id': 'batch_test', 'results': results}
+        (self.tmp_dir / "batch_metadata.json").write_text(json.dumps(batch_metadata))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_batch_results(self):
+        """Test successful runs are loaded in batch order and failures skipped."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+
+        self.assertEqual([r['strategy'] for r in aggregator.results], ['fvg', 'macd_rsi', 'elastic_band'])
+        self.assertEqual(aggregator.results[1]['best_params']['profit'], 800.0)
+
+    @patch('bot.aggregate_results.IJSON_AVAILABLE', False)
+    def test_load_batch_results_without_ijson(self):
+        """Test batch loading falls back to a full parse without ijson."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+
+        self.assertEqual([r['strategy'] for r in aggregator.results], ['fvg', 'macd_rsi', 'elastic_band'])
+
+    def test_load_batch_results_uses_batch_metadata(self):
+        """Test batch loading takes run metadata from batch_metadata.json."""
+        for metadata_file in self.tmp_dir.glob("*/run_*/metadata.json"):
+            metadata_file.unlink()
+
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+
+        self.assertEqual(len(aggregator.results), 3)
+        self.assertEqual(aggregator.results[2]['metadata']['phase'], 2)
+
+    def test_load_batch_results_from_results_db(self):
+        """Test a batch recorded in the results DB is loaded without its run files."""
+        db_path = self.tmp_dir / "results.sqlite"
+        batch = json.loads((self.tmp_dir / "batch_metadata.json").read_text())
+        runs = [
+            (key, run, json.loads((Path(run['run_dir']) / "best_params.json").read_text()), None)
+            for key, run in batch['results'].items() if run['status'] == 'success'
+        ]
+        with ResultsDB(db_path) as db:
+            db.record_runs(self.tmp_dir.name.replace("batch_", "", 1), runs)
+        for best_params_file in self.tmp_dir.glob("*/run_*/best_params.json"):
+            best_params_file.unlink()
+
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir), results_db=str(db_path))
+        aggregator.load_results()
+
+        self.assertEqual([r['strategy'] for r in aggregator.results], ['fvg', 'macd_rsi', 'elastic_band'])
+        self.assertEqual(aggregator.results[1]['best_params']['profit'], 800.0)
+        self.assertEqual(aggregator.results[2]['metadata']['phase'], 2)
+
+    def test_load_individual_results(self):
+        """Test individual run directories pick up strategy/phase from metadata."""
+        run_dirs = sorted(str(p) for p in self.tmp_dir.glob("*/run_*"))
+        aggregator = ResultsAggregator(run_dirs=run_dirs)
+        aggregator.load_results()
+
+        self.assertEqual(len(aggregator.results), 3)
+        phases = {r['strategy']: r['phase'] for r in aggregator.results}
+        self.assertEqual(phases['elastic_band'], 2)
+
+    def test_load_skips_runs_without_best_params(self):
+        """Test runs missing best_params.json are dropped."""
+        (self.tmp_dir / "fvg" / "run_0" / "best_params.json").unlink()
+
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+
+        self.assertEqual(len(aggregator.results), 2)
+
+    def test_shared_json_files_parsed_once(self):
+        """Test symlinked run files are parsed once via the LRU cache."""
+        shared = self.tmp_dir / "fvg" / "run_0" / "best_params.json"
+        linked_dir = self.tmp_dir / "fvg" / "run_linked"
+        linked_dir.mkdir()
+        (linked_dir / "best_params.json").symlink_to(shared)
+
+        with patch.object(aggregate_results, 'read_json', wraps=aggregate_results.read_json) as read:
+            aggregator = ResultsAggregator(run_dirs=[str(shared.parent), str(linked_dir)])
+            aggregator.load_results()
+
+        parsed = [call.args[0] for call in read.call_args_list]
+        self.assertEqual(parsed.count(str(shared.resolve())), 1)
+        self.assertIs(aggregator.results[0]['best_params'], aggregator.results[1]['best_params'])
+
+    def test_rank_by_metric(self):
+        """Test metric rankings are descending, except lowest drawdown."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+
+        by_profit = aggregator._rank_by_metric('profit')
+        by_drawdown = aggregator._rank_by_metric('max_drawdown_pct', reverse=True)
+
+        self.assertEqual([r['strategy'] for r in by_profit], ['macd_rsi', 'fvg', 'elastic_band'])
+        self.assertEqual([r['strategy'] for r in by_drawdown], ['elastic_band', 'fvg', 'macd_rsi'])
+        self.assertEqual(by_profit[0]['profit'], 800.0)
+        self.assertEqual(by_profit[0]['parameters'], {'fast': 12})
+
+    def test_rank_by_risk_adjusted(self):
+        """Test risk-adjusted ranking uses profit / max drawdown."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+
+        ranked = aggregator._rank_by_risk_adjusted()
+
+        # fvg and macd_rsi tie at 100, so load order breaks the tie
+        self.assertEqual([r['strategy'] for r in ranked], ['elastic_band', 'fvg', 'macd_rsi'])
+        self.assertAlmostEqual(ranked[0]['risk_adjusted'], 150.0)
+        self.assertEqual(aggregator._determine_best_overall(ranked)['strategy'], 'elastic_band')
+
+    def test_rankings_memoized_until_reload(self):
+        """Test rankings are computed once per load."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+
+        ranked = aggregator._rank_by_risk_adjusted()
+        self.assertIs(aggregator._rank_by_risk_adjusted(), ranked)
+        self.assertEqual(aggregator._determine_best_overall()['risk_adjusted_score'], ranked[0]['risk_adjusted'])
+
+        aggregator.results = []
+        aggregator.load_results()
+        self.assertIsNot(aggregator._rank_by_risk_adjusted(), ranked)
+
+    def test_rankings_share_rows(self):
+        """Test every ranking orders the same row objects."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+        comparison = aggregator.generate_comparison()
+
+        rankings = comparison['rankings']
+        row_ids = {id(row) for row in rankings['by_profit']}
+        for name in ('by_win_rate', 'by_profit_factor', 'by_lowest_drawdown', 'by_risk_adjusted'):
+            self.assertEqual({id(row) for row in rankings[name]}, row_ids)
+        self.assertTrue(all(id(row) in row_ids for row in rankings['by_composite_score']))
+
+    def test_generate_comparison_top_n(self):
+        """Test rankings are truncated to top_n without changing gate counts."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+        full = aggregator.generate_comparison(top_n=None)
+        top = aggregator.generate_comparison(top_n=1)
+
+        for name, ranking in top['rankings'].items():
+            self.assertEqual(ranking, full['rankings'][name][:1])
+        self.assertEqual(len(full['rankings']['by_profit']), 3)
+        self.assertEqual(top['passed_quality_gates'], full['passed_quality_gates'])
+        self.assertEqual(top['best_overall'], full['best_overall'])
+
+    def test_quality_gate_prefilter_matches_ranker(self):
+        """Test the vectorized gate prefilter keeps the rows QualityGates.passes keeps."""
+        gates = QualityGates(min_win_rate=50.0, min_profit_factor=1.5,
+                             max_drawdown_pct=6.0, min_trades=30)
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir), quality_gates=gates)
+        aggregator.load_results()
+        comparison = aggregator.generate_comparison()
+
+        expected = aggregator.ranker.apply_quality_gates(aggregator._build_rows())
+        ranked = comparison['rankings']['by_composite_score']
+        self.assertEqual({r['strategy'] for r in ranked}, {r['strategy'] for r in expected})
+        self.assertEqual([r['strategy'] for r in expected], ['fvg', 'elastic_band'])
+        self.assertEqual(comparison['passed_quality_gates'], 2)
+
+    def test_print_comparison(self):
+        """Test the report is emitted as a single record with all sections."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+        comparison = aggregator.generate_comparison()
+
+        with self.assertLogs('AGGREGATOR', level='INFO') as logs:
+            aggregator.print_comparison(comparison)
+
+        self.assertEqual(len(logs.records), 1)
+        report = logs.records[0].getMessage()
+        self.assertIn('[TOP 5] BY RISK-ADJUSTED RETURN', report)
+        self.assertIn('150.00', report)
+        self.assertIn('Parameters: ema=50\n', report)
+
+    def test_save_comparison_round_trip(self):
+        """Test saved comparison reports are valid JSON."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+        comparison = aggregator.generate_comparison()
+
+        output_file = self.tmp_dir / "reports" / "comparison.json"
+        aggregator.save_comparison(comparison, str(output_file))
+
+        saved = json.loads(output_file.read_text())
+        self.assertEqual(saved['total_runs'], 3)
+        self.assertEqual(saved['timestamp'], comparison['timestamp'])
+
+    def test_aggregate_saves_report_to_batch_dir(self):
+        """Test aggregate() returns the comparison and saves it beside the batch."""
+        comparison = aggregate_results.aggregate(batch_dir=str(self.tmp_dir))
+
+        saved = json.loads((self.tmp_dir / "comparison_report.json").read_text())
+        self.assertEqual(saved['best_overall']['strategy'], comparison['best_overall']['strategy'])
+        self.assertEqual(comparison['best_overall']['strategy'], 'elastic_band')
+
+    def test_aggregate_uses_preloaded_results(self):
+        """Test results handed over in memory are compared without reading run files."""
+        aggregator = ResultsAggregator(batch_dir=str(self.tmp_dir))
+        aggregator.load_results()
+        for best_params_file in self.tmp_dir.glob("*/run_*/best_params.json"):
+            best_params_file.unlink()
+
+        comparison = aggregate_results.aggregate(batch_dir=str(self.tmp_dir), results=aggregator.results)
+
+        self.assertEqual(comparison['total_runs'], 3)
+        self.assertEqual(comparison['best_overall']['strategy'], 'elastic_band')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for Results Analyzer Module.
+
+Tests ResultsAnalyzer loading, derived metrics, and recommendations.
+"""
+
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import analyze_results
+from bot.analyze_results import ResultsAnalyzer, _top_indices
+
+
+def _combo(combo_id, profit, win_rate, symbol_metrics):
+    """Build a combo_*.json payload; symbol_metrics maps symbol -> (pf, dd)."""
+    return {
+        'combo_id': combo_id,
+        'parameters': {'rsi_period': int(combo_id), 'atr_sl_multiplier': 2.0},
+        'results': {
+            symbol: {'net_profit': profit / len(symbol_metrics), 'total_trades': 10,
+                     'win_rate': win_rate, 'profit_factor': pf, 'max_drawdown_pct': dd}
+            for symbol, (pf, dd) in symbol_metrics.items()
+        },
+        'aggregate': {'total_profit': profit, 'avg_win_rate': win_rate, 'total_trades': 30},
+    }
+
+
+class TestResultsAnalyzer(unittest.TestCase):
+    """Tests for ResultsAnalyzer class."""
+
+    COMBOS = [
+        _combo('001', 1000.0, 55.0, {'EURUSD': (1.5, 8.0), 'GBPUSD': (0.0, 4.0)}),
+        _combo('002', 1500.0, 50.0, {'EURUSD': (1.2, 10.0), 'GBPUSD': (1.4, 12.0)}),
+        _combo('003', 400.0, 65.0, {'EURUSD': (2.0, 2.0), 'GBPUSD': (1.8, 3.0)}),
+    ]
+
+    def setUp(self):
+        """Create a run directory with three combos and metadata."""
+        self.run_dir = Path(tempfile.mkdtemp())
+        (self.run_dir / "metadata.json").write_text(
+            json.dumps({'strategy': 'elastic_band', 'symbols': ['EURUSD', 'GBPUSD']})
+        )
+        for combo in self.COMBOS:
+            (self.run_dir / f"combo_{combo['combo_id']}.json").write_text(json.dumps(combo))
+        (self.run_dir / "best_params.json").write_text(json.dumps({'rsi_period': 2}))
+
+        self.analyzer = ResultsAnalyzer(str(self.run_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.run_dir)
+
+    def test_load_results(self):
+        """Test only combo files are loaded, in file order."""
+        self.analyzer.load_results()
+
+        self.assertEqual([r['combo_id'] for r in self.analyzer.results], ['001', '002', '003'])
+        self.assertEqual(self.analyzer.metadata['strategy'], 'elastic_band')
+
+    def test_derived_metrics(self):
+        """Test average PF skips non-positive values and drawdown takes the worst symbol."""
+        self.analyzer.load_results()
+        arr = self.analyzer._compute_derived_metrics()
+
+        np.testing.assert_allclose(arr['avg_pf'], [1.5, 1.3, 1.9])
+        np.testing.assert_allclose(arr['max_dd'], [8.0, 12.0, 3.0])
+        np.testing.assert_allclose(arr['sharpe'], [125.0, 125.0, 400.0 / 3.0])
+
+    @unittest.skipUnless(analyze_results.NUMBA_AVAILABLE, "numba not installed")
+    def test_derived_metrics_numba_matches_numpy(self):
+        """Test the JIT kernel used for large runs matches the NumPy path."""
+        self.analyzer.load_results()
+        expected = self.analyzer._compute_derived_metrics().copy()
+
+        self.analyzer._arr = None
+        with patch.object(analyze_results, 'NUMBA_MIN_COMBOS', 0):
+            arr = self.analyzer._compute_derived_metrics()
+
+        for field in ('avg_pf', 'max_dd', 'sharpe'):
+            np.testing.assert_array_equal(arr[field], expected[field])
+
+    def test_analyze_writes_recommendation(self):
+        """Test analyze() saves the best parameters per objective."""
+        self.analyzer.load_results()
+        self.analyzer.analyze()
+
+        recommended = json.loads((self.run_dir / "recommended_params.json").read_text())
+        self.assertEqual(recommended['best_profit']['rsi_period'], 2)
+        self.assertEqual(recommended['best_win_rate']['rsi_period'], 3)
+        self.assertEqual(recommended['best_drawdown']['rsi_period'], 3)
+        self.assertEqual(recommended['best_risk_adjusted']['rsi_period'], 3)
+
+    def test_analyze_logs_one_record_per_section(self):
+        """Test each report section is emitted as a single log record."""
+        self.analyzer.load_results()
+
+        with self.assertLogs('ANALYZE', level='INFO') as logs:
+            self.analyzer.analyze()
+
+        # Run info, five rankings, recommendation summary
+        self.assertEqual(len(logs.records), 7)
+        self.assertIn('RANKED BY LOWEST DRAWDOWN', logs.records[4].getMessage())
+
+    def test_analyze_quiet_still_writes_recommendation(self):
+        """Test the report is skipped above INFO but recommendations are saved."""
+        self.analyzer.load_results()
+        analyze_logger = logging.getLogger('ANALYZE')
+        level = analyze_logger.level
+        analyze_logger.setLevel(logging.WARNING)
+        try:
+            with patch.object(analyze_logger, 'info') as info:
+                self.analyzer.analyze()
+        finally:
+            analyze_logger.setLevel(level)
+
+        info.assert_not_called()
+        self.assertTrue((self.run_dir / "recommended_params.json").exists())
+
+    def test_top_indices_matches_stable_sort(self):
+        """Test top-k selection keeps stable-sort order, including ties at the cutoff."""
+        values = np.array([3.0, 5.0, 5.0, 1.0, 5.0, 2.0, 4.0])
+
+        self.assertEqual(_top_indices(values, 3).tolist(), [1, 2, 4])
+        self.assertEqual(_top_indices(values, 2).tolist(), [1, 2])
+        self.assertEqual(_top_indices(values, 3, descending=False).tolist(), [3, 5, 0])
+        self.assertEqual(_top_indices(values, 10).tolist(), [1, 2, 4, 6, 0, 5, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
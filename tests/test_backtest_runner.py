@@ -0,0 +1,93 @@
+"""
+Unit tests for Backtest Runner Module.
+
+Tests phase comparison pruning and the summary report.
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import backtest_runner
+from bot.backtest_runner import run_phase_comparison, is_clearly_unviable, generate_report
+from bot.backtester import BacktestResult
+from bot.config import PHASE_CONFIGS, TradingPhase
+
+
+def _result(phase, max_drawdown_pct=3.0, win_rate=50.0):
+    """BacktestResult for a phase with the given drawdown and win rate."""
+    return BacktestResult(
+        symbol='EURUSD', phase=PHASE_CONFIGS[phase].name,
+        start_date=datetime(2024, 1, 1), end_date=datetime(2024, 4, 1),
+        initial_balance=10000.0, final_balance=10000.0,
+        max_drawdown_pct=max_drawdown_pct, win_rate=win_rate
+    )
+
+
+class TestPhaseComparison(unittest.TestCase):
+    """Tests for run_phase_comparison pruning."""
+
+    def _run(self, phase1_result, **kwargs):
+        def backtest(symbol, phase, *args):
+            return phase1_result if phase == TradingPhase.PHASE_1 else _result(phase)
+
+        with patch.object(backtest_runner, 'run_single_backtest', side_effect=backtest) as run:
+            results = run_phase_comparison('EURUSD', datetime(2024, 1, 1), datetime(2024, 4, 1),
+                                           10000.0, **kwargs)
+        return results, run.call_count
+
+    def test_is_clearly_unviable(self):
+        """Test the default check rejects doubled drawdown limits and low win rates only."""
+        limit = PHASE_CONFIGS[TradingPhase.PHASE_1].daily_loss_buffer
+
+        self.assertFalse(is_clearly_unviable(_result(TradingPhase.PHASE_1, max_drawdown_pct=2 * limit)))
+        self.assertTrue(is_clearly_unviable(_result(TradingPhase.PHASE_1, max_drawdown_pct=2 * limit + 0.1)))
+        self.assertTrue(is_clearly_unviable(_result(TradingPhase.PHASE_1, win_rate=19.9)))
+
+    def test_unviable_phase1_skips_remaining_phases(self):
+        """Test a doomed Phase 1 stops the comparison."""
+        results, calls = self._run(_result(TradingPhase.PHASE_1, win_rate=10.0))
+
+        self.assertEqual(calls, 1)
+        self.assertEqual([r.phase for r in results], ['Challenge'])
+
+    def test_viable_or_unpruned_runs_all_phases(self):
+        """Test every phase runs when Phase 1 passes or pruning is disabled."""
+        doomed = _result(TradingPhase.PHASE_1, win_rate=10.0)
+
+        self.assertEqual(self._run(_result(TradingPhase.PHASE_1))[1], len(TradingPhase))
+        self.assertEqual(self._run(doomed, prune_fn=None)[1], len(TradingPhase))
+
+
+class TestGenerateReport(unittest.TestCase):
+    """Tests for the console summary report."""
+
+    def _report(self, results):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            generate_report(results)
+        return out.getvalue().splitlines()
+
+    def test_totals_and_phase_subtotals(self):
+        """Test the grand total, with per-phase subtotals only for multi-phase reports."""
+        results = [_result(TradingPhase.PHASE_1), _result(TradingPhase.PHASE_1), _result(TradingPhase.PHASE_2)]
+        for r, (net_profit, trades) in zip(results, [(100.5, 3), (-20.25, 4), (7.0, 1)]):
+            r.net_profit, r.total_trades = net_profit, trades
+
+        totals = [line.split() for line in self._report(results) if line.startswith('TOTAL')]
+        self.assertEqual(totals, [['TOTAL', 'Challenge', '7', '$80.25'],
+                                  ['TOTAL', 'Verification', '1', '$7.00'],
+                                  ['TOTAL', '8', '$87.25']])
+
+        totals = [line.split() for line in self._report(results[:2]) if line.startswith('TOTAL')]
+        self.assertEqual(totals, [['TOTAL', '7', '$80.25']])
+
+
+if __name__ == '__main__':
+    unittest.main()
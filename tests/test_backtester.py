@@ -0,0 +1,302 @@
+"""
+Unit tests for Backtester Module.
+
+Tests the bar-by-bar simulation kernel, indicators, parameter grids and
+batch runs.
+"""
+
+import types
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import backtester
+from bot.config import STRATEGY_CONFIG
+from bot.backtester import (
+    Backtester, _ema_from_sma_seed, _entry_signals, _wilder_average, _simulate_bars, DIRECTION_BUY, DIRECTION_SELL, EXIT_SL, EXIT_TP,
+    SIGNAL_ELASTIC_BAND, SIGNAL_FVG
+)
+
+
+def _random_walk(n, seed):
+    """Synthetic close/high/low series around 1.10."""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0008, n))
+    high = close + np.abs(rng.normal(0, 0.0006, n))
+    low = close - np.abs(rng.normal(0, 0.0006, n))
+    return close, high, low
+
+
+class TestSimulateBars(unittest.TestCase):
+    """Tests for the _entry_signals/_simulate_bars kernels."""
+
+    PIP = 0.0001
+
+    def _simulate(self, simulate, close, high, low, signal_mode, start_idx=210):
+        """Run a simulation over a price series with the default indicator periods."""
+        backtest = Backtester()
+        rates = np.zeros(len(close), dtype=[('high', 'f8'), ('low', 'f8'), ('close', 'f8')])
+        rates['close'], rates['high'], rates['low'] = close, high, low
+        signals = _entry_signals(
+            close, high, low,
+            backtest._calculate_ema(close, 200), backtest._calculate_ema(close, 50),
+            backtest._calculate_rsi(close, 14), signal_mode, self.PIP, 2 * self.PIP, 30, 70, 5
+        )
+        return simulate(
+            close, high, low, backtest._calculate_atr(rates, 14), signals, start_idx, self.PIP,
+            2.0, 1.5, 1.0, 10.0, 0.01, 0.01, 100.0, 240, 15, 10000.0
+        )
+
+    def test_fvg_entry_and_exits(self):
+        """Test a bullish gap opens a BUY that exits at TP, and a bearish gap a SELL that hits SL."""
+        close = np.full(30, 1.1000)
+        high = close + 0.0002
+        low = close - 0.0002
+        # Bar 12 gaps 10 pips above bar 10's high; bar 13 reaches the 15 pip TP
+        close[12], high[12], low[12] = 1.1015, 1.1017, 1.1012
+        close[13], high[13], low[13] = 1.1010, 1.1031, 1.1006
+        close[14], high[14], low[14] = 1.1008, 1.1010, 1.1006
+        # Bar 20 gaps 10 pips below bar 18's low; bar 21 hits the 10 pip SL
+        close[20], high[20], low[20] = 1.0985, 1.0988, 1.0983
+        close[21], high[21], low[21] = 1.0990, 1.0996, 1.0989
+        close[22], high[22], low[22] = 1.0992, 1.0994, 1.0990
+        zeros = np.zeros(30)
+        atr = np.full(30, 5 * self.PIP)
+
+        signals = _entry_signals(close, high, low, zeros, zeros, zeros, SIGNAL_FVG,
+                                 self.PIP, 0.0, 30, 70, 5)
+        trades, balance = _simulate_bars(
+            close, high, low, atr, signals, 10, self.PIP,
+            2.0, 1.5, 1.0, 10.0, 0.01, 0.01, 100.0, 240, 15, 10000.0
+        )
+
+        self.assertEqual(np.flatnonzero(signals).tolist(), [12, 20])
+        self.assertEqual(trades[['entry_idx', 'exit_idx']].tolist(), [(12, 13), (20, 21)])
+        self.assertEqual(trades['direction'].tolist(), [DIRECTION_BUY, DIRECTION_SELL])
+        self.assertEqual(trades['exit_reason'].tolist(), [EXIT_TP, EXIT_SL])
+        np.testing.assert_allclose(trades['profit_pips'], [15.0, -10.0])
+        # 1% risk of 10000 over 10 pips at $10/pip
+        self.assertAlmostEqual(trades['volume'][0], 1.0)
+        self.assertEqual(balance, trades['balance'][-1])
+
+    @unittest.skipUnless(backtester.NUMBA_AVAILABLE, "numba not installed")
+    def test_numba_kernel_matches_python(self):
+        """Test the JIT kernel used for long backtests matches the plain Python loop."""
+        for signal_mode, seed in ((SIGNAL_ELASTIC_BAND, 1), (SIGNAL_FVG, 3)):
+            close, high, low = _random_walk(3000, seed)
+
+            expected, expected_balance = self._simulate(_simulate_bars, close, high, low, signal_mode)
+            trades, balance = self._simulate(backtester._simulate_kernel(), close, high, low, signal_mode)
+
+            self.assertGreater(len(expected), 0)
+            np.testing.assert_array_equal(trades, expected)
+            self.assertEqual(balance, expected_balance)
+
+
+class TestIndicators(unittest.TestCase):
+    """Tests for the backtester's indicator helpers."""
+
+    def test_ema_seeded_with_sma(self):
+        """Test the EMA starts from the SMA and follows the recurrence."""
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+
+        np.testing.assert_allclose(_ema_from_sma_seed(values, 3), [0.0, 0.0, 2.0, 3.0, 4.0])
+
+    def test_atr_true_range_includes_gaps(self):
+        """Test true range takes gaps from the previous close into account."""
+        rates = np.zeros(4, dtype=[('high', 'f8'), ('low', 'f8'), ('close', 'f8')])
+        rates['high'] = [1.10, 1.20, 1.05, 1.06]
+        rates['low'] = [1.00, 1.15, 1.00, 1.04]
+        rates['close'] = [1.05, 1.18, 1.02, 1.05]
+
+        # TR = [0.10, 0.15 (gap up from 1.05), 0.18 (gap down from 1.18), 0.04]
+        atr = Backtester()._calculate_atr(rates, 1)
+
+        np.testing.assert_allclose(atr, [0.10, 0.15, 0.18, 0.04])
+
+    def test_rsi_without_losses_is_100(self):
+        """Test RSI is 100 while there are no losses and falls once prices drop."""
+        close = np.r_[np.linspace(1.0, 1.1, 20), np.linspace(1.1, 1.05, 10)]
+        rsi = Backtester()._calculate_rsi(close, 14)
+
+        self.assertTrue(np.all(rsi[:14] == 0))
+        self.assertTrue(np.all(rsi[14:20] == 100))
+        self.assertTrue(np.all(np.diff(rsi[20:]) < 0))
+
+    @unittest.skipUnless(backtester.NUMBA_AVAILABLE, "numba not installed")
+    def test_fused_indicators_match_separate(self):
+        """Test the fused JIT indicator pass matches the per-indicator methods."""
+        close, high, low = _random_walk(3000, 7)
+        backtest = Backtester()
+
+        with patch.object(backtester, 'NUMBA_AVAILABLE', False):
+            expected = backtest._calculate_indicators(close, high, low)
+        with patch.object(backtester, 'NUMBA_MIN_BARS', 0):
+            fused = backtest._calculate_indicators(close, high, low)
+
+        for name, series, expected_series in zip(('ema_trend', 'ema_reversion', 'rsi', 'atr'), fused, expected):
+            with self.subTest(name):
+                np.testing.assert_allclose(series, expected_series, rtol=0, atol=1e-9)
+
+    def test_shared_rates_indicators_memoized(self):
+        """Test indicators for a shared read-only rates array are reused until a period changes."""
+        close, high, low = _random_walk(500, 9)
+        rates = np.zeros(len(close), dtype=[('time', 'i8'), ('high', 'f8'), ('low', 'f8'), ('close', 'f8')])
+        rates['close'], rates['high'], rates['low'] = close, high, low
+        rates.flags.writeable = False
+        backtester._shared_indicators.cache_clear()
+        self.addCleanup(backtester._shared_indicators.cache_clear)
+
+        first = backtester._shared_indicators(backtester._SharedRates(rates), 200, 50, 14, 14)
+        again = backtester._shared_indicators(backtester._SharedRates(rates), 200, 50, 14, 14)
+        other_rsi = backtester._shared_indicators(backtester._SharedRates(rates), 200, 50, 7, 14)
+
+        self.assertIs(again, first)
+        self.assertIsNot(other_rsi, first)
+        self.assertFalse(first[0].flags.writeable)
+        for series, expected in zip(first, backtester._compute_indicators(close, high, low, 200, 50, 14, 14)):
+            np.testing.assert_array_equal(series, expected)
+
+    @unittest.skipUnless(backtester.SCIPY_AVAILABLE, "scipy not installed")
+    def test_lfilter_matches_loop(self):
+        """Test the lfilter EMA is bit-identical to the Python recurrence, Wilder's to rounding."""
+        close, _, _ = _random_walk(2000, 5)
+        expected_ema = _ema_from_sma_seed(close, 50)
+        expected_wilder = _wilder_average(np.abs(np.diff(close)), 14)
+
+        with patch.object(backtester, 'SCIPY_AVAILABLE', False):
+            np.testing.assert_array_equal(_ema_from_sma_seed(close, 50), expected_ema)
+            np.testing.assert_allclose(_wilder_average(np.abs(np.diff(close)), 14), expected_wilder,
+                                       rtol=1e-12)
+
+
+class TestCalculateResults(unittest.TestCase):
+    """Tests for Backtester._calculate_results."""
+
+    def test_metrics_from_profit_arrays(self):
+        """Test counts, drawdown and the longest losing run from per-trade profits."""
+        profits = np.array([50.0, -20.0, -30.0, 40.0, -10.0, -10.0, -10.0, 0.0, 100.0])
+        equity = 1000.0 + np.concatenate(([0.0], np.cumsum(profits)))
+        trades = [None] * len(profits)
+
+        result = Backtester()._calculate_results(
+            'EURUSD', datetime(2024, 1, 1), datetime(2024, 2, 1), 1000.0, equity[-1],
+            trades, np.arange(len(equity)), equity, profits=profits
+        )
+
+        self.assertEqual((result.winning_trades, result.losing_trades), (3, 6))
+        self.assertAlmostEqual(result.gross_profit, 190.0)
+        self.assertAlmostEqual(result.gross_loss, 80.0)
+        # Peak 1050 after the first trade, trough 1000 two trades later
+        self.assertAlmostEqual(result.max_drawdown, 50.0)
+        # Three -10 losses and the break-even trade
+        self.assertEqual(result.max_consecutive_losses, 4)
+
+    def test_no_trades(self):
+        """Test an empty backtest reports zeros."""
+        result = Backtester()._calculate_results(
+            'EURUSD', datetime(2024, 1, 1), datetime(2024, 2, 1), 1000.0, 1000.0,
+            [], np.array([1704067200]), np.array([1000.0])
+        )
+
+        self.assertEqual(result.total_trades, 0)
+        self.assertEqual(result.max_drawdown, 0)
+        self.assertEqual(result.max_consecutive_losses, 0)
+        self.assertEqual(result.equity_curve, [(datetime.fromtimestamp(1704067200), 1000.0)])
+
+
+class TestRunParamGrid(unittest.TestCase):
+    """Tests for Backtester.run_param_grid."""
+
+    SYMBOL_INFO = types.SimpleNamespace(
+        digits=5, point=0.00001, trade_tick_value=1.0, trade_tick_size=0.00001,
+        volume_step=0.01, volume_min=0.01, volume_max=100.0
+    )
+    METRICS = ('final_balance', 'total_trades', 'winning_trades', 'losing_trades', 'gross_profit',
+               'gross_loss', 'max_drawdown', 'max_consecutive_losses', 'profit_factor', 'expectancy')
+
+    def _rates(self, n_bars):
+        close, high, low = _random_walk(n_bars, 11)
+        rates = np.zeros(n_bars, dtype=[('time', 'i8'), ('high', 'f8'), ('low', 'f8'), ('close', 'f8')])
+        rates['time'] = 1_600_000_000 + 900 * np.arange(n_bars)
+        rates['close'], rates['high'], rates['low'] = close, high, low
+        return rates
+
+    def _grid_matches_run(self, n_bars):
+        rates = self._rates(n_bars)
+        param_sets = [
+            {'rsi_period': 7, 'atr_sl_multiplier': 1.5},
+            {'rsi_period': 14, 'ema_reversion_period': 20, 'risk_reward_ratio': 2.5},
+            {'ema_trend_period': n_bars},  # Too long for the data
+        ]
+        start, end = datetime(2020, 1, 1), datetime(2020, 6, 1)
+
+        with patch.object(backtester, 'mt5') as mock_mt5, \
+                patch.object(Backtester, '_fetch_historical_data', return_value=rates), \
+                patch.object(Backtester, 'save_trades_for_validation'):
+            mock_mt5.symbol_info.return_value = self.SYMBOL_INFO
+            results = Backtester().run_param_grid('EURUSD', start, end, param_sets)
+            for params, result in zip(param_sets, results):
+                with patch.dict(STRATEGY_CONFIG, params):
+                    expected = Backtester().run('EURUSD', start, end)
+                for metric in self.METRICS:
+                    with self.subTest(params=params, metric=metric):
+                        self.assertAlmostEqual(getattr(result, metric), getattr(expected, metric), places=6)
+
+        self.assertGreater(results[0].total_trades, 0)
+        self.assertEqual(results[2].total_trades, 0)
+
+    def test_matches_run_per_combination(self):
+        """Test each combination's metrics match a run() with the same config overrides."""
+        with patch.object(backtester, 'NUMBA_AVAILABLE', False):
+            self._grid_matches_run(1500)
+
+    @unittest.skipUnless(backtester.NUMBA_AVAILABLE, "numba not installed")
+    def test_parallel_kernel_matches_run(self):
+        """Test the parallel JIT grid kernel matches run() as well."""
+        self._grid_matches_run(3000)
+
+    def test_float32_close_to_float64(self):
+        """Test float32 screening keeps the trades and stays close on profit."""
+        param_sets = [{'rsi_period': 7}, {'rsi_period': 14, 'risk_reward_ratio': 2.5}]
+        start, end = datetime(2020, 1, 1), datetime(2020, 6, 1)
+
+        with patch.object(backtester, 'mt5') as mock_mt5, \
+                patch.object(Backtester, '_fetch_historical_data', return_value=self._rates(1500)):
+            mock_mt5.symbol_info.return_value = self.SYMBOL_INFO
+            expected = Backtester().run_param_grid('EURUSD', start, end, param_sets)
+            screened = Backtester().run_param_grid('EURUSD', start, end, param_sets, float32=True)
+
+        for result, reference in zip(screened, expected):
+            self.assertEqual(result.total_trades, reference.total_trades)
+            self.assertAlmostEqual(result.net_profit, reference.net_profit, delta=1.0)
+
+
+class TestRunBatch(unittest.TestCase):
+    """Tests for Backtester.run_batch."""
+
+    def test_failed_symbol_logged_and_skipped(self):
+        """Test results keep symbol order and a failing symbol is dropped."""
+        def run(symbol, *args):
+            if symbol == 'GBPUSD':
+                raise RuntimeError("no data")
+            return symbol
+
+        backtest = Backtester()
+        with patch.object(backtest, 'run', side_effect=run):
+            with self.assertLogs('BACKTEST', level='ERROR') as logs:
+                results = backtest.run_batch(['EURUSD', 'GBPUSD', 'USDJPY'],
+                                             datetime(2024, 1, 1), datetime(2024, 4, 1), n_jobs=1)
+
+        self.assertEqual(results, ['EURUSD', 'USDJPY'])
+        self.assertIn('GBPUSD', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
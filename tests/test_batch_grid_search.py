@@ -0,0 +1,123 @@
+"""
+Unit tests for Batch Grid Search Module.
+
+Tests batch and run directory discovery and concurrent batch runs.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import batch_grid_search
+from bot.batch_grid_search import newest_subdir, latest_batch_dir, BatchGridSearchRunner
+
+
+class TestDirectoryDiscovery(unittest.TestCase):
+    """Tests for newest_subdir and latest_batch_dir."""
+
+    def setUp(self):
+        """Create batch directories with increasing mtimes plus distractors."""
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        for mtime, name in enumerate(['batch_b', 'batch_c', 'batch_a']):
+            (self.tmp_dir / name).mkdir()
+            os.utime(self.tmp_dir / name, (mtime, mtime))
+        (self.tmp_dir / 'batch_file.json').write_text('{}')
+        (self.tmp_dir / 'fvg').mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_newest_subdir(self):
+        """Test the newest matching directory wins and files/other names are ignored."""
+        self.assertEqual(newest_subdir(self.tmp_dir, 'batch_'), self.tmp_dir / 'batch_a')
+        self.assertIsNone(newest_subdir(self.tmp_dir, 'run_'))
+        self.assertIsNone(newest_subdir(self.tmp_dir / 'missing', 'batch_'))
+
+    def test_latest_batch_dir_falls_back_to_scan(self):
+        """Test batches are found by mtime when the latest-batch file is missing."""
+        with patch.object(batch_grid_search, 'LATEST_BATCH_FILE', self.tmp_dir / 'latest_batch.txt'):
+            self.assertEqual(latest_batch_dir(), self.tmp_dir / 'batch_a')
+
+
+class TestConcurrentRuns(unittest.TestCase):
+    """Tests BatchGridSearchRunner.run with several runs at once."""
+
+    def setUp(self):
+        """Run inside a temporary directory so batch files stay out of the repo."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        self.runner = BatchGridSearchRunner(
+            strategies=['fvg', 'macd_rsi'], symbols=['EURUSD'], phases=[1, 2], days=30, jobs=3,
+            use_subprocess=True
+        )
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def _run_grid_search(self, strategy, phase):
+        if (strategy, phase) == ('macd_rsi', 1):
+            raise RuntimeError('Grid search failed: boom')
+        return Path(f"tests/results/{strategy}/run_{self.runner.batch_id}_phase{phase}")
+
+    def test_runs_all_pairs_in_order(self):
+        """Test parameters are generated once per strategy and results keep batch order."""
+        with patch.object(self.runner, '_generate_parameters') as generate, \
+                patch.object(self.runner, '_run_grid_search', side_effect=self._run_grid_search), \
+                patch.object(self.runner, '_analyze_results', return_value={}), \
+                patch.object(self.runner, '_record_results'):
+            results = self.runner.run()
+
+        self.assertEqual([c.args[0] for c in generate.call_args_list], ['fvg', 'macd_rsi'])
+        self.assertEqual(
+            list(results), ['fvg_phase1', 'fvg_phase2', 'macd_rsi_phase1', 'macd_rsi_phase2']
+        )
+        self.assertEqual(results['macd_rsi_phase1']['status'], 'failed')
+        self.assertEqual(results['fvg_phase2']['run_dir'],
+                         str(Path(f"tests/results/fvg/run_{self.runner.batch_id}_phase2")))
+
+        with open(self.runner.checkpoint_file) as f:
+            checkpoint = json.load(f)
+        self.assertEqual(
+            sorted(checkpoint['completed_runs']), ['fvg_phase1', 'fvg_phase2', 'macd_rsi_phase2']
+        )
+
+    def test_skips_generation_for_completed_strategy(self):
+        """Test a strategy whose phases are all done is not regenerated on resume."""
+        self.runner.completed_runs = {'fvg_phase1', 'fvg_phase2'}
+        with patch.object(self.runner, '_generate_parameters') as generate, \
+                patch.object(self.runner, '_run_one',
+                             side_effect=lambda s, p: (f"{s}_phase{p}", {'strategy': s, 'phase': p,
+                                                                         'run_dir': 'run',
+                                                                         'status': 'success'})), \
+                patch.object(self.runner, '_record_results'):
+            self.runner.run()
+
+        generate.assert_called_once_with('macd_rsi')
+
+    def test_in_process_runs(self):
+        """Test the default pool path end to end (without MT5 the searches find no results)."""
+        runner = BatchGridSearchRunner(
+            strategies=['fvg'], symbols=['EURUSD'], phases=[1, 2], days=30, max_combinations=4, jobs=2
+        )
+        results = runner.run()
+
+        self.assertTrue(Path('tests/parameter_sets/fvg_params.json').exists())
+        for phase in (1, 2):
+            result = results[f'fvg_phase{phase}']
+            self.assertEqual(result['status'], 'success')
+            self.assertEqual(result['run_dir'],
+                             str(Path(f"tests/results/fvg/run_{runner.batch_id}_phase{phase}")))
+            self.assertTrue((Path(result['run_dir']) / 'metadata.json').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Unit tests for JSON I/O Module.
+
+Tests read_json/write_json round trips and streamed array writes.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import json_io
+from utils.json_io import read_json, write_json, write_json_array
+
+
+class TestJsonIO(unittest.TestCase):
+    """Tests for JSON helpers."""
+
+    ITEMS = [
+        {'symbol': 'EURUSD', 'trades': [{'profit': 1.5, 'exit_reason': 'TP'}], 'notes': 'a\nb'},
+        {'symbol': 'GBPUSD', 'trades': [], 'meta': {}},
+    ]
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_write_read_round_trip(self):
+        """Test write_json output parses back to the same data."""
+        path = self.tmp_dir / "data.json"
+        write_json(path, {'items': self.ITEMS})
+
+        self.assertEqual(read_json(path), {'items': self.ITEMS})
+
+    def test_write_json_array_matches_json_dump(self):
+        """Test streamed arrays match json.dump(indent=2) with and without orjson."""
+        for orjson_available in {False, json_io.ORJSON_AVAILABLE}:
+            with patch.object(json_io, 'ORJSON_AVAILABLE', orjson_available):
+                for items in (self.ITEMS, []):
+                    path = self.tmp_dir / "array.json"
+                    write_json_array(path, iter(items))
+
+                    self.assertEqual(path.read_text(), json.dumps(items, indent=2))
+
+    def test_datetimes_written_as_isoformat(self):
+        """Test datetimes serialize like isoformat() with and without orjson."""
+        times = [datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 1, 2, 3, 4, 5, 600)]
+        for orjson_available in {False, json_io.ORJSON_AVAILABLE}:
+            with patch.object(json_io, 'ORJSON_AVAILABLE', orjson_available):
+                path = self.tmp_dir / "times.json"
+                write_json_array(path, [{'entry_time': t} for t in times])
+
+                self.assertEqual([item['entry_time'] for item in read_json(path)],
+                                 [t.isoformat() for t in times])
+
+
+if __name__ == '__main__':
+    unittest.main()
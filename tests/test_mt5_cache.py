@@ -0,0 +1,106 @@
+"""
+Unit tests for MT5 Rate Cache Module.
+
+Tests fetch_rates memoization of copy_rates_range downloads.
+"""
+
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import mt5_cache
+from utils.mt5_cache import fetch_rates, clear_rates_cache, prune_rates_cache
+
+
+class TestFetchRates(unittest.TestCase):
+    """Tests for fetch_rates."""
+
+    START = datetime(2024, 1, 1)
+    END = datetime(2024, 3, 1)
+
+    def setUp(self):
+        clear_rates_cache()
+
+    def tearDown(self):
+        clear_rates_cache()
+
+    @patch.object(mt5_cache, 'mt5')
+    def test_same_range_fetched_once(self, mock_mt5):
+        """Test repeated requests for one symbol/timeframe/range hit MT5 once."""
+        mock_mt5.copy_rates_range.return_value = np.zeros(5, dtype=[('close', 'f8')])
+
+        first = fetch_rates('EURUSD', 15, self.START, self.END)
+        second = fetch_rates('EURUSD', 15, self.START, self.END)
+        fetch_rates('GBPUSD', 15, self.START, self.END)
+
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(mock_mt5.copy_rates_range.call_count, 2)
+        self.assertEqual(mock_mt5.copy_rates_range.call_args_list[0].args[2], self.START)
+
+    @patch.object(mt5_cache, 'mt5')
+    def test_failed_fetch_not_cached(self, mock_mt5):
+        """Test empty downloads return None and are retried."""
+        mock_mt5.copy_rates_range.return_value = None
+
+        self.assertIsNone(fetch_rates('EURUSD', 15, self.START, self.END))
+        self.assertIsNone(fetch_rates('EURUSD', 15, self.START, self.END))
+
+        self.assertEqual(mock_mt5.copy_rates_range.call_count, 2)
+
+    @patch.object(mt5_cache, 'mt5')
+    def test_cache_dir_shared_across_processes(self, mock_mt5):
+        """Test a download saved to the cache dir is memory-mapped instead of refetched."""
+        rates = np.arange(5, dtype='f8').view([('close', 'f8')])
+        mock_mt5.copy_rates_range.return_value = rates
+        cache_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        with patch.dict(os.environ, {mt5_cache.RATES_CACHE_ENV: str(cache_dir)}):
+            fetch_rates('EURUSD', 15, self.START, self.END)
+            # A fresh process only has the file
+            clear_rates_cache()
+            mapped = fetch_rates('EURUSD', 15, self.START, self.END)
+
+        self.assertEqual(mock_mt5.copy_rates_range.call_count, 1)
+        self.assertIsInstance(mapped, np.memmap)
+        self.assertFalse(mapped.flags.writeable)
+        np.testing.assert_array_equal(mapped, rates)
+        self.assertEqual(len(list(cache_dir.iterdir())), 1)
+
+    @patch.object(mt5_cache, 'mt5')
+    def test_expired_download_refetched_and_pruned(self, mock_mt5):
+        """Test saved downloads past the max age are fetched again and pruned."""
+        mock_mt5.copy_rates_range.return_value = np.arange(5, dtype='f8').view([('close', 'f8')])
+        cache_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, cache_dir)
+        expired = time.time() - mt5_cache.RATES_CACHE_MAX_AGE.total_seconds() - 60
+
+        with patch.dict(os.environ, {mt5_cache.RATES_CACHE_ENV: str(cache_dir)}):
+            fetch_rates('EURUSD', 15, self.START, self.END)
+            saved = next(cache_dir.iterdir())
+            os.utime(saved, (expired, expired))
+            clear_rates_cache()
+            fetch_rates('EURUSD', 15, self.START, self.END)
+
+        self.assertEqual(mock_mt5.copy_rates_range.call_count, 2)
+        self.assertEqual(prune_rates_cache(cache_dir), 0)
+
+        os.utime(saved, (expired, expired))
+        self.assertEqual(prune_rates_cache(cache_dir), 1)
+        self.assertEqual(list(cache_dir.iterdir()), [])
+        self.assertEqual(prune_rates_cache(cache_dir / 'missing'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Unit tests for Parameter Optimization Module.
+
+Tests generate_param_combinations grid slicing and sampling.
+"""
+
+import itertools
+import unittest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import optimize_parameters
+from bot.optimize_parameters import generate_param_combinations, refine_param_grid, ELASTIC_BAND_PARAMS
+
+
+class TestGenerateParamCombinations(unittest.TestCase):
+    """Tests for generate_param_combinations."""
+
+    SMALL_GRID = {'a': [1, 2], 'b': [0.5, 1.0, 1.5]}
+
+    def test_small_grid_returns_full_product(self):
+        """Test grids within the budget are enumerated in full for every sampler."""
+        expected = [dict(zip('ab', c)) for c in itertools.product(*self.SMALL_GRID.values())]
+
+        for sampler in ('grid', 'lhs', 'random'):
+            self.assertEqual(generate_param_combinations(self.SMALL_GRID, 10, sampler), expected)
+
+    def test_samplers_return_distinct_grid_points(self):
+        """Test sampled combinations are unique, on-grid and cover every value."""
+        samplers = ['lhs', 'random'] + (['sobol'] if optimize_parameters.SCIPY_AVAILABLE else [])
+
+        for sampler in samplers:
+            combos = generate_param_combinations(ELASTIC_BAND_PARAMS, 100, sampler)
+
+            self.assertEqual(len(combos), 100)
+            self.assertEqual(len({tuple(c.values()) for c in combos}), 100)
+            for key, values in ELASTIC_BAND_PARAMS.items():
+                self.assertEqual({c[key] for c in combos}, set(values))
+
+    def test_sampling_is_reproducible(self):
+        """Test the same seed yields the same combinations."""
+        first = generate_param_combinations(ELASTIC_BAND_PARAMS, 50, 'lhs', seed=3)
+        second = generate_param_combinations(ELASTIC_BAND_PARAMS, 50, 'lhs', seed=3)
+
+        self.assertEqual(first, second)
+
+    def test_refine_param_grid_halves_step(self):
+        """Test refinement keeps the best value and midpoints to its neighbours."""
+        grid = {'period': [5, 9, 13, 21], 'ratio': [1.0, 1.5, 2.0], 'fixed': [3, 4]}
+
+        refined = refine_param_grid(grid, {'period': 13, 'ratio': 1.0})
+
+        self.assertEqual(refined['period'], [11, 13, 17])
+        self.assertEqual(refined['ratio'], [1.0, 1.25])
+        self.assertEqual(refined['fixed'], [3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
-from .logger import setup_logger
+from .logger import setup_logger, log_block
 from .symbol_translator import SymbolTranslator
+from .json_io import read_json, write_json, write_json_array
+from .mt5_cache import fetch_rates
 
-__all__ = ['setup_logger', 'SymbolTranslator']
+__all__ = ['setup_logger', 'log_block', 'SymbolTranslator', 'read_json', 'write_json', 'write_json_array', 'fetch_rates']
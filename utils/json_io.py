@@ -0,0 +1,100 @@
+"""
+JSON file helpers.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+import json
+import mmap
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Files at least this large are parsed straight from a read-only mmap
+# instead of being copied into a bytes buffer first
+MMAP_THRESHOLD = 1 << 20
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """
+    Read and parse a JSON file.
+
+    Args:
+        path: File to read.
+
+    Returns:
+        Parsed JSON data.
+    """
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+                return orjson.loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _json_default(obj: Any) -> str:
+    """Stdlib fallback for the datetimes orjson serializes natively."""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data as JSON indented by 2 spaces."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2, default=_json_default).encode()
+
+
+def write_json(path: Union[str, Path], data: Any):
+    """
+    Write data to a file as JSON indented by 2 spaces.
+
+    Args:
+        path: File to write.
+        data: JSON-serializable data; dates/datetimes are written in ISO
+            format (NumPy scalars/arrays allowed with orjson).
+    """
+    if ORJSON_AVAILABLE:
+        # Serialized in one call and written with a single write
+        Path(path).write_bytes(_dumps(data))
+        return
+
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, default=_json_default)
+
+
+def write_json_array(path: Union[str, Path], items: Iterable[Any]):
+    """
+    Write items as a JSON array, serializing one item at a time.
+
+    Produces the same layout as write_json(path, list(items)) without
+    holding every item in memory at once.
+
+    Args:
+        path: File to write.
+        items: JSON-serializable items, e.g. a generator.
+    """
+    with open(path, 'wb') as f:
+        separator = b'[\n  '
+        for item in items:
+            f.write(separator)
+            # Newlines only come from indentation (string newlines are escaped)
+            f.write(_dumps(item).replace(b'\n', b'\n  '))
+            separator = b',\n  '
+        f.write(b'[]' if separator == b'[\n  ' else b'\n]')
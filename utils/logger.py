@@ -4,6 +4,7 @@ Logging configuration for the copy trading system.
 
 import logging
 import sys
+from typing import Iterable
 import config
 
 
@@ -33,3 +34,19 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
         logger.addHandler(handler)
 
     return logger
+
+
+def log_block(logger: logging.Logger, lines: Iterable[str], level: int = logging.INFO):
+    """
+    Emit several lines as one log record.
+
+    Banners and reports go through the handler once instead of once per
+    line, and are skipped entirely when the level is filtered out.
+
+    Args:
+        logger: Logger to emit on.
+        lines: Lines of the block, without trailing newlines.
+        level: Logging level. Defaults to INFO.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, "\n".join(lines))
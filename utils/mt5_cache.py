@@ -0,0 +1,127 @@
+"""
+Memoized MT5 rate history.
+
+Backtests of several phases or strategies over the same symbol and date
+range share one copy_rates_range download per process. When
+RATES_CACHE_ENV names a directory, downloads are also saved there as .npy
+files that other processes memory-map instead of fetching again, until
+they are older than RATES_CACHE_MAX_AGE.
+"""
+
+import functools
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+try:
+    import MetaTrader5 as mt5
+    MT5_AVAILABLE = True
+except ImportError:
+    MT5_AVAILABLE = False
+    mt5 = None
+
+# Environment variable naming the directory of the cross-process rate cache;
+# set by batch runs for the grid searches they spawn
+RATES_CACHE_ENV = 'SINFO_RATES_CACHE_DIR'
+RATES_CACHE_DIR = Path("tests/cache/rates")
+# Saved downloads older than this are fetched again and pruned, so broker
+# history revisions are picked up and the directory does not grow forever
+RATES_CACHE_MAX_AGE = timedelta(days=7)
+
+
+def _is_fresh(path: Path) -> bool:
+    """Whether a saved download exists and is younger than RATES_CACHE_MAX_AGE."""
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    return age < RATES_CACHE_MAX_AGE.total_seconds()
+
+
+@functools.lru_cache(maxsize=128)
+def _fetch_rates(symbol: str, timeframe: int, start_ts: int, end_ts: int) -> np.ndarray:
+    """Download rates; raises LookupError on an empty result so failures are not cached."""
+    cache_dir = os.environ.get(RATES_CACHE_ENV)
+    cache_file = Path(cache_dir) / f"{symbol}_{timeframe}_{start_ts}_{end_ts}.npy" if cache_dir else None
+    if cache_file is not None and _is_fresh(cache_file):
+        # Read-only map; every process shares the same page-cache pages
+        return np.load(cache_file, mmap_mode='r')
+
+    rates = mt5.copy_rates_range(
+        symbol, timeframe, datetime.fromtimestamp(start_ts), datetime.fromtimestamp(end_ts)
+    )
+    if rates is None or len(rates) == 0:
+        raise LookupError(symbol)
+
+    if cache_file is not None:
+        # Written under a temporary name so readers never see a partial file
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            np.save(f, rates)
+        os.replace(tmp_file, cache_file)
+
+    # Shared between callers, so guard against in-place edits
+    rates.flags.writeable = False
+    return rates
+
+
+def fetch_rates(
+    symbol: str,
+    timeframe: int,
+    start_date: datetime,
+    end_date: datetime
+) -> Optional[np.ndarray]:
+    """
+    Fetch OHLC rates for a symbol/timeframe/range, reusing earlier downloads.
+
+    Args:
+        symbol: Trading symbol.
+        timeframe: MT5 timeframe constant.
+        start_date: Range start.
+        end_date: Range end.
+
+    Returns:
+        Read-only structured array of rates, or None if MT5 returned nothing.
+    """
+    try:
+        return _fetch_rates(symbol, timeframe, int(start_date.timestamp()), int(end_date.timestamp()))
+    except LookupError:
+        return None
+
+
+def clear_rates_cache():
+    """Drop all memoized rate history."""
+    _fetch_rates.cache_clear()
+
+
+def prune_rates_cache(cache_dir: Path = RATES_CACHE_DIR) -> int:
+    """
+    Delete saved downloads older than RATES_CACHE_MAX_AGE.
+
+    Args:
+        cache_dir: Directory of the cross-process rate cache.
+
+    Returns:
+        Number of files removed.
+    """
+    cutoff = time.time() - RATES_CACHE_MAX_AGE.total_seconds()
+    removed = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.npy'):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    # Removed by another process in the meantime
+                    continue
+    except FileNotFoundError:
+        pass
+    return removed
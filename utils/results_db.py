@@ -0,0 +1,133 @@
+"""
+SQLite store for batch grid search run results.
+
+Batch runs record their completed strategy/phase runs here so aggregation
+can read a whole batch with one query instead of parsing every run's
+JSON files, and results can be queried across batches.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_DB_PATH = Path("tests/results/results.sqlite")
+
+# best_params metrics copied into their own columns for querying
+METRIC_COLUMNS = ('profit', 'win_rate', 'profit_factor', 'max_drawdown_pct', 'total_trades')
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    batch_id TEXT NOT NULL,
+    run_key TEXT NOT NULL,
+    run_index INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    phase INTEGER NOT NULL,
+    run_dir TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    {', '.join(f'{column} REAL' for column in METRIC_COLUMNS)},
+    best_params TEXT NOT NULL,
+    recommended_params TEXT,
+    metadata TEXT,
+    PRIMARY KEY (batch_id, run_key)
+);
+CREATE INDEX IF NOT EXISTS runs_lookup ON runs (strategy, phase, params_hash);
+"""
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """Stable hash of a parameter set, independent of key order."""
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultsDB:
+    """Run results for all batches in one SQLite file."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH, read_only: bool = False):
+        """
+        Open (and for writers, create) the results database.
+
+        Args:
+            path: SQLite file.
+            read_only: Open an existing file without creating or migrating it.
+        """
+        self.path = Path(path)
+        if read_only:
+            self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        # WAL lets readers (aggregation) run while a batch is still writing
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_runs(
+        self,
+        batch_id: str,
+        runs: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]]
+    ):
+        """
+        Replace everything recorded for a batch with its successful runs,
+        in one transaction.
+
+        Args:
+            batch_id: Batch the runs belong to.
+            runs: (run_key, run, best_params, recommended_params) in batch
+                order, where run is the batch metadata entry (strategy,
+                phase, run_dir, ...) and the params are the contents of the
+                run's best_params.json / recommended_params.json.
+        """
+        placeholders = ', '.join('?' * (10 + len(METRIC_COLUMNS)))
+        rows = []
+        for run_index, (run_key, run, best_params, recommended_params) in enumerate(runs):
+            metrics = [best_params.get(column) for column in METRIC_COLUMNS]
+            parameters = {k: v for k, v in best_params.items() if k not in METRIC_COLUMNS}
+            rows.append((
+                batch_id, run_key, run_index, run['strategy'], run['phase'], run['run_dir'],
+                params_hash(parameters), *metrics, json.dumps(best_params),
+                json.dumps(recommended_params) if recommended_params is not None else None,
+                json.dumps(run)
+            ))
+
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE batch_id = ?", (batch_id,))
+            self.conn.executemany(f"INSERT INTO runs VALUES ({placeholders})", rows)
+
+    def load_batch(self, batch_id: str) -> List[Dict[str, Any]]:
+        """
+        Load a batch's runs in batch order.
+
+        Returns:
+            ResultsAggregator-style result dicts (run_dir, strategy, phase,
+            best_params, recommended_params, metadata); empty if the batch
+            was never recorded.
+        """
+        rows = self.conn.execute(
+            "SELECT run_dir, strategy, phase, best_params, recommended_params, metadata "
+            "FROM runs WHERE batch_id = ? ORDER BY run_index",
+            (batch_id,)
+        )
+        return [
+            {
+                'run_dir': run_dir,
+                'strategy': strategy,
+                'phase': phase,
+                'best_params': json.loads(best_params),
+                'recommended_params': json.loads(recommended_params) if recommended_params else None,
+                'metadata': json.loads(metadata) if metadata else None
+            }
+            for run_dir, strategy, phase, best_params, recommended_params, metadata in rows
+        ]